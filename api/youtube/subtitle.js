@@ -378,42 +378,30 @@ function parseXMLSubtitles(xmlData) {
   }
 }
 
-// Python 스크립트를 사용한 자막 추출 (다중 fallback)
+// Python 자막 엔진을 사용한 자막 추출
+// youtube_subtitle_engine.py가 한 프로세스 안에서 백엔드(transcript_api, real, ytdlp, pytube)를
+// hedge 방식으로 실행하므로 스크립트를 순서대로 여러 번 띄우지 않음
 async function extractSubtitleWithPython(videoId) {
-  console.log('🐍 API: Python으로 자막 추출 시작:', videoId);
-
-  // 우선순위별 Python 스크립트 목록
-  const pythonScripts = [
-    {
-      name: 'youtube_subtitle_transcript_api.py',
-      description: 'YouTube Transcript API (우선 방법)',
-      args: [videoId]
-    },
-    {
-      name: 'youtube_subtitle_real.py',
-      description: '기존 자막 추출 스크립트',
-      args: ['subtitle', videoId]
-    }
-  ];
-
-  // 각 Python 스크립트를 순차적으로 시도
-  for (const script of pythonScripts) {
-    const result = await tryPythonScript(script, videoId);
-    if (result.success) {
-      console.log(`✅ API: ${script.description} 성공`);
-      return result;
-    } else {
-      console.log(`⚠️ API: ${script.description} 실패:`, result.message);
-    }
+  console.log('🐍 API: Python 자막 엔진으로 추출 시작:', videoId);
+
+  const result = await tryPythonScript({
+    name: 'youtube_subtitle_engine.py',
+    description: '통합 자막 엔진',
+    args: [videoId]
+  }, videoId);
+
+  if (result.success) {
+    console.log(`✅ API: 통합 자막 엔진 성공 (${result.method})`);
+    return result;
   }
 
-  // 모든 Python 스크립트 실패
-  console.log('❌ API: 모든 Python 방법 실패');
+  console.log('❌ API: 모든 Python 방법 실패:', result.message);
   return {
     success: false,
-    error: 'ALL_PYTHON_METHODS_FAILED',
-    message: '모든 Python 자막 추출 방법이 실패했습니다',
-    video_id: videoId
+    error: result.error || 'ALL_PYTHON_METHODS_FAILED',
+    message: result.message || '모든 Python 자막 추출 방법이 실패했습니다',
+    video_id: videoId,
+    attempts: result.attempts
   };
 }
 
@@ -478,14 +466,17 @@ async function tryPythonScript(scriptInfo, videoId) {
             is_generated: result.is_generated,
             video_id: result.video_id,
             method: result.method || `python-${scriptInfo.name}`,
-            segments_count: result.segments_count
+            segments_count: result.segments_count,
+            backend: result.backend,
+            attempts: result.attempts
           });
         } else {
           resolve({
             success: false,
             error: result.error,
             message: result.message || result.error,
-            video_id: videoId
+            video_id: videoId,
+            attempts: result.attempts
           });
         }
       } catch (parseError) {
@@ -28,13 +28,9 @@ pip install -r requirements.txt -t build/
 # Lambda 함수 코드 복사
 echo "📄 함수 코드 복사..."
 cp lambda_function.py build/
-
-# yt-dlp 바이너리 다운로드 (최신 버전)
-echo "⬇️ yt-dlp 바이너리 다운로드..."
-cd build/
-wget -q https://github.com/yt-dlp/yt-dlp/releases/latest/download/yt-dlp -O yt-dlp
-chmod +x yt-dlp
-cd ..
+# 자막 트랙 선택, yt-dlp 백엔드, VTT/SRT 파서, Transcript 형식은 로컬 스크립트와 공유
+# (yt-dlp는 requirements.txt로 설치한 Python 패키지를 프로세스 안에서 사용 - 바이너리 불필요)
+cp ../youtube_subtitle_tracks.py ../youtube_subtitle_ytdlp.py ../youtube_subtitle_parser.py ../youtube_subtitle_transcript.py build/
 
 # 배포 패키지 생성
 echo "📦 배포 패키지 생성..."
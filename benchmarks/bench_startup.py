@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+youtube_api.py 시작 시간 벤치마크
+새 프로세스에서 `python -X importtime`으로 youtube_api를 import해 모듈별 import 시간을 재고,
+무거운 의존성이 import 시점에 딸려 오지 않는지와 시작 시간 예산을 확인합니다.
+Usage: python benchmarks/bench_startup.py [runs] [--write]
+  --write: import 시간 출력을 benchmarks/startup_importtime.txt에 저장
+"""
+
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_PATH = os.path.join(ROOT, 'benchmarks', 'startup_importtime.txt')
+
+# youtube_api import에 허용하는 누적 시간 (ms)
+STARTUP_BUDGET_MS = 100
+
+# import 시점에는 불러오지 않아야 하는 모듈 (해당 액션이 처음 쓸 때 import)
+LAZY_MODULES = (
+    'rubberdog', 'youtube_transcript_api', 'requests', 'yt_dlp',
+    'youtube_data_api', 'youtube_channel_store', 'youtube_travel',
+)
+
+def measure_import(module='youtube_api'):
+    """새 프로세스에서 module을 import하고 -X importtime 출력과 모듈별 누적 시간(us)을 반환"""
+    env = dict(os.environ)
+    # 키가 없어도 import가 성공해야 함
+    for name in ('YOUTUBE_API_KEYS', 'YOUTUBE_API_KEY_PRIMARY', 'YOUTUBE_API_KEY_BACKUP', 'YOUTUBE_API_KEY_ADDITIONAL'):
+        env.pop(name, None)
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        if cumulative_us.strip().isdigit():
+            cumulative[name.strip()] = int(cumulative_us)
+    return completed.stderr, cumulative
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    runs = int(args[0]) if args else 5
+
+    # 첫 실행은 .pyc 생성 시간이 섞이므로 버림
+    measure_import()
+
+    totals = []
+    for _ in range(runs):
+        output, cumulative = measure_import()
+        totals.append(cumulative['youtube_api'] / 1000)
+
+    slowest = sorted(
+        ((name, us) for name, us in cumulative.items() if name != 'youtube_api'),
+        key=lambda item: item[1], reverse=True
+    )[:10]
+    print(f"youtube_api import: min {min(totals):.1f} ms, max {max(totals):.1f} ms ({runs} runs)")
+    print("slowest imports (cumulative):")
+    for name, us in slowest:
+        print(f"  {us / 1000:7.1f} ms  {name}")
+
+    imported_lazy = [
+        name for name in cumulative if name.split('.')[0] in LAZY_MODULES
+    ]
+    if imported_lazy:
+        print(f"FAIL: imported at startup: {', '.join(sorted(imported_lazy))}")
+    if min(totals) > STARTUP_BUDGET_MS:
+        print(f"FAIL: {min(totals):.1f} ms exceeds the {STARTUP_BUDGET_MS} ms budget")
+
+    if '--write' in sys.argv:
+        with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"wrote {os.path.relpath(OUTPUT_PATH, ROOT)}")
+
+    if imported_lazy or min(totals) > STARTUP_BUDGET_MS:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VTT/SRT 파서 처리량 벤치마크
+저장소에 있는 VTT 자막(temp_subtitles/*.vtt, test_subtitle.en.vtt)을 youtube_subtitle_parser로
+파싱해 MB/s와 최대 메모리를 재고, 예전 Lambda의 parse_vtt_content(파일 전체 + 줄 목록)와 비교합니다.
+새 파서는 파일 객체에서 조각 단위로 읽으므로 최대 메모리가 파일 크기와 상관없이 거의 일정합니다.
+Usage: python benchmarks/bench_subtitle_parser.py [runs] [--repeat=N]
+  --repeat=N: 파일 내용을 N번 이어 붙여 긴 자막(라이브 스트림 등)처럼 측정 (기본 1)
+"""
+
+import io
+import os
+import re
+import sys
+import glob
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from youtube_subtitle_parser import iter_cues, iter_segments
+from youtube_subtitle_transcript import Transcript
+
+FIXTURES = sorted(glob.glob(os.path.join(ROOT, 'temp_subtitles', '*.vtt'))) + [
+    os.path.join(ROOT, 'test_subtitle.en.vtt')
+]
+# 자동 생성 자막 픽스처 (반복 큐를 합침, 나머지는 수동 자막)
+GENERATED_FIXTURES = {'vOLXGEt3C-A_subtitle.ko.vtt'}
+
+def legacy_parse_vtt_content(vtt_content):
+    """예전 aws-lambda/lambda_function.py의 parse_vtt_content (비교 기준)"""
+    lines = vtt_content.split('\n')
+    subtitle_segments = []
+    current_time = None
+    current_text = []
+
+    for line in lines:
+        line = line.strip()
+        if ' --> ' in line:
+            if current_time and current_text:
+                text = ' '.join(current_text).strip()
+                if text:
+                    subtitle_segments.append(f"[{current_time}] {text}")
+            time_match = re.match(r'(\d{2}:\d{2}:\d{2})', line)
+            if time_match:
+                current_time = time_match.group(1)[:5]
+            current_text = []
+        elif line and not line.startswith('WEBVTT') and not line.isdigit():
+            clean_text = re.sub(r'<[^>]+>', '', line)
+            if clean_text.strip():
+                current_text.append(clean_text.strip())
+
+    if current_time and current_text:
+        text = ' '.join(current_text).strip()
+        if text:
+            subtitle_segments.append(f"[{current_time}] {text}")
+
+    return '\n'.join(subtitle_segments)
+
+def best_time(func, runs):
+    """runs번 실행한 가장 짧은 시간(초)과 마지막 결과"""
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def peak_kilobytes(func):
+    """func 실행 중 최대 할당 메모리 (KB)"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    runs = int(args[0]) if args else 20
+    repeat = 1
+    for arg in sys.argv[1:]:
+        if arg.startswith('--repeat='):
+            repeat = int(arg.split('=', 1)[1])
+
+    print(
+        f"{'file':40} {'MB':>6} {'cues':>7} {'cues MB/s':>10} {'text MB/s':>10} {'legacy MB/s':>12}"
+        f" {'peak KB':>9} {'legacy KB':>10}"
+    )
+    for path in FIXTURES:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            data = f.read()
+        # 이어 붙일 때 첫 파일 외의 WEBVTT 헤더는 NOTE 블록처럼 건너뛰어짐
+        data = b'\n\n'.join([data] * repeat)
+        text = data.decode('utf-8')
+        megabytes = len(data) / 1024 / 1024
+
+        # 큐만 생성 (바이너리 파일 객체에서 조각 단위로 읽음)
+        cue_seconds, cue_count = best_time(lambda: sum(1 for _ in iter_cues(io.BytesIO(data))), runs)
+        # 큐 생성 + (자동 생성 자막이면) 반복 제거 + "[M:SS] 텍스트" 포맷팅
+        is_generated = os.path.basename(path) in GENERATED_FIXTURES
+        text_seconds, _ = best_time(
+            lambda: Transcript.from_segments(iter_segments(io.BytesIO(data), is_generated)).to_text(), runs
+        )
+        legacy_seconds, _ = best_time(lambda: legacy_parse_vtt_content(text), runs)
+
+        # 최대 메모리: 새 파서는 파일에서 큐를 세기만, 예전 방식은 파일 전체를 읽어 파싱
+        temp_path = os.path.join(ROOT, 'benchmarks', '.bench_subtitle.vtt')
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        try:
+            def stream():
+                with open(temp_path, 'rb') as f:
+                    sum(1 for _ in iter_cues(f))
+
+            def legacy():
+                with open(temp_path, encoding='utf-8') as f:
+                    legacy_parse_vtt_content(f.read())
+
+            stream_peak = peak_kilobytes(stream)
+            legacy_peak = peak_kilobytes(legacy)
+        finally:
+            os.remove(temp_path)
+
+        print(
+            f"{os.path.relpath(path, ROOT):40} {megabytes:6.2f} {cue_count:7d} "
+            f"{megabytes / cue_seconds:10.1f} {megabytes / text_seconds:10.1f} {megabytes / legacy_seconds:12.1f}"
+            f" {stream_peak:9.0f} {legacy_peak:10.0f}"
+        )
+
+if __name__ == '__main__':
+    main()
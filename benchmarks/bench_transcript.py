@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Transcript 메모리/출력 벤치마크
+temp_subtitles의 자동 자막(ko)을 시각을 밀어 가며 이어 붙여 긴 라이브 스트림 길이의 자막을 만들고,
+youtube-transcript-api 형식의 dict 목록 + 예전 format_transcript_with_timestamps와
+youtube_subtitle_transcript.Transcript의 보관 메모리, 형식별 출력 시간을 비교합니다.
+Usage: python benchmarks/bench_transcript.py [hours] [runs]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from youtube_subtitle_parser import iter_cues, dedupe_rolling_cues
+from youtube_subtitle_transcript import Transcript, TRANSCRIPT_FORMATS
+
+FIXTURE = os.path.join(ROOT, 'temp_subtitles', 'vOLXGEt3C-A_subtitle.ko.vtt')
+
+def legacy_format_transcript_with_timestamps(transcript):
+    """예전 youtube_subtitle_transcript_api.py / Lambda의 format_transcript_with_timestamps (비교 기준)"""
+    formatted_lines = []
+
+    for entry in transcript:
+        try:
+            if hasattr(entry, 'start'):
+                start_time = entry.start
+                text = entry.text
+            elif hasattr(entry, '__getitem__'):
+                start_time = entry['start']
+                text = entry['text']
+            else:
+                start_time = getattr(entry, 'start', 0)
+                text = getattr(entry, 'text', str(entry))
+
+            minutes = int(start_time // 60)
+            seconds = int(start_time % 60)
+            timestamp = f"{minutes}:{seconds:02d}"
+
+            clean_text = text.strip().replace('\n', ' ')
+
+            formatted_lines.append(f"[{timestamp}] {clean_text}")
+        except Exception:
+            formatted_lines.append(f"[ERROR] {str(entry)}")
+
+    return '\n'.join(formatted_lines)
+
+def stream_entries(hours):
+    """픽스처 세그먼트를 hours 시간이 될 때까지 이어 붙인 raw data 목록 ({"text", "start", "duration"}, 초)"""
+    with open(FIXTURE, 'rb') as f:
+        segments = list(dedupe_rolling_cues(iter_cues(f)))
+    span = segments[-1].end
+    entries = []
+    shift = 0
+    while shift < hours * 3600 * 1000:
+        for segment in segments:
+            entries.append({
+                "text": segment.text,
+                "start": (segment.start + shift) / 1000,
+                "duration": (segment.end - segment.start) / 1000,
+            })
+        shift += span
+    return entries
+
+def retained_kilobytes(build):
+    """build()가 만든 객체가 붙잡고 있는 메모리 (KB)"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        size = tracemalloc.get_traced_memory()[0] - before
+        del kept
+        return size / 1024
+    finally:
+        tracemalloc.stop()
+
+def best_ms(func, runs):
+    """runs번 실행한 가장 짧은 시간(ms)"""
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    entries = stream_entries(hours)
+    transcript = Transcript.from_entries(entries)
+    print(f"{hours:g}시간 스트림: {len(transcript)}줄, 글자 {len(transcript.text)}자")
+
+    # dict 목록은 json.loads 결과처럼 줄마다 새 문자열을 갖도록 복사해서 잼
+    legacy_kb = retained_kilobytes(lambda: [dict(entry, text=''.join(entry["text"])) for entry in entries])
+    transcript_kb = retained_kilobytes(lambda: Transcript.from_entries(entries))
+    print(f"{'보관 메모리':24} dict 목록 {legacy_kb:9.0f} KB   Transcript {transcript_kb:9.0f} KB")
+
+    print(f"{'build ms':24} {best_ms(lambda: Transcript.from_entries(entries), runs):9.1f}")
+    print(f"{'legacy text ms':24} {best_ms(lambda: legacy_format_transcript_with_timestamps(entries), runs):9.1f}")
+    for transcript_format in TRANSCRIPT_FORMATS:
+        milliseconds = best_ms(lambda: transcript.render(transcript_format), runs)
+        print(f"{transcript_format + ' ms':24} {milliseconds:9.1f}")
+
+if __name__ == '__main__':
+    main()
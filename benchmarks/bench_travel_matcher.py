@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+여행 영상 키워드 매처 벤치마크
+합성 채널(영상 1000개)에서 기존 is_travel_video 방식과 youtube_travel 매처를 비교합니다.
+Usage: python benchmarks/bench_travel_matcher.py [video_count]
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from youtube_travel import TRAVEL_KEYWORDS, travel_score, is_travel_video, classify_travel_videos
+
+def legacy_is_travel_video(title, description=""):
+    """기존 구현: 호출마다 키워드 목록을 만들고 키워드마다 `in` 검사"""
+    travel_keywords = list(TRAVEL_KEYWORDS)
+    text = (title + " " + description).lower()
+    score = 0
+    for keyword in travel_keywords:
+        if keyword.lower() in text:
+            score += 1
+    return score >= 2
+
+def legacy_travel_score(title, description=""):
+    text = (title + " " + description).lower()
+    return sum(1 for keyword in TRAVEL_KEYWORDS if keyword.lower() in text)
+
+FILLER = (
+    "오늘은 정말 좋은 하루였습니다 구독과 좋아요 부탁드려요 알림 설정 문의 인스타그램 감사합니다 "
+    "subscribe like comment please check out my other videos business inquiry music camera edit"
+).split()
+
+def make_channel(video_count, seed=42):
+    """합성 채널: 3개 중 1개는 여행 영상, 설명은 200~400단어"""
+    rng = random.Random(seed)
+    keywords = list(TRAVEL_KEYWORDS)
+    videos = []
+    for index in range(video_count):
+        title_words = [rng.choice(FILLER) for _ in range(6)]
+        if index % 3 == 0:
+            title_words += rng.sample(keywords, 2)
+        description_words = [rng.choice(FILLER) for _ in range(rng.randint(200, 400))]
+        if index % 5 == 0:
+            description_words.insert(rng.randrange(len(description_words)), rng.choice(keywords))
+        videos.append({
+            "video_id": f"v{index:010d}",
+            "title": " ".join(title_words),
+            "description": " ".join(description_words)
+        })
+    return videos
+
+def measure(label, func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<44} {best * 1000:8.1f} ms")
+    return best
+
+def main():
+    video_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    videos = make_channel(video_count)
+
+    # 결과가 기존 구현과 같은지 먼저 확인
+    for video in videos:
+        assert travel_score(video["title"], video["description"]) == legacy_travel_score(video["title"], video["description"])
+        assert is_travel_video(video["title"], video["description"]) == legacy_is_travel_video(video["title"], video["description"])
+
+    print(f"synthetic channel: {video_count} videos, {len(TRAVEL_KEYWORDS)} keywords")
+
+    # analyze_youtube_url는 기존에 영상마다 두 번(필터 + isTravelVideo) 호출했음
+    legacy = measure(
+        "legacy is_travel_video x2 per video",
+        lambda: [(legacy_is_travel_video(v["title"], v["description"]),
+                  legacy_is_travel_video(v["title"], v["description"])) for v in videos]
+    )
+    measure(
+        "legacy is_travel_video x1 per video",
+        lambda: [legacy_is_travel_video(v["title"], v["description"]) for v in videos]
+    )
+    measure(
+        "matcher travel_score (full scan)",
+        lambda: [travel_score(v["title"], v["description"]) for v in videos]
+    )
+    measure(
+        "matcher is_travel_video",
+        lambda: [is_travel_video(v["title"], v["description"]) for v in videos]
+    )
+    batch = measure(
+        "matcher classify_travel_videos (batch)",
+        lambda: classify_travel_videos(videos)
+    )
+
+    print(f"speedup (analyze path, legacy x2 -> batch): {legacy / batch:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""테스트 공통 설정 - 저장소 최상위의 스크립트 모듈(youtube_*.py)을 import할 수 있게 함"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""youtube_api.py 액션 테스트 (네트워크/API 키 없이 실행)"""
+
+import time
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import youtube_api
+from youtube_cache import TTLCache
+
+API_KEY_VARIABLES = (
+    'YOUTUBE_API_KEY_PRIMARY', 'YOUTUBE_API_KEY_BACKUP', 'YOUTUBE_API_KEY_ADDITIONAL', 'YOUTUBE_API_KEYS',
+)
+
+def test_quota_without_api_keys_returns_error(monkeypatch):
+    for name in API_KEY_VARIABLES:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(youtube_api, '_key_pool', None)
+
+    result = youtube_api.run_action("quota", "")
+
+    assert result == {"error": youtube_api.NO_API_KEYS_MESSAGE}
+
+def _slow_last_probe(monkeypatch, video_ids, delay=0.5):
+    """마지막 영상의 자막 확인만 delay초 걸리게 하고, 확인이 끝난 시각을 기록"""
+    finished = {}
+
+    def check(video_id, timeout=None):
+        if video_id == video_ids[-1]:
+            time.sleep(delay)
+        finished[video_id] = time.perf_counter()
+        return ['ko']
+
+    monkeypatch.setattr(youtube_api, 'check_subtitle_availability', check)
+    return finished
+
+def test_annotate_yields_each_video_before_the_batch_finishes(monkeypatch):
+    video_ids = [f'video{index:06d}' for index in range(10)]
+    finished = _slow_last_probe(monkeypatch, video_ids)
+    pipeline = youtube_api.build_filter_pipeline({})
+
+    arrivals = []
+    contexts = [{"index": index, "video": {"video_id": video_id}} for index, video_id in enumerate(video_ids)]
+    for context in pipeline.annotate(contexts):
+        arrivals.append((time.perf_counter(), context["video"]["video_id"]))
+
+    assert [video_id for _, video_id in arrivals] == video_ids
+    assert arrivals[0][0] < finished[video_ids[-1]]
+
+def test_channel_records_stream_before_the_last_probe_finishes(monkeypatch):
+    pytest.importorskip('requests')
+    import youtube_channel_store
+
+    video_ids = [f'video{index:06d}' for index in range(10)]
+    finished = _slow_last_probe(monkeypatch, video_ids)
+    snapshot = {
+        "channel_id": "UC0000000000000000000000",
+        "videos": [
+            {"video_id": video_id, "title": f"영상 {video_id}", "duration": 600, "view_count": 1}
+            for video_id in video_ids
+        ],
+        "complete": True,
+    }
+    monkeypatch.setattr(youtube_api, 'extract_channel_info', lambda url: {"type": "channel_id", "value": "UC"})
+    monkeypatch.setattr(youtube_api, 'resolve_channel_id', lambda url, refresh=False: (snapshot["channel_id"], False))
+    monkeypatch.setattr(youtube_api, 'get_data_client', lambda: None)
+    monkeypatch.setattr(youtube_api, 'get_channel_store', lambda: None)
+    monkeypatch.setattr(youtube_channel_store, 'refresh_snapshot', lambda client, store, channel_id: (snapshot, 0))
+
+    arrivals = []
+    for record in youtube_api.iter_channel_records('https://www.youtube.com/channel/UC0000000000000000000000'):
+        arrivals.append((time.perf_counter(), record))
+
+    videos = [(arrived, record["video"]["id"]) for arrived, record in arrivals if record["type"] == "video"]
+    assert [video_id for _, video_id in videos] == video_ids
+    assert videos[0][0] < finished[video_ids[-1]]
+    assert arrivals[-1][1]["type"] == "summary"
+
+VIDEO_URL = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+
+def _stale_video_entry(cache):
+    """VIDEO_URL의 오래된(stale) analyze 캐시 항목을 넣고 캐시 키 반환"""
+    key = youtube_api.analyze_cache_key(VIDEO_URL)
+    stale_at = time.time() - youtube_api.ANALYZE_CACHE_FRESH_TTL - 1
+    cache.set('analyze', key, {"stored_at": stale_at, "result": {"type": "video", "video": {"id": "dQw4w9WgXcQ"}}})
+    return key
+
+def test_cli_stale_hit_hands_refresh_to_a_detached_process(monkeypatch, tmp_path):
+    cache = TTLCache(path=str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(youtube_api, 'get_default_cache', lambda: cache)
+    monkeypatch.setattr(youtube_api, '_detach_refreshes', True)
+    spawned = []
+    monkeypatch.setattr(subprocess, 'Popen', lambda args, **options: spawned.append((args, options)))
+    key = _stale_video_entry(cache)
+
+    result = youtube_api.analyze_with_cache(VIDEO_URL)
+
+    assert result["cache"]["status"] == "stale"
+    [(args, options)] = spawned
+    assert args[2:] == ["analyze-refresh", VIDEO_URL, "1", "{}"]
+    assert options["stdout"] is subprocess.DEVNULL and options["stderr"] is subprocess.DEVNULL
+    # 갱신 프로세스가 놓을 때까지 lease가 남아 있으므로 다음 CLI의 stale hit은 프로세스를 또 띄우지 않음
+    assert cache.get('analyze_lease', key) is not None
+    assert youtube_api.analyze_with_cache(VIDEO_URL)["cache"]["status"] == "stale"
+    assert len(spawned) == 1
+
+def test_stale_hit_skips_refresh_while_another_process_holds_the_lease(monkeypatch, tmp_path):
+    cache = TTLCache(path=str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(youtube_api, 'get_default_cache', lambda: cache)
+    monkeypatch.setattr(youtube_api, '_detach_refreshes', False)
+    key = _stale_video_entry(cache)
+    # 같은 캐시 파일을 쓰는 다른 프로세스가 잡은 lease
+    assert TTLCache(path=cache.path).add('analyze_lease', key, {"pid": -1}, ttl=60)
+    started = []
+    monkeypatch.setattr(youtube_api.threading, 'Thread', lambda **kwargs: started.append(kwargs))
+
+    assert youtube_api.analyze_with_cache(VIDEO_URL)["cache"]["status"] == "stale"
+    assert started == []
+
+def test_miss_waits_for_another_process_instead_of_computing(monkeypatch, tmp_path):
+    cache = TTLCache(path=str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(youtube_api, 'get_default_cache', lambda: cache)
+    monkeypatch.setattr(youtube_api, 'ANALYZE_LEASE_POLL', 0.02)
+    computed = []
+    monkeypatch.setattr(youtube_api, 'analyze_youtube_url', lambda *args: computed.append(args) or {"type": "video"})
+
+    key = youtube_api.analyze_cache_key(VIDEO_URL)
+    other = TTLCache(path=cache.path)
+    assert other.add('analyze_lease', key, {"pid": -1}, ttl=60)
+
+    def finish_other_process():
+        time.sleep(0.2)
+        other.set('analyze', key, {"stored_at": time.time(), "result": {"type": "video", "video": {"id": "shared"}}})
+        other.delete('analyze_lease', key)
+
+    worker = threading.Thread(target=finish_other_process)
+    worker.start()
+    result = youtube_api.analyze_with_cache(VIDEO_URL)
+    worker.join()
+
+    assert computed == []
+    assert result["video"] == {"id": "shared"}
+    assert result["cache"]["status"] == "shared"
+    assert cache.get('analyze_lease', key) is None
+
+def test_filtering_span_includes_travel_classification(monkeypatch):
+    import youtube_travel
+    from youtube_log import request_trace
+
+    def slow_classify(videos):
+        time.sleep(0.2)
+        return [True for _ in videos]
+
+    monkeypatch.setattr(youtube_travel, 'classify_travel_videos', slow_classify)
+    pipeline = youtube_api.build_filter_pipeline({"travelOnly": True})
+
+    with request_trace('test') as trace:
+        passed = list(pipeline.run({"index": index, "video": {"video_id": f"video{index:06d}"}} for index in range(3)))
+        youtube_api.record_filter_spans(pipeline.stats())
+
+    assert len(passed) == 3
+    assert trace.spans["filtering"]["count"] == 3
+    assert trace.spans["filtering"]["seconds"] >= 0.2
+
+class _HangingHandler(BaseHTTPRequestHandler):
+    """응답하기 전에 3초 멈추는 서버 (응답 없는 자막 목록 조회 흉내)"""
+
+    def do_GET(self):
+        time.sleep(3)
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def test_hung_subtitle_probe_releases_its_worker(monkeypatch, tmp_path):
+    pytest.importorskip('requests')
+    pytest.importorskip('youtube_transcript_api')
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _HangingHandler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/watch?v="
+
+    class HangingApi:
+        def list(self, video_id):
+            youtube_api._thread_local.transcript_session.get(url + video_id)
+
+    def get_api():
+        youtube_api._thread_local.transcript_session = youtube_api._probe_session()
+        return HangingApi()
+
+    cache = TTLCache(path=str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(youtube_api, 'get_default_cache', lambda: cache)
+    monkeypatch.setattr(youtube_api, 'get_transcript_api', get_api)
+
+    started = time.perf_counter()
+    try:
+        results = list(youtube_api.iter_subtitle_probes(['video000001', 'video000002'], max_workers=1, timeout=0.5))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # 두 번째 확인은 첫 번째의 HTTP 요청이 0.5초에 끊긴 뒤 바로 시작 (3초 기다리지 않음)
+    assert results == [[], []]
+    assert time.perf_counter() - started < 2
+    assert cache.get('subtitle_languages', 'video000001') is None
+
+class _FakeDataClient:
+    """채널별 업로드 재생목록과 영상 목록을 돌려주는 Data API 대역 (playlists: channel_id → video_id 목록)"""
+
+    def __init__(self, playlists):
+        self.playlists = playlists
+        self.calls = []
+
+    def uploads_playlist_id(self, channel_id):
+        self.calls.append(('channels.list', channel_id))
+        return f"UU{channel_id}" if channel_id in self.playlists else None
+
+    def playlist_videos_page(self, playlist_id, page_token, etag=None):
+        self.calls.append(('playlistItems.list', playlist_id))
+        return {"video_ids": list(self.playlists[playlist_id[2:]]), "next_page_token": None, "etag": "etag"}
+
+    def get_videos(self, video_ids):
+        return [{"video_id": video_id, "title": video_id, "duration": 600, "view_count": 1} for video_id in video_ids]
+
+def _channel_records_setup(monkeypatch, tmp_path, playlists, channel_ids):
+    """resolve_channel_id가 channel_ids를 차례로 돌려주게 하고 (캐시 여부, refresh) 호출 기록을 반환"""
+    pytest.importorskip('requests')
+    from youtube_channel_store import ChannelSnapshotStore
+
+    resolutions = []
+
+    def resolve(url, refresh=False):
+        resolutions.append(refresh)
+        return channel_ids[min(len(resolutions), len(channel_ids)) - 1], not refresh
+
+    client = _FakeDataClient(playlists)
+    store = ChannelSnapshotStore(path=str(tmp_path / 'channels.sqlite3'))
+    monkeypatch.setattr(youtube_api, 'resolve_channel_id', resolve)
+    monkeypatch.setattr(youtube_api, 'get_data_client', lambda: client)
+    monkeypatch.setattr(youtube_api, 'get_channel_store', lambda: store)
+    monkeypatch.setattr(youtube_api, 'check_subtitle_availability', lambda video_id, timeout=None: ['ko'])
+    return client, resolutions
+
+CHANNEL_URL = 'https://www.youtube.com/@travel'
+
+def test_empty_channel_from_cache_is_not_resolved_again(monkeypatch, tmp_path):
+    client, resolutions = _channel_records_setup(monkeypatch, tmp_path, {"UCempty": []}, ["UCempty"])
+
+    for _ in range(2):
+        records = list(youtube_api.iter_channel_records(CHANNEL_URL))
+        assert records[-1]["type"] == "summary" and records[-1]["total_videos"] == 0
+
+    assert resolutions == [False, False]
+
+def test_stale_cached_channel_id_is_resolved_and_filled_once(monkeypatch, tmp_path):
+    client, resolutions = _channel_records_setup(
+        monkeypatch, tmp_path, {"UCnew": ["video000001", "video000002"]}, ["UCgone", "UCnew"]
+    )
+
+    records = list(youtube_api.iter_channel_records(CHANNEL_URL))
+
+    assert resolutions == [False, True]
+    # 다시 찾은 채널도 처음 찾은 채널처럼 첫 원본 페이지를 가져와 채움
+    assert [record["video"]["id"] for record in records if record["type"] == "video"] == ["video000001", "video000002"]
+    assert ('playlistItems.list', 'UUUCnew') in client.calls
+
+def test_page_cursor_keeps_the_remaining_skip(monkeypatch, tmp_path):
+    video_ids = [f'video{index:06d}' for index in range(10)]
+    _channel_records_setup(monkeypatch, tmp_path, {"UCmany": video_ids}, ["UCmany"])
+    monkeypatch.setattr(youtube_api, 'FILTER_BATCH_SIZE', 3)
+    monkeypatch.setattr(youtube_api, 'MAX_SOURCE_VIDEOS_PER_CALL', 3)
+    filters = {"pageSize": 2}
+
+    # 3페이지 = 앞의 4개를 건너뜀, 첫 호출은 3개를 훑고 건너뛰던 중에 끊김
+    records = list(youtube_api.iter_channel_records(CHANNEL_URL, page=3, filters=filters))
+    assert [record["type"] for record in records] == ["summary"]
+    cursor = records[-1]["next_cursor"]
+
+    records = list(youtube_api.iter_channel_records(CHANNEL_URL, filters=filters, cursor=cursor))
+    assert [record["video"]["id"] for record in records if record["type"] == "video"] == video_ids[4:6]
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""youtube_cache.py 테스트"""
+
+import time
+
+from youtube_cache import TTLCache
+
+def test_add_only_stores_when_absent_or_expired(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    first, second = TTLCache(path=path), TTLCache(path=path)
+
+    assert first.add('lease', 'key', {"owner": 1}, ttl=0.1) is True
+    assert second.add('lease', 'key', {"owner": 2}, ttl=0.1) is False
+    assert second.get('lease', 'key') == {"owner": 1}
+
+    time.sleep(0.15)
+    assert second.add('lease', 'key', {"owner": 2}, ttl=60) is True
+    assert first.get('lease', 'key') == {"owner": 2}
+
+    first.delete('lease', 'key')
+    assert first.add('lease', 'key', {"owner": 1}, ttl=60) is True
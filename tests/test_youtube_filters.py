@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""youtube_filters.py 테스트 - 단계별 통계"""
+
+import time
+
+from youtube_filters import FilterStage, FilterPipeline
+
+def slow_eager(contexts, delay=0.2):
+    """묶음 전체를 한 번에 계산하는 단계 (evaluate 안에서 시간을 씀)"""
+    time.sleep(delay)
+    return [context["value"] % 2 == 0 for context in contexts]
+
+def test_eager_stage_time_is_reported():
+    pipeline = FilterPipeline([FilterStage('even', 1, slow_eager)])
+
+    passed = list(pipeline.run({"value": value} for value in range(4)))
+
+    assert [context["value"] for context in passed] == [0, 2]
+    [stat] = pipeline.stats()
+    assert stat["evaluated"] == 4 and stat["removed"] == 2
+    assert stat["seconds"] >= 0.2
+
+def test_lazy_stage_time_is_reported():
+    def slow_values(contexts):
+        for context in contexts:
+            time.sleep(0.05)
+            yield context["value"]
+
+    pipeline = FilterPipeline([FilterStage('value', 1, slow_values)])
+
+    assert len(list(pipeline.run({"value": value} for value in range(1, 4)))) == 3
+    assert pipeline.stats()[0]["seconds"] >= 0.15
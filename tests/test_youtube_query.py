@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""youtube_query.py 테스트 - 열 저장 형식 보관과 표현식 실행"""
+
+import pytest
+
+import youtube_query
+from youtube_channel_store import ChannelSnapshotStore
+from youtube_query import compile_query, get_columns, save_columns
+
+CHANNEL = "UC" + "q" * 22
+
+def video(video_id, title, duration, views, published="2024-05-01T00:00:00Z"):
+    return {"video_id": video_id, "title": title, "description": "", "duration": duration,
+            "view_count": views, "published_at": published}
+
+VIDEOS = [
+    video("video000004", "제주도 여행 맛집 브이로그", 900, 5000),
+    video("video000003", "Cooking at home", 300, 20000),
+    video("video000002", "부산 맛집 여행", 1200, 800),
+    video("video000001", "Unboxing", 60, 100),
+]
+
+@pytest.fixture
+def store(tmp_path):
+    return ChannelSnapshotStore(path=str(tmp_path / 'channels.sqlite3'))
+
+@pytest.fixture(autouse=True)
+def fresh_process(monkeypatch):
+    """열의 프로세스 안 캐시를 비워서 새 CLI 프로세스처럼 시작"""
+    monkeypatch.setattr(youtube_query, '_columns_cache', {})
+
+def snapshot(videos, created_at=1000.0):
+    return {"channel_id": CHANNEL, "videos": list(videos), "created_at": created_at}
+
+def count_travel_scores(monkeypatch):
+    calls = []
+    score = youtube_query.travel_score
+
+    def counting(title, description=""):
+        calls.append(title)
+        return score(title, description)
+
+    monkeypatch.setattr(youtube_query, 'travel_score', counting)
+    return calls
+
+def test_new_process_loads_stored_columns_without_rescoring(monkeypatch, store):
+    first = get_columns(snapshot(VIDEOS), store)
+
+    monkeypatch.setattr(youtube_query, '_columns_cache', {})
+    calls = count_travel_scores(monkeypatch)
+    loaded = get_columns(snapshot(VIDEOS), store)
+
+    assert calls == []
+    assert loaded is not first
+    assert loaded.video_ids == first.video_ids
+    assert loaded.travel_score == first.travel_score
+    assert loaded.duration == first.duration and loaded.published == first.published
+
+def test_only_new_videos_are_converted_and_stored(monkeypatch, store):
+    get_columns(snapshot(VIDEOS), store)
+    calls = count_travel_scores(monkeypatch)
+
+    newest = video("video000005", "서울 여행", 700, 10)
+    monkeypatch.setattr(youtube_query, '_columns_cache', {})
+    columns = get_columns(snapshot([newest] + VIDEOS), store)
+
+    assert calls == ["서울 여행"]
+    assert columns.video_ids[0] == "video000005" and len(columns) == 5
+    assert store.load_columns(CHANNEL)[1]["video_ids"].startswith('["video000005"')
+
+def test_recreated_snapshot_rebuilds_columns(monkeypatch, store):
+    get_columns(snapshot(VIDEOS), store)
+    calls = count_travel_scores(monkeypatch)
+
+    monkeypatch.setattr(youtube_query, '_columns_cache', {})
+    get_columns(snapshot(VIDEOS, created_at=2000.0), store)
+
+    assert len(calls) == len(VIDEOS)
+    assert store.load_columns(CHANNEL)[0] == 2000.0
+
+def test_probed_subtitles_are_stored_but_empty_results_are_probed_again(store):
+    columns = get_columns(snapshot(VIDEOS), store)
+    languages = {"video000004": [{"language_code": "ko", "is_generated": False}], "video000003": []}
+    columns.ensure_subtitles([0, 1], lambda video_ids: [languages[video_id] for video_id in video_ids])
+    save_columns(CHANNEL, columns, store)
+
+    youtube_query._columns_cache.clear()
+    loaded = get_columns(snapshot(VIDEOS), store)
+
+    assert loaded.subtitles == [languages["video000004"], None, None, None]
+
+def test_query_filters_and_sorts_columns(store):
+    columns = get_columns(snapshot(VIDEOS), store)
+
+    def ids(text, probe=None):
+        return [columns.video_ids[i] for i in compile_query(text).execute(columns, probe)]
+
+    assert ids("duration >= 10m order by views desc") == ["video000004", "video000002"]
+    assert ids("travel and not title ~ '부산'") == ["video000004"]
+    assert ids("views > 10k or duration < 2m") == ["video000003", "video000001"]
+    assert ids("order by title limit 2") == ["video000003", "video000001"]
+    assert ids("published >= 2024-05-01 and views <= 800") == ["video000002", "video000001"]
+
+    probed = []
+
+    def probe(video_ids):
+        probed.extend(video_ids)
+        return [[{"language_code": "en-US", "is_generated": True}] for _ in video_ids]
+
+    assert ids("duration >= 20m and subtitles = en", probe) == ["video000002"]
+    assert probed == ["video000002"]
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""youtube_rss.py 테스트 - 로컬 http.server가 픽스처 피드를 제공 (YOUTUBE_RSS_FEED_URL)"""
+
+import importlib
+import threading
+import urllib.error
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import youtube_rss
+
+CHANNEL = "UC" + "a" * 22
+UNKNOWN_CHANNEL = "UC" + "z" * 22
+
+def feed_xml(entries):
+    """(video_id, published) 목록으로 Atom 피드 생성 (최신순)"""
+    body = ''.join(
+        f"<entry><yt:videoId>{video_id}</yt:videoId><title>영상 {video_id}</title>"
+        f"<published>{published}</published></entry>"
+        for video_id, published in entries
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">'
+        f'{body}</feed>'
+    ).encode('utf-8')
+
+class FeedServer:
+    """채널 ID별 피드를 ETag와 함께 돌려주는 로컬 서버 (요청마다 응답 코드를 기록)"""
+
+    def __init__(self):
+        self.feeds = {}
+        self.statuses = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+                body = server.feeds.get(query.get('channel_id', [''])[0])
+                if body is None:
+                    status = 404
+                else:
+                    etag = f'"{hash(body) & 0xffffffff:x}"'
+                    status = 304 if self.headers.get('If-None-Match') == etag else 200
+                server.statuses.append(status)
+                self.send_response(status)
+                if status == 200:
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Type', 'application/atom+xml')
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if status == 200:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/feeds/videos.xml"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+
+@pytest.fixture
+def feed_server(monkeypatch):
+    server = FeedServer()
+    server.thread.start()
+    # 모듈을 다시 읽어 YOUTUBE_RSS_FEED_URL이 피드 주소로 쓰이게 함
+    monkeypatch.setenv('YOUTUBE_RSS_FEED_URL', server.url)
+    importlib.reload(youtube_rss)
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
+    monkeypatch.undo()
+    importlib.reload(youtube_rss)
+
+@pytest.fixture
+def watcher(feed_server, tmp_path):
+    return youtube_rss.UploadWatcher(path=str(tmp_path / 'rss.sqlite3'))
+
+def test_first_check_only_records_baseline(feed_server, watcher):
+    feed_server.feeds[CHANNEL] = feed_xml([
+        ("video00002", "2024-05-02T00:00:00+00:00"),
+        ("video00001", "2024-05-01T00:00:00+00:00"),
+    ])
+
+    result = watcher.check(CHANNEL)
+
+    assert result["baseline"] is True
+    assert result["new_videos"] == []
+    assert watcher.pop_new_uploads() == []
+
+def test_unchanged_feed_is_not_modified(feed_server, watcher):
+    feed_server.feeds[CHANNEL] = feed_xml([("video00001", "2024-05-01T00:00:00+00:00")])
+    watcher.check(CHANNEL)
+
+    result = watcher.check(CHANNEL)
+
+    assert feed_server.statuses == [200, 304]
+    assert result["not_modified"] is True
+    assert result["new_videos"] == []
+
+def test_new_upload_is_reported_and_queued(feed_server, watcher):
+    feed_server.feeds[CHANNEL] = feed_xml([("video00001", "2024-05-01T00:00:00+00:00")])
+    watcher.check(CHANNEL)
+    feed_server.feeds[CHANNEL] = feed_xml([
+        ("video00002", "2024-05-02T00:00:00+00:00"),
+        ("video00001", "2024-05-01T00:00:00+00:00"),
+    ])
+
+    result = watcher.check(CHANNEL)
+
+    assert result["baseline"] is False
+    assert [video["video_id"] for video in result["new_videos"]] == ["video00002"]
+    assert [video["video_id"] for video in watcher.pop_new_uploads()] == ["video00002"]
+
+def test_resurfaced_old_entry_is_not_reported(feed_server, watcher):
+    feed_server.feeds[CHANNEL] = feed_xml([
+        ("video00003", "2024-05-03T00:00:00+00:00"),
+        ("video00002", "2024-05-02T00:00:00+00:00"),
+    ])
+    watcher.check(CHANNEL)
+    # 피드 밖으로 밀려나 있던 오래된 영상이 다시 나타남
+    feed_server.feeds[CHANNEL] = feed_xml([
+        ("video00003", "2024-05-03T00:00:00+00:00"),
+        ("video00002", "2024-05-02T00:00:00+00:00"),
+        ("video00000", "2024-04-01T00:00:00+00:00"),
+    ])
+
+    result = watcher.check(CHANNEL)
+
+    assert result["new_videos"] == []
+    assert watcher.pop_new_uploads() == []
+
+def test_unknown_channel_is_404(feed_server, watcher):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        watcher.check(UNKNOWN_CHANNEL)
+    assert error.value.code == 404
+
+    [result] = watcher.check_many([UNKNOWN_CHANNEL])
+    assert result["channel_id"] == UNKNOWN_CHANNEL
+    assert "404" in result["error"]
+
+def test_pop_new_uploads_drains_queue(feed_server, watcher):
+    feed_server.feeds[CHANNEL] = feed_xml([("video00001", "2024-05-01T00:00:00+00:00")])
+    watcher.check(CHANNEL)
+    feed_server.feeds[CHANNEL] = feed_xml([
+        ("video00003", "2024-05-03T00:00:00+00:00"),
+        ("video00002", "2024-05-02T00:00:00+00:00"),
+        ("video00001", "2024-05-01T00:00:00+00:00"),
+    ])
+    watcher.check(CHANNEL)
+
+    first = watcher.pop_new_uploads(limit=1)
+    rest = watcher.pop_new_uploads()
+
+    assert [video["video_id"] for video in first + rest] == ["video00003", "video00002"]
+    assert all(video["channel_id"] == CHANNEL for video in first + rest)
+    assert watcher.pop_new_uploads() == []
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""youtube_subtitle_engine.py 테스트 - 가짜 백엔드로 hedge 실행 확인"""
+
+import threading
+
+import pytest
+
+import youtube_subtitle_engine
+from youtube_subtitle_engine import SubtitleBackendError, extract_subtitle
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+@pytest.fixture
+def backends(monkeypatch):
+    """(등록 함수, 백엔드별 호출 횟수) - 등록한 가짜 백엔드만 쓰도록 레지스트리를 바꿈"""
+    registry = {}
+    sources = {}
+    calls = {}
+    monkeypatch.setattr(youtube_subtitle_engine, 'SUBTITLE_BACKENDS', registry)
+    monkeypatch.setattr(youtube_subtitle_engine, 'SUBTITLE_BACKEND_SOURCES', sources)
+
+    def register(name, func, source=None):
+        def backend(video_id, subtitle_format):
+            calls[name] = calls.get(name, 0) + 1
+            return func(video_id, subtitle_format)
+        youtube_subtitle_engine.register_backend(name, source)(backend)
+
+    return register, calls
+
+def subtitle(method):
+    return {"subtitle": "[0:01] 안녕하세요", "format": "text_with_timestamps", "method": method}
+
+def test_backends_with_the_same_source_resolve_the_track_once(backends):
+    register, calls = backends
+    release = threading.Event()
+
+    def slow_listing(video_id, subtitle_format):
+        release.wait(5)
+        raise SubtitleBackendError('NO_SUBTITLES_FOUND', '자막 없음')
+
+    def other_source(video_id, subtitle_format):
+        release.set()
+        return subtitle('yt-dlp')
+
+    register('transcript_api', slow_listing, source='youtube-transcript-api')
+    register('real', lambda video_id, subtitle_format: subtitle('list'), source='youtube-transcript-api')
+    register('ytdlp', other_source)
+
+    result = extract_subtitle(VIDEO_ID, backends=['transcript_api', 'real', 'ytdlp'], hedge_delay=0.05, timeout=5)
+
+    assert result["success"] is True
+    assert result["backend"] == "ytdlp"
+    assert calls == {'transcript_api': 1, 'ytdlp': 1}
+    assert [attempt["status"] for attempt in result["attempts"]] == ["pending", "skipped", "ok"]
+    assert result["attempts"][1]["shared_with"] == "transcript_api"
+
+def test_failed_source_moves_on_to_the_next_source(backends):
+    register, calls = backends
+
+    def failing(video_id, subtitle_format):
+        raise SubtitleBackendError('NO_SUBTITLES_FOUND', '자막 없음')
+
+    register('transcript_api', failing, source='youtube-transcript-api')
+    register('real', failing, source='youtube-transcript-api')
+    register('pytube', lambda video_id, subtitle_format: subtitle('pytube'))
+
+    result = extract_subtitle(VIDEO_ID, backends=['transcript_api', 'real', 'pytube'], hedge_delay=5, timeout=5)
+
+    assert result["backend"] == "pytube"
+    assert calls == {'transcript_api': 1, 'pytube': 1}
+
+def test_backend_alone_still_runs(backends):
+    register, calls = backends
+    register('transcript_api', lambda video_id, subtitle_format: subtitle('api'), source='youtube-transcript-api')
+    register('real', lambda video_id, subtitle_format: subtitle('list'), source='youtube-transcript-api')
+
+    result = extract_subtitle(VIDEO_ID, backends=['real'])
+
+    assert result["backend"] == "real"
+    assert calls == {'real': 1}
+
+def test_default_order_leaves_out_the_real_alias():
+    # real은 transcript_api와 출처가 같아 기본 순서에 있으면 항상 "skipped"가 됨
+    defaults = [name.strip() for name in youtube_subtitle_engine.DEFAULT_SUBTITLE_BACKENDS.split(',')]
+
+    assert 'real' not in defaults
+    assert youtube_subtitle_engine.SUBTITLE_BACKEND_SOURCES['real'] == youtube_subtitle_engine.SUBTITLE_BACKEND_SOURCES['transcript_api']
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""youtube_subtitle_parser.py 테스트 - 자동 자막 반복 제거와 수동 자막 보존"""
+
+import os
+
+from youtube_subtitle_parser import iter_cues, iter_segments, dedupe_rolling_cues
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MANUAL_SRT = """1
+00:00:01,000 --> 00:00:02,000
+Hello
+
+2
+00:00:02,000 --> 00:00:03,000
+Hello
+
+3
+00:00:05,000 --> 00:00:06,000
+Hello
+"""
+
+# YouTube 자동 자막처럼 빈 줄 자리에 공백 한 칸이 들어간 롤링 큐 (앞 큐 끝과 10ms 간격)
+ROLLING_VTT = (
+    "WEBVTT\nKind: captions\nLanguage: ko\n\n"
+    "00:00:01.000 --> 00:00:02.990 align:start position:0%\n \n"
+    "안녕하세요<00:00:01.500><c> 여러분</c>\n\n"
+    "00:00:02.990 --> 00:00:03.000 align:start position:0%\n안녕하세요 여러분\n \n\n"
+    "00:00:03.000 --> 00:00:05.000 align:start position:0%\n안녕하세요 여러분\n"
+    "오늘은<00:00:03.400><c> 제주도</c>\n\n"
+    "00:00:05.000 --> 00:00:05.010 align:start position:0%\n오늘은 제주도\n \n\n"
+    "00:00:09.000 --> 00:00:10.000 align:start position:0%\n \n"
+    "안녕하세요<00:00:09.500><c> 여러분</c>\n"
+)
+
+def read_fixture(name):
+    with open(os.path.join(ROOT, name), encoding='utf-8') as f:
+        return f.read()
+
+def test_manual_track_keeps_repeated_lines():
+    segments = list(iter_segments(MANUAL_SRT, is_generated=False))
+
+    assert [(segment.start, segment.text) for segment in segments] == [
+        (1000, "Hello"), (2000, "Hello"), (5000, "Hello"),
+    ]
+
+def test_rolling_dedupe_only_merges_repeats_that_continue_in_time():
+    # 시간이 떨어진 같은 줄은 자동 자막이어도 새로 말한 것
+    segments = list(dedupe_rolling_cues(iter_cues(MANUAL_SRT)))
+
+    assert [(segment.start, segment.text) for segment in segments] == [(1000, "Hello"), (5000, "Hello")]
+
+def test_generated_track_collapses_rolling_cues_with_word_timings():
+    segments = list(iter_segments(ROLLING_VTT, is_generated=True))
+
+    assert [(segment.start, segment.text, segment.words) for segment in segments] == [
+        (1000, "안녕하세요 여러분", ((0, 0), (6, 500))),
+        (3000, "오늘은 제주도", ((0, 0), (4, 400))),
+        (9000, "안녕하세요 여러분", ((0, 0), (6, 500))),
+    ]
+
+def test_manual_fixtures_keep_every_cue():
+    for name in ('test_subtitle.en.vtt', 'temp_subtitles/vOLXGEt3C-A_subtitle.ja.vtt'):
+        content = read_fixture(name)
+        cues = [cue for cue in iter_cues(content) if cue.text.strip()]
+        segments = list(iter_segments(content, is_generated=False))
+
+        assert [(segment.start, segment.end) for segment in segments] == [(cue.start, cue.end) for cue in cues]
+        starts = {segment.start for segment in segments}
+        # 24:40.712 "퍼", 24:41.346 반복된 줄
+        assert {1480712, 1481346} <= starts
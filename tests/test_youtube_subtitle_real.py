@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""youtube_subtitle_real.py 테스트 - 단독 실행 출력의 [MM:SS] 형식 유지"""
+
+import pytest
+
+pytest.importorskip('youtube_transcript_api')
+
+import youtube_subtitle_real
+
+class FakeTrack:
+    language = "Korean"
+    language_code = "ko"
+    is_generated = False
+
+    def fetch(self):
+        return [{"text": "안녕하세요", "start": 5.0, "duration": 1.0}, {"text": "여행", "start": 65.5, "duration": 1.0}]
+
+class FakeApi:
+    def list(self, video_id):
+        return [FakeTrack()]
+
+def test_standalone_output_keeps_padded_timestamps(monkeypatch):
+    monkeypatch.setattr(youtube_subtitle_real, 'YouTubeTranscriptApi', FakeApi)
+
+    result = youtube_subtitle_real.get_real_subtitle("dQw4w9WgXcQ")
+
+    # src/server.js, api/youtube/subtitle.js가 받는 예전 형식 그대로
+    assert result["subtitle"] == "[00:05] 안녕하세요\n[01:05] 여행"
+    assert result["format"] == "text_with_padded_timestamps"
+
+def test_engine_format_is_passed_through(monkeypatch):
+    monkeypatch.setattr(youtube_subtitle_real, 'YouTubeTranscriptApi', FakeApi)
+
+    result = youtube_subtitle_real.get_real_subtitle("dQw4w9WgXcQ", subtitle_format='text_with_timestamps')
+
+    assert result["subtitle"] == "[0:05] 안녕하세요\n[1:05] 여행"
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""youtube_subtitle_transcript.py 테스트 - 세그먼트의 단어 시각 보관과 JSON 출력"""
+
+import json
+
+from youtube_subtitle_parser import Segment
+from youtube_subtitle_transcript import Transcript
+
+SEGMENTS = [
+    Segment(1000, 3000, "안녕하세요 여러분", ((0, 0), (6, 500))),
+    Segment(3000, 5000, "[음악]", ()),
+    Segment(9000, 10000, "오늘은 제주도", ((0, 0), (4, 400))),
+]
+
+def test_from_segments_keeps_word_timings():
+    transcript = Transcript.from_segments(SEGMENTS)
+
+    assert [transcript.words(index) for index in range(len(transcript))] == [segment.words for segment in SEGMENTS]
+    assert list(transcript.word_offsets) == [0, 2, 2, 4]
+    assert list(transcript.word_starts) == [0, 500, 0, 400]
+
+def test_to_json_emits_word_timings():
+    entries = json.loads(Transcript.from_segments(SEGMENTS).to_json())
+
+    assert entries[0] == {
+        "text": "안녕하세요 여러분", "start": 1.0, "duration": 2.0,
+        "words": [{"text": "안녕하세요", "start": 1.0}, {"text": "여러분", "start": 1.5}],
+    }
+    assert "words" not in entries[1]
+    assert entries[2]["words"] == [{"text": "오늘은", "start": 9.0}, {"text": "제주도", "start": 9.4}]
+
+def test_entries_have_no_word_timings():
+    transcript = Transcript.from_entries([{"text": "hello", "start": 1.5, "duration": 2.0}])
+
+    assert transcript.words(0) == ()
+    assert json.loads(transcript.to_json()) == [{"text": "hello", "start": 1.5, "duration": 2.0}]
+
+def test_padded_text_keeps_two_digit_minutes():
+    transcript = Transcript.from_entries([
+        {"text": "hello", "start": 65.2, "duration": 1.0},
+        {"text": "later", "start": 4503.0, "duration": 1.0},
+    ])
+
+    assert transcript.render('text_with_timestamps') == "[1:05] hello\n[75:03] later"
+    assert transcript.render('text_with_padded_timestamps') == "[01:05] hello\n[75:03] later"
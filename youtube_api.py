@@ -2,8 +2,41 @@
 # -*- coding: utf-8 -*-
 """
 YouTube API integration for web interface
-Usage: python youtube_api.py <action> <url_or_video_id>
-Actions: analyze, subtitle
+Usage: python youtube_api.py [--log-level=LEVEL] <action> <url_or_video_id> [page] [filters] [cursor]
+       python youtube_api.py analyze-batch <file|->
+       python youtube_api.py watch <file|->
+       python youtube_api.py new-uploads
+       python youtube_api.py serve [workers]
+Actions: analyze, analyze-stream, analyze-batch, subtitle, watch, new-uploads, serve, cache-stats, quota
+
+analyze-batch는 파일(또는 '-'이면 stdin)에서 한 줄에 하나씩 영상 URL/ID를 읽어
+videos.list로 50개씩 묶어 조회하고, 입력 순서대로 항목별 결과(또는 error)를 돌려줍니다.
+serve 모드에서는 {"action": "analyze-batch", "urls": [...]}로 요청합니다.
+
+watch는 같은 형식의 채널 목록(채널 ID 또는 URL)의 RSS 피드를 읽어 지난 확인 이후 새로 올라온
+영상만 보고하고 큐에 쌓습니다 (Data API 할당량 사용 없음). new-uploads는 쌓인 영상을 꺼냅니다.
+
+analyze 결과는 채널 ID + 필터 조합별로 캐시합니다. ANALYZE_CACHE_FRESH_TTL(초) 안의 결과는 그대로,
+ANALYZE_CACHE_STALE_TTL까지는 바로 돌려주면서 백그라운드에서 다시 계산하고, 같은 요청이 동시에
+들어오면 계산 하나를 공유합니다. (filters에 "noCache": true를 주면 캐시를 거치지 않음)
+같은 캐시 파일을 쓰는 프로세스끼리도 lease(캐시의 analyze_lease 항목)로 한 프로세스만 계산하고,
+나머지는 그 결과가 캐시에 들어오기를 기다리거나(miss) 갱신을 생략합니다(stale).
+단발성 CLI는 다시 계산하는 일을 분리된 자식 프로세스(analyze-refresh)에 넘기고 응답 직후 종료합니다.
+
+analyze-stream은 필터를 통과한 영상을 찾는 즉시 한 줄에 하나씩 NDJSON으로 출력하고
+마지막 줄에 summary(또는 error) 레코드를 출력합니다.
+  {"type": "video", "video": {...}}
+  {"type": "summary", "total_videos": 12, "filters_applied": {...}}
+
+serve 모드는 프로세스를 상주시키고 stdin에서 한 줄에 하나씩 JSON 요청을 읽어
+한 줄에 하나씩 JSON 응답을 출력합니다. 요청마다 id를 붙여 여러 요청을 동시에 처리합니다.
+  요청: {"id": 1, "action": "analyze", "url": "...", "page": 1, "filters": {...}, "cursor": null}
+  응답: {"id": 1, "result": {...}}
+action이 analyze-stream이면 레코드마다 {"id": 1, "record": {...}} 줄을 출력합니다.
+
+로그는 기본적으로 경고만 stderr에 출력합니다 (YOUTUBE_API_LOG_LEVEL 또는 --log-level).
+INFO 이상이면 요청마다 구간별 시간(channel_resolution, listing, details, filtering,
+subtitle_probes 등)을 담은 JSON 요약을 한 줄씩 출력합니다.
 """
 
 import sys
@@ -11,14 +44,25 @@ import json
 import re
 import io
 import os
-from urllib.parse import urlparse, parse_qs
-
-# UTF-8 인코딩 설정
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
-from rubberdog.youtube.collector import YouTubeCollector
-from rubberdog.youtube.subtitle_extractor import SubtitleExtractor
-from youtube_transcript_api import YouTubeTranscriptApi
+import threading
+import time
+import base64
+from itertools import islice
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from urllib.parse import urlparse, parse_qs, unquote
+
+# 무거운 의존성(rubberdog, youtube_transcript_api, requests 등)과 API 키는 해당 액션이
+# 처음 쓸 때 불러옴 - subtitle처럼 Data API 키가 필요 없는 액션의 프로세스 시작을 빠르게 유지
+from youtube_cache import get_default_cache
+from youtube_filters import FilterStage, FilterPipeline
+from youtube_log import logger, configure_logging, request_trace, span, record_span
+from youtube_quota import QuotaExhaustedError, QUOTA_COSTS
+
+def configure_stdio():
+    """UTF-8 인코딩 설정 (CLI로 실행할 때만)"""
+    sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
 # YouTube API Keys - 환경변수에서 읽어옴
 def get_youtube_api_keys():
@@ -37,34 +81,83 @@ def get_youtube_api_keys():
     if not keys and os.getenv('YOUTUBE_API_KEYS'):
         keys = [key.strip() for key in os.getenv('YOUTUBE_API_KEYS').split(',')]
 
-    if not keys:
-        print("ERROR: No YouTube API keys found in environment variables", file=sys.stderr)
-        print("Please set YOUTUBE_API_KEY_PRIMARY, YOUTUBE_API_KEY_BACKUP, YOUTUBE_API_KEY_ADDITIONAL", file=sys.stderr)
-        print("Or set YOUTUBE_API_KEYS with comma-separated values", file=sys.stderr)
-        sys.exit(1)
-
     return keys
 
-YOUTUBE_API_KEYS = get_youtube_api_keys()
-
-# 현재 사용 중인 키 인덱스
-current_key_index = 2
-
-def get_current_api_key():
-    """현재 사용 가능한 API 키 반환"""
-    global current_key_index
-    if current_key_index < len(YOUTUBE_API_KEYS):
-        return YOUTUBE_API_KEYS[current_key_index]
-    return None
-
-def switch_to_next_key():
-    """다음 API 키로 전환"""
-    global current_key_index
-    current_key_index += 1
-    if current_key_index < len(YOUTUBE_API_KEYS):
-        print(f"DEBUG: Switching to API key #{current_key_index + 1}", file=sys.stderr)
-        return True
-    return False
+# API 키가 하나도 없을 때의 안내 메시지
+NO_API_KEYS_MESSAGE = (
+    "No YouTube API keys found in environment variables. "
+    "Please set YOUTUBE_API_KEY_PRIMARY, YOUTUBE_API_KEY_BACKUP, YOUTUBE_API_KEY_ADDITIONAL "
+    "or YOUTUBE_API_KEYS with comma-separated values"
+)
+
+_key_pool = None
+_key_pool_lock = threading.Lock()
+
+def get_key_pool():
+    """할당량을 추적하며 키를 골라 주는 키 풀 (처음 Data API를 쓸 때 키를 읽어 생성, 사용량은 프로세스 간 공유)
+
+    Raises:
+        RuntimeError: 환경변수에 API 키가 없을 때
+    """
+    global _key_pool
+    with _key_pool_lock:
+        if _key_pool is None:
+            keys = get_youtube_api_keys()
+            if not keys:
+                raise RuntimeError(NO_API_KEYS_MESSAGE)
+            from youtube_quota import ApiKeyPool
+            _key_pool = ApiKeyPool(keys)
+        return _key_pool
+
+# 모든 키가 소진되었을 때의 안내 메시지
+QUOTA_EXHAUSTED_MESSAGE = "모든 API 키의 할당량이 초과되었습니다. 나중에 다시 시도해주세요."
+
+# 스레드별로 재사용하는 클라이언트 (googleapiclient/httplib2는 스레드 안전하지 않음)
+_thread_local = threading.local()
+
+def get_collector(api_key):
+    """API 키별 YouTubeCollector 재사용 (serve 모드에서 HTTP 세션 유지)"""
+    collectors = getattr(_thread_local, 'collectors', None)
+    if collectors is None:
+        collectors = _thread_local.collectors = {}
+    collector = collectors.get(api_key)
+    if collector is None:
+        from rubberdog.youtube.collector import YouTubeCollector
+        collector = collectors[api_key] = YouTubeCollector(api_key)
+    return collector
+
+def call_collector(method, func):
+    """키 풀에서 키를 받아 func(collector) 실행 (할당량 초과 응답 시 다음 키로 재시도)
+
+    Args:
+        method (str): 할당량 비용 계산용 Data API 메서드 이름 (예: 'search.list')
+    """
+    key_pool = get_key_pool()
+    while True:
+        api_key = key_pool.acquire(QUOTA_COSTS[method], method)
+        try:
+            return func(get_collector(api_key))
+        except Exception as e:
+            if not is_quota_error(e):
+                raise
+            logger.warning(f"Quota exceeded on {method}, switching API key")
+            key_pool.mark_exhausted(api_key)
+
+def get_data_client():
+    """스레드별 YouTubeDataClient 재사용 (requests 세션 유지, 키는 호출마다 키 풀에서 선택)"""
+    client = getattr(_thread_local, 'data_client', None)
+    if client is None:
+        from youtube_data_api import YouTubeDataClient
+        client = _thread_local.data_client = YouTubeDataClient(get_key_pool())
+    return client
+
+def get_subtitle_extractor():
+    """스레드별 SubtitleExtractor 재사용"""
+    extractor = getattr(_thread_local, 'subtitle_extractor', None)
+    if extractor is None:
+        from rubberdog.youtube.subtitle_extractor import SubtitleExtractor
+        extractor = _thread_local.subtitle_extractor = SubtitleExtractor()
+    return extractor
 
 def extract_video_id(url):
     """YouTube URL에서 video ID 추출"""
@@ -99,6 +192,68 @@ def extract_channel_info(url):
 
     return None
 
+# 채널 ID 형식 (UC + 22자)
+CHANNEL_ID_PATTERN = re.compile(r'^UC[0-9A-Za-z_-]{22}$')
+
+def channel_cache_key(url):
+    """채널 URL을 캐시 키로 정규화 (예: 'handle:여행유튜버', 'user:foo')
+
+    /channel/UC... URL은 이미 채널 ID이므로 캐시 키 대신 None을 반환합니다.
+    """
+    channel_info = extract_channel_info(url)
+    if not channel_info:
+        return None
+    channel_info = unquote(channel_info).strip()
+
+    if re.search(r'youtube\.com/channel/', url) and CHANNEL_ID_PATTERN.match(channel_info):
+        return None
+    if re.search(r'youtube\.com/@', url):
+        kind = 'handle'
+    elif re.search(r'youtube\.com/c/', url):
+        kind = 'custom'
+    elif re.search(r'youtube\.com/user/', url):
+        kind = 'user'
+    else:
+        kind = 'channel'
+    # 핸들/커스텀 URL은 대소문자를 구분하지 않음
+    return f"{kind}:{channel_info.lower()}"
+
+def resolve_channel_id(url, refresh=False):
+    """채널 URL을 채널 ID로 변환
+
+    /channel/UC... URL은 네트워크 없이 바로 반환하고, 핸들/커스텀 URL은 search.list
+    결과를 만료 없이 캐시합니다. (채널 조회가 실패했을 때만 refresh=True로 다시 검색)
+
+    Returns:
+        tuple: (channel_id 또는 None, 캐시에서 가져왔는지 여부)
+    """
+    channel_info = extract_channel_info(url)
+    if not channel_info:
+        return None, False
+
+    cache_key = channel_cache_key(url)
+    if cache_key is None:
+        return unquote(channel_info), False
+
+    cache = get_default_cache()
+    if refresh:
+        cache.delete('channel_id', cache_key)
+    else:
+        channel_id = cache.get('channel_id', cache_key)
+        if channel_id:
+            return channel_id, True
+
+    # 채널 ID 검색 (search.list - 100 units)
+    search_results = call_collector(
+        'search.list', lambda collector: collector._search_by_keyword(unquote(channel_info))
+    )
+    if not search_results:
+        return None, False
+
+    channel_id = search_results[0]["channel_id"]
+    cache.set('channel_id', cache_key, channel_id, ttl=None)
+    return channel_id, False
+
 def is_channel_url(url):
     """채널 URL인지 확인"""
     channel_patterns = [
@@ -110,220 +265,809 @@ def is_channel_url(url):
 
     return any(re.search(pattern, url) for pattern in channel_patterns)
 
-def is_travel_video(title, description=""):
-    """영상이 해외 여행 관련인지 판단"""
-    travel_keywords = [
-        # 여행 관련 한국어 키워드
-        '여행', '해외여행', '여행기', '여행브이로그', '여행 vlog', '여행일기',
-        '패키지여행', '자유여행', '배낭여행', '신혼여행', '가족여행',
-
-        # 국가/도시 관련 키워드 (주요 여행지)
-        '일본', '도쿄', '오사카', '교토', '후쿠오카', '삿포로', '오키나와',
-        '태국', '방콕', '치안마이', '푸켓', '파타야',
-        '베트남', '호치민', '하노이', '다낭', '나트랑',
-        '필리핀', '세부', '보라카이', '마닐라',
-        '중국', '베이징', '상하이', '홍콩', '마카오', '대만', '타이베이',
-        '미국', '뉴욕', '라스베이거스', '로스앤젤레스', '샌프란시스코', '하와이',
-        '유럽', '이탈리아', '로마', '밀라노', '베네치아', '피렌체',
-        '프랑스', '파리', '니스', '칸', '리옹',
-        '스페인', '바르셀로나', '마드리드', '세비야',
-        '영국', '런던', '에딘버러',
-        '독일', '베를린', '뮌헨', '프랑크푸르트',
-        '스위스', '취리히', '인터라켄', '제네바',
-        '터키', '이스탄불', '카파도키아',
-        '인도네시아', '발리', '자카르타',
-        '싱가포르', '말레이시아', '쿠알라룸푸르',
-        '호주', '시드니', '멜버른', '골드코스트', '케언즈',
-        '뉴질랜드', '오클랜드', '퀸스타운',
-        '캐나다', '벤쿠버', '토론토', '몬트리올',
-        '러시아', '모스크바', '상트페테르부르크',
-        '이집트', '카이로', '룩소르',
-        '두바이', 'UAE', '아랍에미리트',
-
-        # 여행 활동 관련
-        '맛집', '맛집투어', '현지음식', '로컬푸드',
-        '관광', '관광지', '명소', '랜드마크', '박물관', '미술관',
-        '호텔', '숙소', '리조트', '펜션',
-        '쇼핑', '면세점', '시장', '벼룩시장',
-        '액티비티', '투어', '가이드',
-
-        # 영어 키워드
-        'travel', 'trip', 'vacation', 'holiday', 'tour', 'vlog',
-        'japan', 'tokyo', 'osaka', 'kyoto', 'thailand', 'bangkok',
-        'vietnam', 'philippines', 'singapore', 'malaysia', 'indonesia',
-        'europe', 'italy', 'france', 'spain', 'germany', 'swiss',
-        'usa', 'america', 'newyork', 'losangeles', 'hawaii',
-        'australia', 'newzealand', 'canada', 'dubai'
-    ]
+def _probe_session():
+    """자막 확인용 requests.Session - deadline(time.monotonic())이 있으면 남은 시간을 요청마다 timeout으로 씀
+
+    youtube_transcript_api는 timeout 없이 요청하므로, 응답 없는 서버에 걸린 확인도
+    deadline이 지나면 requests.Timeout으로 끝나고 작업 스레드를 돌려줍니다.
+    """
+    import requests
+
+    class ProbeSession(requests.Session):
+        deadline = None
+
+        def request(self, method, url, **kwargs):
+            if self.deadline is not None and kwargs.get('timeout') is None:
+                remaining = self.deadline - time.monotonic()
+                if remaining <= 0:
+                    raise requests.Timeout(f"Subtitle check deadline passed before {method} {url}")
+                kwargs['timeout'] = remaining
+            return super().request(method, url, **kwargs)
+
+    return ProbeSession()
+
+def get_transcript_api():
+    """스레드별 YouTubeTranscriptApi 재사용 (HTTP 세션 유지, 세션은 _thread_local.transcript_session)"""
+    api = getattr(_thread_local, 'transcript_api', None)
+    if api is None:
+        from youtube_transcript_api import YouTubeTranscriptApi
+        session = _thread_local.transcript_session = _probe_session()
+        api = _thread_local.transcript_api = YouTubeTranscriptApi(http_client=session)
+    return api
+
+def check_subtitle_availability(video_id, timeout=None):
+    """비디오의 자막 언어 목록 확인 (자막 본문은 받지 않고 목록만 조회)
+
+    결과는 로컬 캐시에 저장되며, 자막이 없다는 결과는 짧은 TTL로 보관합니다.
+    목록 조회의 HTTP 요청은 모두 합쳐 timeout초(기본 SUBTITLE_PROBE_TIMEOUT) 안에 끝나야 하며,
+    넘으면 확인 실패(빈 리스트, 캐시하지 않음)로 처리합니다.
+
+    Returns:
+        list: [{"language_code": "ko", "is_generated": False}, ...]
+              수동 자막이 먼저 오며, 자막이 없으면 빈 리스트
+    """
+    cache = get_default_cache()
+    cached = cache.get('subtitle_languages', video_id)
+    if cached is not None:
+        return cached
+
+    from youtube_transcript_api import TranscriptsDisabled, NoTranscriptFound
+
+    api = get_transcript_api()
+    session = _thread_local.transcript_session
+    session.deadline = time.monotonic() + (SUBTITLE_PROBE_TIMEOUT if timeout is None else timeout)
+    try:
+        transcript_list = api.list(video_id)
+        languages = [
+            {"language_code": t.language_code, "is_generated": t.is_generated}
+            for t in transcript_list
+        ]
+    except (TranscriptsDisabled, NoTranscriptFound) as e:
+        logger.debug(f"No subtitles for {video_id}: {e.__class__.__name__}")
+        languages = []
+    except Exception as e:
+        # 네트워크 오류 등 일시적인 에러는 캐시하지 않고 빈 리스트 반환
+        logger.warning(f"Subtitle check failed for {video_id}: {e}")
+        return []
+    finally:
+        session.deadline = None
+
+    cache.set('subtitle_languages', video_id, languages, positive=bool(languages))
+    return languages
+
+# 자막 확인 병렬 처리 설정 (filters의 probeConcurrency/probeTimeout으로 요청별 변경 가능)
+SUBTITLE_PROBE_WORKERS = int(os.getenv('SUBTITLE_PROBE_WORKERS', '8'))
+SUBTITLE_PROBE_TIMEOUT = float(os.getenv('SUBTITLE_PROBE_TIMEOUT', '15'))
+
+def iter_subtitle_probes(video_ids, max_workers=None, timeout=None):
+    """자막 확인을 스레드 풀에서 동시에 실행하고 결과를 원래 영상 순서대로 돌려줌
+
+    동시 실행 수는 max_workers로 제한되며, 시작 후 timeout초 안에 끝나지 않은
+    확인은 자막 없음(빈 리스트)으로 처리합니다. 확인의 HTTP 요청도 같은 timeout으로 끊기므로
+    응답 없는 확인이 작업 슬롯을 붙잡고 뒤의 확인을 막지 않습니다.
+    """
+    if max_workers is None:
+        max_workers = SUBTITLE_PROBE_WORKERS
+    if timeout is None:
+        timeout = SUBTITLE_PROBE_TIMEOUT
+
+    started_at = {}
+
+    def probe(index, video_id):
+        started_at[index] = time.monotonic()
+        return check_subtitle_availability(video_id, timeout)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    futures = [executor.submit(probe, index, video_id) for index, video_id in enumerate(video_ids)]
+    try:
+        for index, future in enumerate(futures):
+            while True:
+                start = started_at.get(index)
+                # 아직 대기열에 있으면 시작될 때까지 기다렸다가 제한 시간을 다시 계산
+                remaining = timeout if start is None else start + timeout - time.monotonic()
+                try:
+                    result = future.result(timeout=max(0, remaining))
+                    break
+                except FuturesTimeoutError:
+                    if start is not None:
+                        logger.warning(f"Subtitle check timed out for {video_ids[index]} after {timeout}s")
+                        result = []
+                        break
+                except Exception as e:
+                    logger.warning(f"Subtitle check failed for {video_ids[index]}: {e}")
+                    result = []
+                    break
+            yield result
+    finally:
+        # 시간 초과로 남은 작업은 기다리지 않고, 아직 시작 안 된 작업은 취소
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def is_quota_error(error):
+    """할당량 초과 에러인지 확인"""
+    error_msg = str(error).lower()
+    return "quota" in error_msg or "exceeded" in error_msg or "403" in error_msg
+
+# 채널 분석 한 페이지에 담을 영상 수 (filters의 pageSize로 요청별 변경 가능)
+ANALYZE_PAGE_SIZE = int(os.getenv('ANALYZE_PAGE_SIZE', '50'))
+# 한 번의 호출에서 훑어볼 최대 원본 영상 수 (넘으면 cursor를 돌려주고 중단)
+MAX_SOURCE_VIDEOS_PER_CALL = 1000
+# query 표현식이 대상으로 하는 채널당 최대 영상 수 (스냅샷을 이만큼 채운 뒤 조회)
+QUERY_MAX_VIDEOS = int(os.getenv('QUERY_MAX_VIDEOS', '5000'))
+
+def _filters_key(filters):
+    """cursor가 같은 필터 조건에서만 쓰이도록 필터 조합을 짧은 문자열로 표현"""
+    return ''.join(
+        '1' if filters.get(name) else '0'
+        for name in ('travelOnly', 'subtitleOnly', 'longVideoOnly')
+    )
+
+def encode_cursor(channel_id, last_video_id, filters, skip=0):
+    """다음 호출이 이어서 처리할 위치(마지막으로 처리한 영상)를 불투명한 cursor 문자열로 변환
+
+    skip은 그 위치 다음에서 아직 건너뛰어야 할 통과 영상 수 (page > 1을 훑다가 끊긴 경우)
+    """
+    state = {"c": channel_id, "v": last_video_id, "f": _filters_key(filters)}
+    if skip:
+        state["s"] = skip
+    raw = json.dumps(state, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, filters):
+    """cursor 문자열 해석 (형식이 잘못되었거나 필터가 다르면 ValueError)
+
+    Returns:
+        tuple: (channel_id, last_video_id, 남은 skip 수)
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        channel_id, last_video_id = state["c"], state["v"]
+        skip = int(state.get("s", 0))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if state.get("f") != _filters_key(filters):
+        raise ValueError("Cursor does not match the current filters")
+    return channel_id, last_video_id, max(0, skip)
+
+def build_filter_pipeline(filters):
+    """필터 설정으로 파이프라인 구성 (긴 영상 → 여행 키워드 → 자막 확인 순으로 비쌈)
+
+    여행/자막 단계는 필터로 쓰지 않아도 isTravelVideo/hasSubtitle 표시용으로 항상 포함되며,
+    자막 필터가 없으면 자막 확인은 실제로 돌려줄 영상에만 실행됩니다.
+    """
+    from youtube_travel import classify_travel_videos
+
+    stages = []
+
+    # 긴 영상 필터링 (2분/120초 이상)
+    if filters.get('longVideoOnly', False):
+        stages.append(FilterStage(
+            'long_video', 1,
+            lambda contexts: [context["video"].get("duration", 0) >= 120 for context in contexts]
+        ))
+
+    # 여행 영상 판별은 영상마다 한 번만 (필터와 isTravelVideo 표시에 같이 사용)
+    stages.append(FilterStage(
+        'travel', 10,
+        lambda contexts: classify_travel_videos([context["video"] for context in contexts]),
+        required=filters.get('travelOnly', False)
+    ))
+
+    # 자막 여부는 병렬로 확인 (결과는 원래 순서 유지, 페이지가 차서 멈추면 남은 확인 취소)
+    stages.append(FilterStage(
+        'subtitles', 1000,
+        lambda contexts: iter_subtitle_probes(
+            [context["video"]["video_id"] for context in contexts],
+            max_workers=filters.get('probeConcurrency'),
+            timeout=filters.get('probeTimeout')
+        ),
+        required=filters.get('subtitleOnly', False)
+    ))
+
+    return FilterPipeline(stages)
+
+def record_filter_spans(filter_stats):
+    """필터 단계별 시간을 현재 요청의 구간에 더함 (자막 확인은 subtitle_probes, 나머지는 filtering)
+
+    단계 시간에는 묶음 전체를 한 번에 계산하는 evaluate()(여행 키워드 판별 등)도 들어 있습니다.
+    """
+    for stat in filter_stats:
+        record_span(
+            'subtitle_probes' if stat["stage"] == 'subtitles' else 'filtering',
+            stat["seconds"], stat["evaluated"]
+        )
+
+def format_channel_video(context):
+    """파이프라인을 통과한 context를 채널 분석 결과 형식으로 변환"""
+    video = context["video"]
+    duration_sec = video.get("duration", 0)
+    return {
+        "id": video["video_id"],
+        "title": video.get("title", ""),
+        "duration": f"{duration_sec//60}:{duration_sec%60:02d}",
+        "views": f"{video.get('view_count', 0):,}",
+        "hasSubtitle": context["subtitles"],  # 자막 언어 목록 (없으면 빈 리스트)
+        "isTravelVideo": context["travel"]
+    }
+
+def _iter_query_records(client, store, snapshot, new_count, query, filters, page):
+    """query 표현식을 채널 스냅샷의 열 저장 형식에 적용해서 요청한 페이지의 레코드를 생성
+
+    표현식은 채널 전체(최대 QUERY_MAX_VIDEOS개)를 대상으로 정렬/limit을 적용하므로 스냅샷을
+    끝까지 채운 뒤 실행합니다. 한 번 채운 스냅샷은 새 영상만 갱신되므로, 같은 채널에 다른
+    조건을 다시 물으면 목록을 다시 가져오지 않고 바로 계산합니다. 열(여행 점수, 확인한 자막 언어
+    포함)은 스냅샷 저장소에 함께 보관하므로 새 프로세스도 여행 점수를 다시 계산하지 않습니다.
+    """
+    from youtube_channel_store import extend_snapshot
+    from youtube_query import get_columns, save_columns
+    from youtube_travel import TRAVEL_SCORE_THRESHOLD
+
+    while not snapshot["complete"] and len(snapshot["videos"]) < QUERY_MAX_VIDEOS:
+        extend_snapshot(client, store, snapshot)
+    columns = get_columns(snapshot, store)
+
+    def probe(video_ids):
+        return iter_subtitle_probes(
+            video_ids,
+            max_workers=filters.get('probeConcurrency'),
+            timeout=filters.get('probeTimeout')
+        )
+
+    with span('query'):
+        matched = query.execute(columns, probe)
+
+    page_size = int(filters.get('pageSize') or ANALYZE_PAGE_SIZE)
+    start = max(0, page - 1) * page_size
+    selected = matched[start:start + page_size]
+
+    # 자막 조건이 없었으면 돌려줄 영상만 표시용으로 확인
+    columns.ensure_subtitles(selected, probe)
+    # 확인한 자막 언어도 열과 함께 저장 (다음 프로세스는 다시 확인하지 않음)
+    save_columns(snapshot["channel_id"], columns, store)
+    for i in selected:
+        yield {"type": "video", "video": format_channel_video({
+            "video": {
+                "video_id": columns.video_ids[i],
+                "title": columns.titles[i],
+                "duration": columns.duration[i],
+                "view_count": columns.views[i],
+            },
+            "subtitles": columns.subtitles[i],
+            "travel": columns.travel_score[i] >= TRAVEL_SCORE_THRESHOLD,
+        })}
+
+    yield {
+        "type": "summary",
+        "total_videos": len(selected),
+        "scanned_videos": len(columns),
+        "matched_videos": len(matched),
+        "has_more": start + page_size < len(matched),
+        "new_videos": new_count,
+        "next_cursor": None,
+        "query": query.text,
+        "filters_applied": {
+            "travel_only": filters.get('travelOnly', False),
+            "subtitle_only": filters.get('subtitleOnly', False),
+            "long_video_only": filters.get('longVideoOnly', False)
+        }
+    }
+
+# 자막 확인을 한 번에 병렬로 돌릴 원본 영상 묶음 크기
+FILTER_BATCH_SIZE = 50
+
+_channel_store = None
+_channel_store_lock = threading.Lock()
+
+def get_channel_store():
+    """프로세스 공용 채널 스냅샷 저장소"""
+    global _channel_store
+    with _channel_store_lock:
+        if _channel_store is None:
+            from youtube_channel_store import ChannelSnapshotStore
+            _channel_store = ChannelSnapshotStore()
+        return _channel_store
+
+def _fill_snapshot(client, store, channel_id):
+    """워터마크 이후 새 영상을 스냅샷 앞에 합치고, 비어 있으면 첫 원본 페이지를 가져옴
+
+    Returns:
+        tuple: (스냅샷, 새로 추가된 영상 수, 채널을 찾았는지 여부)
+        이번 호출에서 업로드 재생목록 조회가 실패했을 때만 False (빈 채널은 True)
+    """
+    from youtube_channel_store import refresh_snapshot, extend_snapshot
+
+    snapshot, new_count = refresh_snapshot(client, store, channel_id)
+    found = True
+    if not snapshot["videos"]:
+        looking_up = snapshot["playlist_id"] is None and not snapshot["complete"]
+        extend_snapshot(client, store, snapshot)
+        found = not (looking_up and snapshot["playlist_id"] is None)
+    return snapshot, new_count, found
+
+def _iter_channel_records(url, filters, page=1, cursor=None):
+    """채널 스냅샷의 영상을 순서대로 훑으며 필터를 통과한 영상마다 레코드를 바로 생성
+
+    스냅샷은 새 영상만 증분으로 갱신하고, 요청한 페이지를 채울 만큼만 오래된 원본 페이지를
+    이어서 가져옵니다. 멈춘 위치(마지막으로 처리한 영상)는 next_cursor로 돌려줍니다.
+    cursor 없이 page > 1을 요청하면 앞 페이지 분량을 건너뛰며 처음부터 훑습니다.
+    filters에 query 표현식이 있으면 스냅샷 전체에 표현식을 적용하고 page 번호로 나눠 돌려줍니다.
+    """
+    from youtube_data_api import YouTubeDataApiError
+    from youtube_channel_store import iter_snapshot_videos, has_more_videos
+
+    page_size = int(filters.get('pageSize') or ANALYZE_PAGE_SIZE)
+
+    query = None
+    if filters.get('query'):
+        from youtube_query import compile_filters, QueryError
+        try:
+            query = compile_filters(filters)
+        except QueryError as e:
+            yield {"type": "error", "error": f"Invalid query: {e}"}
+            return
+        # 표현식 결과는 page 번호로 나누므로 cursor는 쓰지 않음
+        cursor = None
+
+    if cursor:
+        # 이전 호출이 멈춘 위치에서 이어서 처리 (채널 ID 검색 생략)
+        try:
+            channel_id, last_video_id, skip = decode_cursor(cursor, filters)
+        except ValueError as e:
+            yield {"type": "error", "error": str(e)}
+            return
+        from_cache = False
+    else:
+        if not extract_channel_info(url):
+            yield {"type": "error", "error": "Invalid channel URL"}
+            return
 
-    # 제목과 설명을 합쳐서 검사
-    text = (title + " " + description).lower()
+        with span('channel_resolution'):
+            channel_id, from_cache = resolve_channel_id(url)
+        if not channel_id:
+            yield {"type": "error", "error": "채널을 찾을 수 없습니다."}
+            return
+        last_video_id = None
+        skip = max(0, page - 1) * page_size
 
-    # 키워드 매칭 점수 계산
-    score = 0
-    for keyword in travel_keywords:
-        if keyword.lower() in text:
-            score += 1
+    # 키 풀을 쓰는 클라이언트: 도중에 키가 바닥나면 같은 페이지부터 다음 키로 이어서 조회
+    client = get_data_client()
+    store = get_channel_store()
 
-    # 2개 이상의 키워드가 매칭되면 여행 영상으로 판단
-    return score >= 2
+    logger.debug(f"Channel {channel_id}, page_size={page_size}, filters: {filters}")
 
-def check_subtitle_availability(video_id):
-    """비디오에 자막이 있는지 확인"""
     try:
-        # YouTubeTranscriptApi를 직접 사용해서 자막 가져오기 시도
-        transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=['ko', 'en', 'auto'])
-        return len(transcript) > 0
-    except Exception as e:
+        snapshot, new_count, found = _fill_snapshot(client, store, channel_id)
+    except YouTubeDataApiError as e:
+        if not from_cache or e.status != 404:
+            raise
+        found = False
+
+    if from_cache and not found:
+        # 캐시된 채널 ID로 채널 조회가 실패하면 캐시를 무효화하고 한 번만 다시 검색
+        # (영상이 없을 뿐인 채널은 업로드 재생목록이 있으므로 다시 검색하지 않음)
+        logger.info(f"Cached channel ID {channel_id} failed, resolving again")
+        with span('channel_resolution'):
+            channel_id, _ = resolve_channel_id(url, refresh=True)
+        if not channel_id:
+            yield {"type": "error", "error": "채널을 찾을 수 없습니다."}
+            return
+        snapshot, new_count, _ = _fill_snapshot(client, store, channel_id)
+
+    if query is not None:
+        yield from _iter_query_records(client, store, snapshot, new_count, query, filters, page)
+        return
+
+    start_index = 0
+    if last_video_id:
+        positions = {video["video_id"]: index for index, video in enumerate(snapshot["videos"])}
+        if last_video_id not in positions:
+            yield {"type": "error", "error": "Cursor has expired, please start over"}
+            return
+        start_index = positions[last_video_id] + 1
+
+    pipeline = build_filter_pipeline(filters)
+    total_videos = 0
+    scanned = 0
+    next_cursor = None
+    last_context = None
+    source = iter_snapshot_videos(client, store, snapshot, start_index)
+    while True:
+        batch = list(islice(source, FILTER_BATCH_SIZE))
+        if not batch:
+            break
+        scanned += len(batch)
+
+        # 이번 묶음에서 돌려줄 영상 선택 (표시용 자막 확인이 남아 있으면 선택이 끝난 뒤 함께 시작)
+        selected = []
+        survivors = pipeline.run({"index": index, "video": video} for index, video in batch)
+        try:
+            for context in survivors:
+                if skip:
+                    skip -= 1
+                    continue
+                last_context = context
+                if pipeline.lazy_stages:
+                    selected.append(context)
+                else:
+                    yield {"type": "video", "video": format_channel_video(context)}
+                total_videos += 1
+                if total_videos >= page_size:
+                    break
+        finally:
+            survivors.close()
+
+        # 표시용 자막 확인은 영상마다 끝나는 대로 한 줄씩 내보냄 (묶음 전체를 기다리지 않음)
+        annotated = pipeline.annotate(selected)
         try:
-            # 언어를 지정하지 않고 다시 시도
-            transcript = YouTubeTranscriptApi.get_transcript(video_id)
-            return len(transcript) > 0
-        except Exception as e2:
-            # 자막이 없거나 에러가 발생하면 False 반환
-            print(f"DEBUG: Subtitle check failed for {video_id}: {e2}", file=sys.stderr)
-            return False
-
-def analyze_youtube_url(url, page=1, filters=None):
-    """YouTube URL 분석 (페이지네이션 및 필터링 지원)"""
+            for context in annotated:
+                yield {"type": "video", "video": format_channel_video(context)}
+        finally:
+            annotated.close()
+
+        if total_videos >= page_size:
+            # 마지막으로 내보낸 영상 위치 기록
+            if has_more_videos(snapshot, last_context["index"]):
+                next_cursor = encode_cursor(channel_id, last_context["video"]["video_id"], filters)
+            break
+        if scanned >= MAX_SOURCE_VIDEOS_PER_CALL:
+            # 조건에 맞는 영상이 드문 경우 무한히 훑지 않도록 여기서 끊고 이어서 처리
+            # 앞 페이지를 건너뛰던 중이면 남은 skip 수도 cursor에 담아 다음 호출이 이어서 건너뜀
+            index, video = batch[-1]
+            if has_more_videos(snapshot, index):
+                next_cursor = encode_cursor(channel_id, video["video_id"], filters, skip)
+            break
+
+    filter_stats = pipeline.stats()
+    record_filter_spans(filter_stats)
+    logger.debug(f"Scanned {scanned} videos, {total_videos} passed filters, stages: {filter_stats}")
+
+    yield {
+        "type": "summary",
+        "total_videos": total_videos,
+        "scanned_videos": scanned,
+        "new_videos": new_count,
+        "next_cursor": next_cursor,
+        "filter_stats": filter_stats,
+        "filters_applied": {
+            "travel_only": filters.get('travelOnly', False),
+            "subtitle_only": filters.get('subtitleOnly', False),
+            "long_video_only": filters.get('longVideoOnly', False)
+        }
+    }
+
+def iter_channel_records(url, page=1, filters=None, cursor=None):
+    """채널 분석 결과를 레코드 단위로 생성 (NDJSON 스트리밍용)
+
+    필터를 통과한 영상마다 {"type": "video", "video": {...}}를 바로 내보내고,
+    마지막에 {"type": "summary", ..., "next_cursor": ...} 또는 {"type": "error", "error": ...}를
+    내보냅니다. next_cursor를 다음 호출에 넘기면 멈춘 위치부터 이어서 처리합니다.
+    """
     if filters is None:
         filters = {}
 
     try:
-        if is_channel_url(url):
-            # 채널 URL 처리
-            channel_info = extract_channel_info(url)
-            if not channel_info:
-                return {"error": "Invalid channel URL"}
-
-            api_key = get_current_api_key()
-            if api_key:
-                collector = YouTubeCollector(api_key)
-
-                # 채널 ID 검색
-                search_results = collector._search_by_keyword(channel_info)
-                if search_results:
-                    channel_id = search_results[0]["channel_id"]
-
-                    # 모든 영상 가져오기 (최대 1000개)
-                    max_videos_to_fetch = 1000  # YouTube API 제한을 고려하여 최대 1000개
-                    videos = collector.get_channel_videos(channel_id, max_results=max_videos_to_fetch)
-
-                    # 필터링 및 변환
-                    video_list = []
-                    travel_filter = filters.get('travelOnly', False)
-                    subtitle_filter = filters.get('subtitleOnly', False)
-                    long_video_filter = filters.get('longVideoOnly', False)
-
-                    print(f"DEBUG: Fetched {len(videos)} videos, applying filters: travel={travel_filter}, subtitle={subtitle_filter}, long={long_video_filter}", file=sys.stderr)
-                    print(f"DEBUG: Filters object: {filters}", file=sys.stderr)
-
-                    for video in videos:
-                        duration_sec = video.get("duration", 0)
-                        title = video.get("title", "")
-
-                        print(f"DEBUG: Processing '{title[:30]}...' - Duration: {duration_sec}s", file=sys.stderr)
-
-                        # 긴 영상 필터링 (2분/120초 이상) - 우선 적용
-                        if long_video_filter and duration_sec < 120:
-                            print(f"DEBUG: FILTERED OUT - Duration {duration_sec}s < 120s", file=sys.stderr)
-                            continue
-
-                        description = video.get("description", "")
-
-                        # 여행 영상 필터링
-                        if travel_filter and not is_travel_video(title, description):
-                            continue
-
-                        # 자막 필터링 (한 번만 체크)
-                        has_subtitle = False
-                        if subtitle_filter:
-                            has_subtitle = check_subtitle_availability(video["video_id"])
-                            if not has_subtitle:
-                                print(f"DEBUG: FILTERED OUT - No subtitles for '{title[:30]}...'", file=sys.stderr)
-                                continue
-                        else:
-                            # subtitle_filter가 false인 경우에만 실제 체크 (UI 표시용)
-                            has_subtitle = check_subtitle_availability(video["video_id"])
-
-                        duration_str = f"{duration_sec//60}:{duration_sec%60:02d}"
-
-                        video_data = {
-                            "id": video["video_id"],
-                            "title": title,
-                            "duration": duration_str,
-                            "views": f"{video.get('view_count', 0):,}",
-                            "hasSubtitle": has_subtitle,
-                            "isTravelVideo": is_travel_video(title, description)
-                        }
-
-                        print(f"DEBUG: PASSED - '{title[:30]}...' - Duration: {duration_sec}s, HasSubtitle: {has_subtitle}", file=sys.stderr)
-
-                        video_list.append(video_data)
-
-                    print(f"DEBUG: After filtering: {len(video_list)} videos remain", file=sys.stderr)
-
-                    return {
-                        "type": "channel",
-                        "videos": video_list,  # 모든 필터링된 영상 반환
-                        "total_videos": len(video_list),
-                        "filters_applied": {
-                            "travel_only": travel_filter,
-                            "subtitle_only": subtitle_filter,
-                            "long_video_only": long_video_filter
-                        }
-                    }
-
-            # API 키가 없는 경우 오류 반환
-            return {"error": "YouTube API 키가 필요합니다. 설정을 확인해주세요."}
+        yield from _iter_channel_records(url, filters, page, cursor)
+    except QuotaExhaustedError:
+        # 키 전환은 요청 단위로 이미 처리됨 - 여기까지 오면 모든 키가 소진된 상태
+        yield {"type": "error", "error": QUOTA_EXHAUSTED_MESSAGE}
+    except Exception as e:
+        yield {"type": "error", "error": str(e)}
+
+def iter_analyze_records(url, page=1, filters=None, cursor=None, **trace_fields):
+    """analyze 결과를 NDJSON 레코드 단위로 생성 (단일 영상은 video + summary 두 레코드)"""
+    with request_trace('analyze-stream', **trace_fields) as trace:
+        if is_channel_url(url) or cursor:
+            records = iter_channel_records(url, page, filters, cursor)
         else:
-            # 단일 비디오 URL 처리
-            video_id = extract_video_id(url)
-            if not video_id:
-                return {"error": "Invalid video URL"}
+            result = analyze_youtube_url(url, page, filters)
+            if "error" in result:
+                records = [{"type": "error", "error": result["error"]}]
+            else:
+                records = [{"type": "video", "video": result["video"]}, {"type": "summary", "total_videos": 1}]
+
+        for record in records:
+            if record["type"] == "error":
+                trace.fields["status"] = "error"
+            elif record["type"] == "summary":
+                # 이번 요청이 쓴 Data API 할당량
+                record["quota"] = trace.quota_summary()
+            yield record
+
+def analyze_youtube_url(url, page=1, filters=None, cursor=None):
+    """YouTube URL 분석 (cursor 기반 페이지네이션 및 필터링 지원)"""
+    if filters is None:
+        filters = {}
+
+    if is_channel_url(url) or cursor:
+        # 채널 URL 처리 - 스트리밍 레코드를 모아서 한 번에 반환
+        video_list = []
+        summary = {}
+        for record in iter_channel_records(url, page, filters, cursor):
+            if record["type"] == "video":
+                video_list.append(record["video"])
+            elif record["type"] == "error":
+                return {"error": record["error"]}
+            else:
+                summary = record
+
+        result = {
+            "type": "channel",
+            "videos": video_list,  # 요청한 페이지의 필터링된 영상
+            "total_videos": len(video_list),
+            "new_videos": summary.get("new_videos", 0),  # 지난 동기화 이후 새로 올라온 영상 수
+            "next_cursor": summary.get("next_cursor"),  # 다음 페이지 요청 시 전달 (없으면 마지막 페이지)
+            "filter_stats": summary.get("filter_stats", []),  # 필터 단계별 확인/제외 영상 수와 걸린 시간
+            "filters_applied": summary.get("filters_applied", {})
+        }
+        if "matched_videos" in summary:
+            # query 표현식: 조건에 맞는 전체 영상 수와 다음 page 존재 여부
+            result["matched_videos"] = summary["matched_videos"]
+            result["has_more"] = summary["has_more"]
+        return result
+
+    try:
+        # 단일 비디오 URL 처리
+        video_id = extract_video_id(url)
+        if not video_id:
+            return {"error": "Invalid video URL"}
 
-            api_key = get_current_api_key()
-            if api_key:
-                collector = YouTubeCollector(api_key)
-                video_details = collector.get_video_details(video_id)
+        with span('details'):
+            video_details = call_collector(
+                'videos.list', lambda collector: collector.get_video_details(video_id)
+            )
+        if not video_details:
+            return {"error": "영상을 찾을 수 없습니다."}
 
-                if video_details:
-                    duration_sec = video_details.get("duration", 0)
+        # 참고: 단일 비디오의 경우 Shorts 영상도 허용 (사용자가 직접 선택한 경우)
+        # 필터링은 채널 영상 목록에서만 적용
 
-                    # 참고: 단일 비디오의 경우 Shorts 영상도 허용 (사용자가 직접 선택한 경우)
-                    # 필터링은 채널 영상 목록에서만 적용
+        # 자막 여부 체크 (임시로 비활성화 - 실제 추출 시 체크)
+        # if not check_subtitle_availability(video_details["video_id"]):
+        #     return {"error": "이 영상에는 자막이 없습니다."}
 
-                    # 자막 여부 체크 (임시로 비활성화 - 실제 추출 시 체크)
-                    # if not check_subtitle_availability(video_details["video_id"]):
-                    #     return {"error": "이 영상에는 자막이 없습니다."}
+        return {
+            "type": "video",
+            "video": format_video_summary(video_details)
+        }
 
-                    duration_str = f"{duration_sec//60}:{duration_sec%60:02d}"
+    except QuotaExhaustedError:
+        return {"error": QUOTA_EXHAUSTED_MESSAGE}
+    except Exception as e:
+        return {"error": str(e)}
 
-                    return {
-                        "type": "video",
-                        "video": {
-                            "id": video_details["video_id"],
-                            "title": video_details["title"],
-                            "duration": duration_str,
-                            "views": f"{video_details.get('view_count', 0):,}"
-                        }
-                    }
+# analyze 결과 캐시: 이 시간(초) 안의 결과는 그대로, 그 뒤 STALE_TTL까지는 바로 돌려주면서 백그라운드 갱신
+ANALYZE_CACHE_FRESH_TTL = float(os.getenv('ANALYZE_CACHE_FRESH_TTL', '300'))
+ANALYZE_CACHE_STALE_TTL = float(os.getenv('ANALYZE_CACHE_STALE_TTL', '3600'))
+
+# 프로세스 사이의 계산 lease 유지 시간(초) - 계산하던 프로세스가 죽어도 이 시간이 지나면 다시 계산
+ANALYZE_LEASE_TTL = float(os.getenv('ANALYZE_LEASE_TTL', '120'))
+# 다른 프로세스의 계산을 기다릴 때 lease를 다시 확인하는 간격(초)
+ANALYZE_LEASE_POLL = 0.25
+
+# 같은 analyze 요청을 동시에 계산하지 않도록 진행 중인 계산을 공유 (cache key → Future)
+_inflight = {}
+_inflight_lock = threading.Lock()
+# 단발성 CLI는 갱신을 분리된 자식 프로세스에 넘기고 바로 종료 (main()에서 켬)
+_detach_refreshes = False
+
+def analyze_cache_key(url, page=1, filters=None, cursor=None):
+    """정규화한 채널 ID(또는 영상 ID)와 필터 조합으로 캐시 키 생성 (알 수 없는 URL이면 None)"""
+    if cursor:
+        target = f"cursor:{cursor}"
+    elif is_channel_url(url):
+        channel_id, _ = resolve_channel_id(url)
+        if not channel_id:
+            return None
+        target = f"channel:{channel_id}"
+    else:
+        video_id = extract_video_id(url)
+        if not video_id:
+            return None
+        target = f"video:{video_id}"
+    return json.dumps([target, page, filters or {}], sort_keys=True, ensure_ascii=False)
+
+def _single_flight(key, func):
+    """key가 같은 계산이 진행 중이면 그 결과를 기다려 공유하고, 아니면 직접 계산
+
+    Returns:
+        tuple: (결과, 다른 요청의 계산 결과를 공유했는지 여부)
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    if not owner:
+        return future.result(), True
 
-            # API 키가 없는 경우 오류 반환
-            return {"error": "YouTube API 키가 필요합니다. 설정을 확인해주세요."}
+    try:
+        result = func()
+        future.set_result(result)
+        return result, False
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+def _acquire_lease(key):
+    """key의 계산 lease를 잡음 (다른 프로세스가 잡고 있으면 False)"""
+    return get_default_cache().add('analyze_lease', key, {"pid": os.getpid()}, ttl=ANALYZE_LEASE_TTL)
+
+def _release_lease(key):
+    get_default_cache().delete('analyze_lease', key)
+
+def _compute_with_lease(key, url, page, filters, cursor):
+    """lease를 잡고 analyze를 계산 (다른 프로세스가 계산 중이면 끝날 때까지 기다렸다가 그 결과를 공유)
+
+    Returns:
+        tuple: (결과, 다른 프로세스의 계산 결과를 공유했는지 여부)
+    """
+    waited = False
+    while not _acquire_lease(key):
+        waited = True
+        time.sleep(ANALYZE_LEASE_POLL)
+    try:
+        if waited:
+            entry = get_default_cache().get('analyze', key)
+            if entry is not None:
+                return entry["result"], True
+        return _compute_analyze(key, url, page, filters, cursor), False
+    finally:
+        _release_lease(key)
+
+def _compute_analyze(key, url, page, filters, cursor):
+    """analyze를 실제로 계산하고 성공한 결과만 캐시에 저장"""
+    result = analyze_youtube_url(url, page, filters, cursor)
+    if "error" not in result:
+        get_default_cache().set(
+            'analyze', key, {"stored_at": time.time(), "result": result}, ttl=ANALYZE_CACHE_STALE_TTL
+        )
+    return result
+
+def _spawn_detached_refresh(url, page, filters, cursor):
+    """analyze-refresh 액션을 부모와 분리된 프로세스로 실행 (표준 입출력을 물려주지 않음)
+
+    응답을 출력한 CLI 프로세스가 갱신을 기다리지 않고 바로 종료하므로, 프로세스 종료를
+    기다리는 호출자(Node spawn의 'close' 등)도 오래된 캐시 응답을 바로 받습니다.
+    """
+    import subprocess
+
+    args = [sys.executable, os.path.abspath(__file__), "analyze-refresh", url, str(page),
+            json.dumps(filters or {}, ensure_ascii=False)]
+    if cursor:
+        args.append(cursor)
+    if os.name == 'nt':
+        options = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        options = {"start_new_session": True}
+    subprocess.Popen(
+        args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        close_fds=True, **options
+    )
+
+def _refresh_in_background(key, url, page, filters, cursor):
+    """오래된 캐시 항목을 백그라운드에서 다시 계산 (이 프로세스나 다른 프로세스가 이미 계산 중이면 생략)
+
+    serve 모드 등 상주 프로세스는 스레드에서, 단발성 CLI는 분리된 자식 프로세스에서 계산합니다.
+    lease는 여기서 잡고, 계산을 마친 스레드/자식 프로세스가 놓습니다.
+    """
+    with _inflight_lock:
+        if key in _inflight:
+            return
+    if not _acquire_lease(key):
+        return
 
+    if _detach_refreshes:
+        try:
+            _spawn_detached_refresh(url, page, filters, cursor)
+        except OSError as e:
+            logger.warning(f"Could not start analyze refresh process: {e}")
+            _release_lease(key)
+        return
+
+    def refresh():
+        with request_trace('analyze-refresh'):
+            try:
+                _single_flight(key, lambda: _compute_analyze(key, url, page, filters, cursor))
+            except Exception as e:
+                logger.warning(f"Background analyze refresh failed: {e}")
+            finally:
+                _release_lease(key)
+
+    threading.Thread(target=refresh, name='analyze-refresh', daemon=True).start()
+
+def analyze_with_cache(url, page=1, filters=None, cursor=None):
+    """결과 캐시를 거치는 analyze (stale-while-revalidate + 동일 요청 single-flight)
+
+    응답에는 {"cache": {"status": "fresh"|"stale"|"miss"|"shared", "age": 초}}가 붙습니다.
+    filters의 noCache가 참이면 캐시를 거치지 않습니다.
+    """
+    if filters is None:
+        filters = {}
+    if filters.get('noCache'):
+        return analyze_youtube_url(url, page, filters, cursor)
+
+    try:
+        key = analyze_cache_key(url, page, filters, cursor)
+    except QuotaExhaustedError:
+        return {"error": QUOTA_EXHAUSTED_MESSAGE}
+    except Exception as e:
+        return {"error": str(e)}
+    if key is None:
+        return analyze_youtube_url(url, page, filters, cursor)
+
+    entry = get_default_cache().get('analyze', key)
+    if entry is not None:
+        age = time.time() - entry["stored_at"]
+        if age < ANALYZE_CACHE_FRESH_TTL:
+            status = "fresh"
+        else:
+            status = "stale"
+            _refresh_in_background(key, url, page, filters, cursor)
+        return dict(entry["result"], cache={"status": status, "age": round(age, 1)})
+
+    (result, waited), shared = _single_flight(key, lambda: _compute_with_lease(key, url, page, filters, cursor))
+    return dict(result, cache={"status": "shared" if shared or waited else "miss", "age": 0})
+
+def format_video_summary(video_details):
+    """단일 영상 분석 결과 형식 {id, title, duration, views}"""
+    duration_sec = video_details.get("duration", 0)
+    return {
+        "id": video_details["video_id"],
+        "title": video_details["title"],
+        "duration": f"{duration_sec//60}:{duration_sec%60:02d}",
+        "views": f"{video_details.get('view_count', 0):,}"
+    }
+
+def read_batch_input(source):
+    """파일('-'이면 stdin)에서 영상 URL/ID 목록 읽기 (한 줄에 하나, 빈 줄과 # 주석 무시)"""
+    if source == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
+
+def analyze_video_batch(items):
+    """여러 영상 URL/ID를 한 번에 분석 (videos.list 한 번에 최대 50개씩 조회)
+
+    Returns:
+        dict: {"type": "batch", "results": [...], "total", "succeeded", "failed"}
+              results는 입력 순서를 그대로 따르며 항목마다 {"input", "video"} 또는 {"input", "error"}
+    """
+    video_ids = [extract_video_id(item) for item in items]
+
+    # 중복 ID는 한 번만 조회
+    unique_ids = list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+    try:
+        details = {video["video_id"]: video for video in get_data_client().get_videos(unique_ids)}
+    except QuotaExhaustedError:
+        return {"error": QUOTA_EXHAUSTED_MESSAGE}
     except Exception as e:
-        error_msg = str(e)
-        # 할당량 초과 에러 체크
-        if "quota" in error_msg.lower() or "exceeded" in error_msg.lower() or "403" in error_msg:
-            if switch_to_next_key():
-                # 다음 키로 재시도
-                print(f"DEBUG: Quota exceeded, retrying with next API key", file=sys.stderr)
-                return analyze_youtube_url(url, page, filters)
-            else:
-                return {"error": "모든 API 키의 할당량이 초과되었습니다. 나중에 다시 시도해주세요."}
         return {"error": str(e)}
 
+    logger.debug(f"Batch of {len(items)} inputs, {len(unique_ids)} unique IDs, {len(details)} found")
+
+    results = []
+    for item, video_id in zip(items, video_ids):
+        if not video_id:
+            results.append({"input": item, "error": "Invalid video URL"})
+        elif video_id not in details:
+            results.append({"input": item, "error": "영상을 찾을 수 없습니다."})
+        else:
+            results.append({"input": item, "video": format_video_summary(details[video_id])})
+
+    failed = sum(1 for result in results if "error" in result)
+    return {
+        "type": "batch",
+        "results": results,
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed
+    }
+
 def extract_subtitle(video_id):
     """비디오에서 자막 추출"""
     try:
@@ -334,8 +1078,15 @@ def extract_subtitle(video_id):
         if not video_id:
             return {"error": "Invalid video ID"}
 
-        extractor = SubtitleExtractor()
-        result = extractor.get_video_subtitles(video_id, preferred_languages=['ko', 'en'])
+        # 같은 영상의 자막은 로컬 캐시에서 재사용
+        cache = get_default_cache()
+        result = cache.get('transcript', video_id)
+        if result is None:
+            extractor = get_subtitle_extractor()
+            with span('subtitle_fetch'):
+                result = extractor.get_video_subtitles(video_id, preferred_languages=['ko', 'en'])
+            result = {"has_subtitles": bool(result["has_subtitles"]), "text": result.get("text", "")}
+            cache.set('transcript', video_id, result, positive=result["has_subtitles"])
 
         if result["has_subtitles"]:
             return {"subtitle": result["text"]}
@@ -345,9 +1096,180 @@ def extract_subtitle(video_id):
     except Exception as e:
         return {"error": str(e)}
 
+_upload_watcher = None
+_upload_watcher_lock = threading.Lock()
+
+def get_upload_watcher():
+    """프로세스 공용 RSS 새 업로드 감지기"""
+    global _upload_watcher
+    with _upload_watcher_lock:
+        if _upload_watcher is None:
+            from youtube_rss import UploadWatcher
+            _upload_watcher = UploadWatcher()
+        return _upload_watcher
+
+def watch_channels(items):
+    """채널 RSS 피드로 새 업로드 확인 (Data API 할당량을 쓰지 않음)
+
+    UC로 시작하는 채널 ID와 /channel/ URL은 바로 사용하고, 핸들/커스텀 URL은 캐시된 채널 ID를
+    사용합니다 (처음 한 번만 search.list).
+
+    Returns:
+        dict: {"type": "watch", "channels": [...], "new_videos": 새 영상 수 합계}
+              channels는 입력 순서대로 {"channel_id", "new_videos", ...} 또는 {"input", "error"}
+    """
+    channel_ids = []
+    results = []
+    for item in items:
+        try:
+            channel_id = item if CHANNEL_ID_PATTERN.match(item) else resolve_channel_id(item)[0]
+        except QuotaExhaustedError:
+            channel_id, error = None, QUOTA_EXHAUSTED_MESSAGE
+        except Exception as e:
+            channel_id, error = None, str(e)
+        else:
+            error = None if channel_id else "채널을 찾을 수 없습니다."
+        results.append({"input": item, "error": error} if error else None)
+        channel_ids.append(channel_id)
+
+    with span('feeds'):
+        checked = iter(get_upload_watcher().check_many([channel_id for channel_id in channel_ids if channel_id]))
+    results = [result if result is not None else next(checked) for result in results]
+    return {
+        "type": "watch",
+        "channels": results,
+        "new_videos": sum(len(result.get("new_videos", [])) for result in results)
+    }
+
+def run_action(action, url_or_id, page=1, filters=None, cursor=None, **trace_fields):
+    """액션 실행 후 구간별 시간 요약을 요청당 한 줄씩 로그로 남김 (trace_fields는 요약에 함께 기록)
+
+    analyze/analyze-batch/subtitle/watch 응답에는 이번 요청이 쓴 Data API 할당량을 "quota"로 붙입니다.
+    """
+    with request_trace(action, **trace_fields) as trace:
+        result = _run_action(action, url_or_id, page, filters, cursor)
+        trace.fields["status"] = "error" if isinstance(result, dict) and "error" in result else "ok"
+        if action in ("analyze", "analyze-batch", "subtitle", "watch") and isinstance(result, dict):
+            result["quota"] = trace.quota_summary()
+        return result
+
+def _run_action(action, url_or_id, page=1, filters=None, cursor=None):
+    """액션 이름에 맞는 처리 함수 실행 (analyze-batch는 url_or_id가 목록 파일 경로 또는 URL 리스트)"""
+    if action == "analyze":
+        return analyze_with_cache(url_or_id, page, filters, cursor)
+    elif action == "analyze-batch":
+        items = url_or_id if isinstance(url_or_id, list) else read_batch_input(url_or_id)
+        return analyze_video_batch(items)
+    elif action == "subtitle":
+        return extract_subtitle(url_or_id)
+    elif action == "watch":
+        items = url_or_id if isinstance(url_or_id, list) else read_batch_input(url_or_id)
+        return watch_channels(items)
+    elif action == "new-uploads":
+        # watch가 감지해서 쌓아 둔 새 업로드를 꺼냄 (filters의 limit개까지)
+        limit = int((filters or {}).get('limit', 100))
+        return {"type": "new-uploads", "videos": get_upload_watcher().pop_new_uploads(limit)}
+    elif action == "cache-stats":
+        return get_default_cache().stats()
+    elif action == "quota":
+        # 키별 오늘 사용량 + 최근 7일 키/메서드별 장부
+        try:
+            key_pool = get_key_pool()
+        except RuntimeError:
+            return {"error": NO_API_KEYS_MESSAGE}
+        return dict(key_pool.usage(), ledger=key_pool.ledger())
+    return {"error": "Invalid action. Use 'analyze', 'analyze-batch', 'subtitle', 'watch', 'new-uploads', 'cache-stats' or 'quota'"}
+
+def serve(max_workers=None):
+    """상주 워커 모드: stdin의 JSON 요청을 한 줄씩 읽어 응답을 한 줄씩 출력"""
+    if max_workers is None:
+        max_workers = int(os.getenv('YOUTUBE_API_WORKERS', '4'))
+
+    write_lock = threading.Lock()
+
+    def write_line(payload):
+        line = json.dumps(payload, ensure_ascii=False)
+        with write_lock:
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+
+    def handle(request):
+        request_id = request.get("id")
+        if request.get("action") == "analyze-stream":
+            try:
+                for record in iter_analyze_records(
+                    request.get("url", ""),
+                    int(request.get("page", 1)),
+                    request.get("filters") or {},
+                    request.get("cursor"),
+                    id=request_id
+                ):
+                    write_line({"id": request_id, "record": record})
+            except Exception as e:
+                write_line({"id": request_id, "record": {"type": "error", "error": str(e)}})
+            return
+
+        try:
+            result = run_action(
+                request.get("action"),
+                request.get("urls") or request.get("url", ""),
+                int(request.get("page", 1)),
+                request.get("filters") or {},
+                request.get("cursor"),
+                id=request_id
+            )
+        except Exception as e:
+            result = {"error": str(e)}
+        write_line({"id": request_id, "result": result})
+
+    logger.info(f"serve mode started with {max_workers} workers")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 한 줄씩 즉시 처리 (파이프 입력에서 read-ahead 버퍼링 방지)
+        for line in iter(sys.stdin.readline, ''):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                write_line({"id": None, "result": {"error": f"Invalid JSON request: {e}"}})
+                continue
+            if not isinstance(request, dict):
+                write_line({"id": None, "result": {"error": "Request must be a JSON object"}})
+                continue
+            executor.submit(handle, request)
+
 def main():
+    configure_stdio()
+
+    # 로그 레벨 옵션 (--log-level=debug), 없으면 YOUTUBE_API_LOG_LEVEL 환경변수 (기본 WARNING)
+    log_level = None
+    for arg in sys.argv[1:]:
+        if arg.startswith('--log-level='):
+            log_level = arg.split('=', 1)[1]
+            sys.argv.remove(arg)
+            break
+    configure_logging(log_level)
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "serve":
+        serve(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+        return
+
+    # 오래된 캐시로 응답하면 갱신은 분리된 프로세스에 맡기고 이 프로세스는 바로 종료
+    global _detach_refreshes
+    _detach_refreshes = True
+
+    if len(sys.argv) == 2 and sys.argv[1] in ("cache-stats", "quota", "new-uploads"):
+        print(json.dumps(run_action(sys.argv[1], ""), ensure_ascii=False, indent=2))
+        return
+
+    if len(sys.argv) == 2 and sys.argv[1] in ("analyze-batch", "watch"):
+        # 목록 파일을 주지 않으면 stdin에서 읽음
+        sys.argv.append('-')
+
     if len(sys.argv) < 3:
-        print(json.dumps({"error": "Usage: python youtube_api.py <action> <url_or_video_id> [page] [filters]"}))
+        print(json.dumps({"error": "Usage: python youtube_api.py <action> <url_or_video_id> [page] [filters] [cursor]"}))
         return
 
     action = sys.argv[1]
@@ -359,14 +1281,30 @@ def main():
     # 필터 정보 (옵션, JSON 형태)
     filters = json.loads(sys.argv[4]) if len(sys.argv) > 4 else {}
 
-    if action == "analyze":
-        result = analyze_youtube_url(url_or_id, page, filters)
-    elif action == "subtitle":
-        result = extract_subtitle(url_or_id)
-    else:
-        result = {"error": "Invalid action. Use 'analyze' or 'subtitle'"}
+    # 이전 응답의 next_cursor (옵션)
+    cursor = sys.argv[5] if len(sys.argv) > 5 else None
+
+    if action == "analyze-refresh":
+        # 오래된 캐시 응답 뒤에 분리된 프로세스로 실행되는 갱신 (출력 없음)
+        # lease는 이 프로세스를 띄운 요청이 잡아 두었으므로 계산이 끝나면 놓기만 함
+        key = analyze_cache_key(url_or_id, page, filters, cursor)
+        if key is not None:
+            try:
+                with request_trace('analyze-refresh'):
+                    _compute_analyze(key, url_or_id, page, filters, cursor)
+            finally:
+                _release_lease(key)
+        return
+
+    if action == "analyze-stream":
+        # 레코드가 만들어지는 즉시 한 줄씩 출력
+        for record in iter_analyze_records(url_or_id, page, filters, cursor):
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+        return
+
+    result = run_action(action, url_or_id, page, filters, cursor)
 
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    print(json.dumps(result, ensure_ascii=False, indent=2), flush=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite 기반 TTL 캐시
+video ID 등으로 조회하는 결과(자막 목록, 자막 본문 등)를 로컬 디스크에 보관합니다.
+- 성공(positive)/실패(negative) 결과에 서로 다른 TTL 적용
+- 최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 네임스페이스별 hit/miss 카운터 (여러 프로세스가 같은 파일을 공유해도 누적됨)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+DEFAULT_CACHE_PATH = os.getenv(
+    'YOUTUBE_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'youtube_cache.sqlite3')
+)
+
+# set()에서 ttl을 생략했을 때 positive 여부에 따른 기본 TTL을 쓰도록 구분하는 값
+_DEFAULT_TTL = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    positive INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries (accessed_at);
+CREATE TABLE IF NOT EXISTS cache_stats (
+    namespace TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    evictions INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+class TTLCache:
+    """SQLite 파일 하나를 사용하는 TTL + LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, path=None, positive_ttl=86400, negative_ttl=3600, max_entries=10000):
+        """
+        Args:
+            path (str): SQLite 파일 경로 (없으면 DEFAULT_CACHE_PATH)
+            positive_ttl (float): 성공 결과 보관 시간(초), None이면 만료 없음
+            negative_ttl (float): 실패 결과 보관 시간(초), None이면 만료 없음
+            max_entries (int): 최대 항목 수 (초과 시 LRU 삭제)
+        """
+        self.path = path or DEFAULT_CACHE_PATH
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        # 여러 프로세스(serve 워커, 단발성 CLI)가 동시에 읽고 쓸 수 있도록 WAL 사용
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _count(self, namespace, column, amount=1):
+        self._conn.execute(
+            f"INSERT INTO cache_stats (namespace, {column}) VALUES (?, ?) "
+            f"ON CONFLICT(namespace) DO UPDATE SET {column} = {column} + excluded.{column}",
+            (namespace, amount)
+        )
+
+    def get(self, namespace, key, default=None):
+        """캐시 조회 (만료되었거나 없으면 default 반환)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    self._conn.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+                    )
+                self._count(namespace, 'misses')
+                return default
+
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key)
+            )
+            self._count(namespace, 'hits')
+            return json.loads(row[0])
+
+    def set(self, namespace, key, value, positive=True, ttl=_DEFAULT_TTL):
+        """캐시 저장 (ttl을 주지 않으면 positive 여부에 따라 기본 TTL 적용, None이면 만료 없음)"""
+        now = time.time()
+        if ttl is _DEFAULT_TTL:
+            ttl = self.positive_ttl if positive else self.negative_ttl
+        expires_at = None if ttl is None else now + ttl
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, positive, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False), int(bool(positive)), expires_at, now)
+            )
+            self._evict()
+
+    def add(self, namespace, key, value, positive=True, ttl=_DEFAULT_TTL):
+        """항목이 없거나 만료됐을 때만 저장하고 저장했는지 반환 (여러 프로세스 사이의 lease 등)
+
+        확인과 저장이 한 문장이므로 같은 파일을 쓰는 프로세스 중 하나만 True를 받습니다.
+        """
+        now = time.time()
+        if ttl is _DEFAULT_TTL:
+            ttl = self.positive_ttl if positive else self.negative_ttl
+        expires_at = None if ttl is None else now + ttl
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO cache_entries (namespace, key, value, positive, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value, positive = excluded.positive, "
+                "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at "
+                "WHERE cache_entries.expires_at IS NOT NULL AND cache_entries.expires_at <= ?",
+                (namespace, key, json.dumps(value, ensure_ascii=False), int(bool(positive)), expires_at, now, now)
+            )
+            added = cursor.rowcount == 1
+            if added:
+                self._evict()
+            return added
+
+    def delete(self, namespace, key):
+        """캐시 항목 삭제"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+
+    def _evict(self):
+        """최대 항목 수를 넘으면 만료된 항목, 그다음 가장 오래 사용하지 않은 항목 순으로 삭제"""
+        if not self.max_entries:
+            return
+        count = self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        if count <= self.max_entries:
+            return
+
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+        )
+        count = self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+
+        evicted = self._conn.execute(
+            "SELECT namespace, COUNT(*) FROM ("
+            "  SELECT namespace FROM cache_entries ORDER BY accessed_at LIMIT ?"
+            ") GROUP BY namespace",
+            (excess,)
+        ).fetchall()
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE rowid IN ("
+            "  SELECT rowid FROM cache_entries ORDER BY accessed_at LIMIT ?"
+            ")",
+            (excess,)
+        )
+        for namespace, amount in evicted:
+            self._count(namespace, 'evictions', amount)
+
+    def stats(self):
+        """네임스페이스별 hit/miss/eviction 카운터와 현재 항목 수"""
+        with self._lock:
+            result = {}
+            for namespace, hits, misses, evictions in self._conn.execute(
+                "SELECT namespace, hits, misses, evictions FROM cache_stats"
+            ):
+                total = hits + misses
+                result[namespace] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "evictions": evictions,
+                    "hit_rate": round(hits / total, 4) if total else 0.0,
+                    "entries": 0
+                }
+            for namespace, entries in self._conn.execute(
+                "SELECT namespace, COUNT(*) FROM cache_entries GROUP BY namespace"
+            ):
+                result.setdefault(namespace, {
+                    "hits": 0, "misses": 0, "evictions": 0, "hit_rate": 0.0
+                })["entries"] = entries
+            return result
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache():
+    """환경변수 설정을 사용하는 프로세스 공용 캐시"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TTLCache(
+                positive_ttl=float(os.getenv('YOUTUBE_CACHE_POSITIVE_TTL', '86400')),
+                negative_ttl=float(os.getenv('YOUTUBE_CACHE_NEGATIVE_TTL', '3600')),
+                max_entries=int(os.getenv('YOUTUBE_CACHE_MAX_ENTRIES', '10000'))
+            )
+        return _default_cache
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+채널 영상 스냅샷 저장소
+채널마다 지금까지 가져온 영상 목록(최신순)과 페이지별 ETag, 가장 최신 영상(워터마크)을
+로컬 SQLite에 보관합니다.
+- 영상 목록은 채널의 업로드 재생목록(playlistItems.list, 페이지당 1 unit)에서 가져옴
+- 갱신 시 첫 페이지를 If-None-Match로 요청해 바뀌지 않았으면(304) 그대로 사용
+- 바뀌었으면 이미 가진 영상이 나올 때까지의 새 영상만 상세 조회해서 앞에 합침
+- 아직 가져오지 않은 오래된 영상은 필요할 때 한 페이지씩 이어서 가져오며,
+  페이지의 상세 조회(videos.list)와 다음 목록 페이지 조회를 동시에 진행
+- query 표현식용 열 저장 형식(youtube_query.ChannelColumns - 여행 점수, 확인한 자막 언어 포함)도
+  채널마다 열 단위로 함께 보관
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from youtube_log import logger, bind_trace
+
+DEFAULT_CHANNEL_STORE_PATH = os.getenv(
+    'YOUTUBE_CHANNEL_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'youtube_channels.sqlite3')
+)
+
+# 이 시간(초) 안에 갱신한 스냅샷은 다시 확인하지 않음
+CHANNEL_SYNC_INTERVAL = float(os.getenv('CHANNEL_SYNC_INTERVAL', '60'))
+# 스냅샷을 처음부터 다시 만드는 주기(초) - 조회수 등 기존 영상 정보도 주기적으로 갱신
+CHANNEL_SNAPSHOT_MAX_AGE = float(os.getenv('CHANNEL_SNAPSHOT_MAX_AGE', '86400'))
+
+# 목록 조회와 겹쳐서 상세 조회(videos.list)를 실행할 작업 스레드
+_detail_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('CHANNEL_DETAIL_WORKERS', '4')), thread_name_prefix='channel-details'
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS channel_snapshots (
+    channel_id TEXT PRIMARY KEY,
+    snapshot TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS channel_columns (
+    channel_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    video_ids TEXT NOT NULL,
+    titles TEXT NOT NULL,
+    duration BLOB NOT NULL,
+    views BLOB NOT NULL,
+    published BLOB NOT NULL,
+    travel_score BLOB NOT NULL,
+    subtitles TEXT NOT NULL
+);
+"""
+
+# channel_columns의 열 (created_at 제외, ChannelColumns.to_row()의 키)
+_COLUMN_FIELDS = ('video_ids', 'titles', 'duration', 'views', 'published', 'travel_score', 'subtitles')
+
+def new_snapshot(channel_id):
+    """아무 영상도 가져오지 않은 빈 스냅샷"""
+    return {
+        "channel_id": channel_id,
+        "playlist_id": None,         # 업로드 재생목록 ID (처음 목록을 가져올 때 조회)
+        "videos": [],                # 최신순 영상 목록 (YouTubeCollector 형식)
+        "watermark": None,           # 가장 최신 영상 {"video_id", "published_at"}
+        "etags": {},                 # 페이지 토큰('' = 첫 페이지)별 ETag
+        "next_page_token": None,     # 이어서 가져올 오래된 페이지 토큰
+        "complete": False,           # 채널의 마지막 페이지까지 가져왔는지
+        "created_at": time.time(),
+        "synced_at": 0,
+    }
+
+class ChannelSnapshotStore:
+    """채널 스냅샷을 SQLite에 저장하고 프로세스 안에서는 메모리에 유지 (스레드 안전)"""
+
+    def __init__(self, path=None):
+        self.path = path or DEFAULT_CHANNEL_STORE_PATH
+        self._lock = threading.Lock()
+        self._channel_locks = {}
+        self._snapshots = {}
+        # 채널별로 미리 가져온 다음 목록 페이지 (page_token, page) - 메모리에만 보관
+        self._prefetched = {}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def channel_lock(self, channel_id):
+        """같은 채널을 동시에 갱신하지 않도록 채널별 잠금"""
+        with self._lock:
+            return self._channel_locks.setdefault(channel_id, threading.Lock())
+
+    def load(self, channel_id):
+        """스냅샷 조회 (없으면 빈 스냅샷)"""
+        with self._lock:
+            snapshot = self._snapshots.get(channel_id)
+            if snapshot is None:
+                row = self._conn.execute(
+                    "SELECT snapshot FROM channel_snapshots WHERE channel_id = ?", (channel_id,)
+                ).fetchone()
+                snapshot = json.loads(row[0]) if row else None
+                if snapshot is None or "playlist_id" not in snapshot:
+                    # 업로드 재생목록 이전(search.list 페이지 토큰) 형식은 버리고 새로 가져옴
+                    snapshot = new_snapshot(channel_id)
+                self._snapshots[channel_id] = snapshot
+            return snapshot
+
+    def save(self, snapshot):
+        """스냅샷 저장"""
+        with self._lock:
+            self._snapshots[snapshot["channel_id"]] = snapshot
+            self._conn.execute(
+                "INSERT OR REPLACE INTO channel_snapshots (channel_id, snapshot, synced_at) VALUES (?, ?, ?)",
+                (snapshot["channel_id"], json.dumps(snapshot, ensure_ascii=False), snapshot["synced_at"])
+            )
+
+    def load_columns(self, channel_id):
+        """저장된 열 저장 형식 (만든 스냅샷의 created_at, {열 이름: 값}) - 없으면 None"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT created_at, {', '.join(_COLUMN_FIELDS)} FROM channel_columns WHERE channel_id = ?",
+                (channel_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], dict(zip(_COLUMN_FIELDS, row[1:]))
+
+    def save_columns(self, channel_id, created_at, columns):
+        """열 저장 형식 저장 (columns: ChannelColumns.to_row())"""
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO channel_columns (channel_id, created_at, {', '.join(_COLUMN_FIELDS)}) "
+                f"VALUES (?, ?, {', '.join('?' * len(_COLUMN_FIELDS))})",
+                (channel_id, created_at) + tuple(columns[field] for field in _COLUMN_FIELDS)
+            )
+
+    def reset(self, channel_id):
+        """스냅샷을 비우고 처음부터 다시 가져오도록 함"""
+        snapshot = new_snapshot(channel_id)
+        self.save(snapshot)
+        with self._lock:
+            self._prefetched.pop(channel_id, None)
+        return snapshot
+
+    def put_prefetched(self, channel_id, page_token, page):
+        """미리 가져온 다음 목록 페이지 보관"""
+        with self._lock:
+            self._prefetched[channel_id] = (page_token, page)
+
+    def take_prefetched(self, channel_id, page_token):
+        """page_token 페이지를 미리 가져왔으면 꺼내서 반환 (없으면 None)"""
+        with self._lock:
+            prefetched = self._prefetched.pop(channel_id, None)
+        if prefetched and prefetched[0] == page_token:
+            return prefetched[1]
+        return None
+
+def _update_watermark(snapshot):
+    if snapshot["videos"]:
+        newest = snapshot["videos"][0]
+        snapshot["watermark"] = {
+            "video_id": newest["video_id"],
+            "published_at": newest.get("published_at", "")
+        }
+
+def _uploads_playlist_id(client, snapshot):
+    """스냅샷의 업로드 재생목록 ID (처음이면 channels.list로 조회, 채널이 없으면 None)"""
+    if snapshot["playlist_id"] is None and not snapshot["complete"]:
+        snapshot["playlist_id"] = client.uploads_playlist_id(snapshot["channel_id"])
+        if snapshot["playlist_id"] is None:
+            # 채널이 없거나 업로드 재생목록이 없음 - 빈 채널로 처리
+            snapshot["complete"] = True
+    return snapshot["playlist_id"]
+
+def refresh_snapshot(client, store, channel_id, min_interval=None):
+    """스냅샷 앞부분 갱신: 워터마크 이후 올라온 새 영상만 가져와 앞에 합침
+
+    Returns:
+        tuple: (스냅샷, 새로 추가된 영상 수)
+    """
+    if min_interval is None:
+        min_interval = CHANNEL_SYNC_INTERVAL
+
+    with store.channel_lock(channel_id):
+        snapshot = store.load(channel_id)
+
+        if time.time() - snapshot.get("created_at", 0) > CHANNEL_SNAPSHOT_MAX_AGE:
+            snapshot = store.reset(channel_id)
+
+        # 아직 아무것도 없으면 첫 페이지부터 extend_snapshot이 가져옴
+        if not snapshot["videos"] or time.time() - snapshot["synced_at"] < min_interval:
+            return snapshot, 0
+
+        known = {video["video_id"] for video in snapshot["videos"]}
+        new_ids = []
+        page_token = None
+        while True:
+            page = client.playlist_videos_page(
+                snapshot["playlist_id"], page_token, etag=snapshot["etags"].get(page_token or '')
+            )
+            if page is None:
+                # 304 Not Modified - 이 페이지 이후로 바뀐 것이 없음
+                break
+            snapshot["etags"][page_token or ''] = page["etag"]
+
+            reached_known = False
+            for video_id in page["video_ids"]:
+                if video_id in known:
+                    reached_known = True
+                    break
+                new_ids.append(video_id)
+
+            if reached_known or not page["next_page_token"]:
+                break
+            page_token = page["next_page_token"]
+
+        if new_ids:
+            logger.debug(f"{len(new_ids)} new videos since watermark for {channel_id}")
+            snapshot["videos"] = client.get_videos(new_ids) + snapshot["videos"]
+            _update_watermark(snapshot)
+
+        snapshot["synced_at"] = time.time()
+        store.save(snapshot)
+        return snapshot, len(new_ids)
+
+def extend_snapshot(client, store, snapshot):
+    """스냅샷 뒤에 이어지는 목록 페이지 하나를 가져와 붙임 (마지막 페이지면 complete)
+
+    이 페이지의 상세 조회를 작업 스레드에서 진행하는 동안 다음 목록 페이지를 미리 가져와 두므로,
+    이어서 호출하면 목록 조회를 기다리지 않습니다.
+
+    Returns:
+        int: 새로 붙인 영상 수
+    """
+    channel_id = snapshot["channel_id"]
+    with store.channel_lock(channel_id):
+        if snapshot["complete"]:
+            return 0
+
+        playlist_id = _uploads_playlist_id(client, snapshot)
+        if playlist_id is None:
+            store.save(snapshot)
+            return 0
+
+        page_token = snapshot["next_page_token"]
+        page = store.take_prefetched(channel_id, page_token)
+        if page is None:
+            page = client.playlist_videos_page(playlist_id, page_token)
+
+        # 앞쪽에 새 영상이 추가되어 페이지가 밀렸을 수 있으므로 이미 가진 영상은 제외
+        known = {video["video_id"] for video in snapshot["videos"]}
+        new_ids = [video_id for video_id in page["video_ids"] if video_id not in known]
+        details = _detail_executor.submit(bind_trace(client.get_videos), new_ids) if new_ids else None
+
+        # 상세 조회와 겹쳐서 다음 목록 페이지를 미리 가져옴 (실패하면 다음 호출에서 다시 시도)
+        if page["next_page_token"]:
+            try:
+                store.put_prefetched(
+                    channel_id, page["next_page_token"],
+                    client.playlist_videos_page(playlist_id, page["next_page_token"])
+                )
+            except Exception as e:
+                logger.debug(f"Prefetch of next playlist page failed for {channel_id}: {e}")
+
+        videos = details.result() if details else []
+
+        snapshot["videos"].extend(videos)
+        snapshot["etags"][page_token or ''] = page["etag"]
+        snapshot["next_page_token"] = page["next_page_token"]
+        snapshot["complete"] = not page["next_page_token"]
+        if page_token is None:
+            snapshot["synced_at"] = time.time()
+        _update_watermark(snapshot)
+        store.save(snapshot)
+        return len(videos)
+
+def iter_snapshot_videos(client, store, snapshot, start_index=0):
+    """스냅샷 순서(최신순)대로 (위치, 영상)을 생성하고, 끝에 도달하면 다음 원본 페이지를 가져와 이어감"""
+    index = start_index
+    while True:
+        videos = snapshot["videos"]
+        while index < len(videos):
+            yield index, videos[index]
+            index += 1
+        if snapshot["complete"]:
+            return
+        extend_snapshot(client, store, snapshot)
+
+def has_more_videos(snapshot, index):
+    """index 다음 위치에 영상이 더 있을 수 있는지"""
+    return index + 1 < len(snapshot["videos"]) or not snapshot["complete"]
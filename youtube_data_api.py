@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+YouTube Data API v3 REST 클라이언트
+페이지 토큰 단위로 조회해야 하는 곳(채널 업로드 재생목록 페이지네이션 등)에서 사용합니다.
+영상 정보는 YouTubeCollector와 같은 형식의 dict로 돌려줍니다.
+API 키는 호출마다 키 풀에서 받으며, 할당량 초과 응답을 받으면 같은 요청을 다음 키로
+다시 보내므로 진행 중이던 페이지 순회가 처음부터 다시 시작되지 않습니다.
+"""
+
+import re
+import threading
+import requests
+
+from youtube_quota import QUOTA_COSTS
+from youtube_log import logger, span
+
+API_BASE_URL = 'https://www.googleapis.com/youtube/v3'
+
+# videos.list 한 번에 조회할 수 있는 최대 ID 수
+MAX_IDS_PER_REQUEST = 50
+
+# 키를 바꿔서 재시도할 할당량 초과 사유
+QUOTA_ERROR_REASONS = ('quotaExceeded', 'dailyLimitExceeded')
+
+class YouTubeDataApiError(Exception):
+    """Data API 오류 응답 (status 403 + reason quotaExceeded 등)"""
+
+    def __init__(self, status, reason, message):
+        self.status = status
+        self.reason = reason
+        super().__init__(f"HTTP {status} {reason}: {message}")
+
+def parse_iso8601_duration(value):
+    """ISO 8601 재생 시간(PT1H2M3S)을 초 단위로 변환"""
+    match = re.match(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$', value or '')
+    if not match:
+        return 0
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+def normalize_video(item):
+    """videos.list 항목을 YouTubeCollector 형식의 dict로 변환"""
+    snippet = item.get("snippet", {})
+    statistics = item.get("statistics", {})
+    return {
+        "video_id": item["id"],
+        "title": snippet.get("title", ""),
+        "description": snippet.get("description", ""),
+        "channel_id": snippet.get("channelId", ""),
+        "published_at": snippet.get("publishedAt", ""),
+        "duration": parse_iso8601_duration(item.get("contentDetails", {}).get("duration")),
+        "view_count": int(statistics.get("viewCount", 0)),
+    }
+
+class YouTubeDataClient:
+    """키 풀의 키로 Data API를 호출하는 클라이언트 (스레드별 requests 세션 재사용)
+
+    목록 조회와 상세 조회를 서로 다른 스레드에서 동시에 호출할 수 있습니다.
+    """
+
+    def __init__(self, key_pool, session=None, timeout=15):
+        self.key_pool = key_pool
+        self.timeout = timeout
+        self._session = session
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        if self._session is not None:
+            return self._session
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def request(self, resource, params, etag=None):
+        """GET {API_BASE_URL}/{resource} 호출 후 JSON 반환 (할당량 초과 시 다음 키로 재시도)
+
+        etag를 주면 If-None-Match 조건부 요청을 보내고, 바뀐 것이 없으면(304) None을 반환합니다.
+
+        Raises:
+            QuotaExhaustedError: 모든 키의 할당량이 소진됨
+            YouTubeDataApiError: 그 밖의 API 오류
+        """
+        method = f"{resource}.list"
+        cost = QUOTA_COSTS.get(method, 1)
+        while True:
+            api_key = self.key_pool.acquire(cost, method)
+            try:
+                return self._get(resource, params, api_key, etag)
+            except YouTubeDataApiError as e:
+                if e.status == 403 and e.reason in QUOTA_ERROR_REASONS:
+                    logger.warning(f"Quota exceeded on {method}, switching API key")
+                    self.key_pool.mark_exhausted(api_key)
+                    continue
+                raise
+
+    def _get(self, resource, params, api_key, etag=None):
+        response = self.session.get(
+            f"{API_BASE_URL}/{resource}",
+            params=dict(params, key=api_key),
+            headers={"If-None-Match": etag} if etag else None,
+            timeout=self.timeout
+        )
+        if response.status_code == 304:
+            return None
+        if response.status_code != 200:
+            reason = ''
+            message = response.text[:200]
+            try:
+                error = response.json().get("error", {})
+                message = error.get("message", message)
+                reason = (error.get("errors") or [{}])[0].get("reason", '')
+            except ValueError:
+                pass
+            raise YouTubeDataApiError(response.status_code, reason, message)
+        return response.json()
+
+    def uploads_playlist_id(self, channel_id):
+        """채널의 업로드 재생목록 ID 조회 (channels.list - 1 unit, 채널이 없으면 None)"""
+        with span('listing'):
+            data = self.request("channels", {"part": "contentDetails", "id": channel_id})
+        items = data.get("items", [])
+        if not items:
+            return None
+        return items[0].get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+
+    def playlist_videos_page(self, playlist_id, page_token=None, etag=None, max_results=MAX_IDS_PER_REQUEST):
+        """재생목록 영상 ID 한 페이지 조회 (playlistItems.list - 1 unit, 업로드 재생목록은 최신순)
+
+        Returns:
+            dict: {"video_ids", "next_page_token", "etag"} - etag 조건부 요청이 304면 None
+        """
+        params = {
+            "part": "contentDetails",
+            "playlistId": playlist_id,
+            "maxResults": max_results,
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        with span('listing'):
+            data = self.request("playlistItems", params, etag)
+        if data is None:
+            return None
+        return {
+            "video_ids": [
+                item["contentDetails"]["videoId"] for item in data.get("items", [])
+                if item.get("contentDetails", {}).get("videoId")
+            ],
+            "next_page_token": data.get("nextPageToken"),
+            "etag": data.get("etag"),
+        }
+
+    def get_videos(self, video_ids):
+        """영상 상세 정보 조회 (50개씩 나눠서 videos.list 호출, 입력 순서 유지)"""
+        videos = {}
+        for start in range(0, len(video_ids), MAX_IDS_PER_REQUEST):
+            batch = video_ids[start:start + MAX_IDS_PER_REQUEST]
+            with span('details'):
+                data = self.request("videos", {
+                    "part": "snippet,contentDetails,statistics",
+                    "id": ",".join(batch),
+                    "maxResults": MAX_IDS_PER_REQUEST,
+                })
+            for item in data.get("items", []):
+                videos[item["id"]] = normalize_video(item)
+        return [videos[video_id] for video_id in video_ids if video_id in videos]
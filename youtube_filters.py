@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+영상 필터 파이프라인
+필터(긴 영상, 여행 영상, 자막 등)를 비용이 정해진 단계(stage)로 만들어 싼 단계부터 실행합니다.
+- 앞 단계를 통과한 영상만 다음 단계로 넘어가므로 비싼 단계(네트워크)는 적은 영상만 확인
+- 필터로 쓰지 않고 표시용 값만 필요한 비싼 단계는 실제로 돌려줄 영상에만 실행 (annotate, 값이 나오는 대로 생성)
+- 단계마다 확인한 영상 수, 걸러낸 영상 수, 걸린 시간을 기록
+"""
+
+import time
+
+# 이 비용 이상인 표시용(필터 아님) 단계는 돌려줄 영상이 정해진 뒤에만 실행
+LAZY_STAGE_COST = 100
+
+class FilterStage:
+    """필터 단계 하나
+
+    evaluate(contexts)는 영상마다 값을 순서대로 돌려주는 iterable을 반환하고,
+    값은 context[name]에 저장됩니다. required면 값이 거짓인 영상을 걸러냅니다.
+    evaluate가 generator면 필요한 만큼만 꺼내 쓰고 남으면 close()로 정리합니다.
+    """
+
+    def __init__(self, name, cost, evaluate, required=True):
+        self.name = name
+        self.cost = cost
+        self.evaluate = evaluate
+        self.required = required
+
+class FilterPipeline:
+    """비용 순으로 필터 단계를 실행하고 단계별 통계를 누적"""
+
+    def __init__(self, stages):
+        ordered = sorted(stages, key=lambda stage: stage.cost)
+        self.stages = [
+            stage for stage in ordered if stage.required or stage.cost < LAZY_STAGE_COST
+        ]
+        self.lazy_stages = [
+            stage for stage in ordered if not stage.required and stage.cost >= LAZY_STAGE_COST
+        ]
+        self._stats = {
+            stage.name: {"stage": stage.name, "evaluated": 0, "removed": 0, "seconds": 0.0}
+            for stage in ordered
+        }
+
+    def _run_stage(self, stage, contexts):
+        """contexts에 단계 하나를 적용하고 통과한 context를 순서대로 생성"""
+        stat = self._stats[stage.name]
+        # 한 번에 계산하는 단계(긴 영상, 여행 등)는 evaluate() 안에서 시간을 쓰므로 함께 잼
+        started = time.perf_counter()
+        iterator = iter(stage.evaluate(contexts))
+        stat["seconds"] += time.perf_counter() - started
+        try:
+            for context in contexts:
+                started = time.perf_counter()
+                value = next(iterator)
+                stat["seconds"] += time.perf_counter() - started
+                stat["evaluated"] += 1
+
+                context[stage.name] = value
+                if stage.required and not value:
+                    stat["removed"] += 1
+                    continue
+                yield context
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close:
+                close()
+
+    def run(self, contexts):
+        """필터 단계를 통과한 context를 순서대로 생성
+
+        마지막(가장 비싼) 단계만 필요한 만큼 지연 실행하고, 그 앞 단계는 묶음 전체에 한 번에 적용합니다.
+        """
+        contexts = list(contexts)
+        if not self.stages:
+            yield from contexts
+            return
+        for stage in self.stages[:-1]:
+            contexts = list(self._run_stage(stage, contexts))
+        yield from self._run_stage(self.stages[-1], contexts)
+
+    def annotate(self, contexts):
+        """돌려주기로 정해진 context에만 표시용 비싼 단계를 실행하고 순서대로 생성
+
+        마지막 단계는 run()처럼 지연 실행하므로, 각 context는 자기 값이 나오는 즉시
+        (묶음 전체의 확인이 끝나기 전에) 나갑니다.
+        """
+        contexts = list(contexts)
+        if not self.lazy_stages:
+            yield from contexts
+            return
+        for stage in self.lazy_stages[:-1]:
+            contexts = list(self._run_stage(stage, contexts))
+        yield from self._run_stage(self.lazy_stages[-1], contexts)
+
+    def stats(self):
+        """단계별 통계 (실행 순서대로)"""
+        return [
+            dict(self._stats[stage.name], seconds=round(self._stats[stage.name]["seconds"], 4))
+            for stage in self.stages + self.lazy_stages
+        ]
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+youtube_api 로그와 요청별 구간 시간 측정
+- 로그 레벨은 YOUTUBE_API_LOG_LEVEL 환경변수 또는 --log-level 옵션 (기본 WARNING: 조용함)
+- 요청마다 구간(span)별 누적 시간과 Data API 할당량 사용량을 모아 INFO 레벨에서 JSON 한 줄로 출력
+  {"event": "request", "action": "analyze", "status": "ok", "total_ms": 812.4,
+   "spans": {"channel_resolution": {"count": 1, "ms": 3.1}, "listing": {...}, ...},
+   "quota": {"units": 102, "methods": {"search.list": {"calls": 1, "units": 100}, ...}}}
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+DEFAULT_LOG_LEVEL = os.getenv('YOUTUBE_API_LOG_LEVEL', 'WARNING')
+
+logger = logging.getLogger('youtube_api')
+
+_trace_local = threading.local()
+
+class _StderrHandler(logging.StreamHandler):
+    """출력 시점의 sys.stderr에 기록 (UTF-8로 다시 감싼 stderr를 따라가도록)"""
+
+    def __init__(self):
+        super().__init__(sys.stderr)
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+def configure_logging(level=None):
+    """로그 레벨과 출력 형식 설정 ("DEBUG: 메시지" 형식으로 stderr에 출력)"""
+    level = (level or DEFAULT_LOG_LEVEL).upper()
+    if not logger.handlers:
+        handler = _StderrHandler()
+        handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(getattr(logging, level, logging.WARNING))
+
+class RequestTrace:
+    """요청 하나의 구간별 누적 시간과 할당량 사용량"""
+
+    def __init__(self, action, **fields):
+        self.action = action
+        self.fields = fields
+        self.spans = {}
+        self.quota = {}
+        self.started = time.perf_counter()
+        # bind_trace로 넘긴 작업 스레드에서도 기록될 수 있음
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds, count=1):
+        with self._lock:
+            span = self.spans.setdefault(name, {"count": 0, "seconds": 0.0})
+            span["count"] += count
+            span["seconds"] += seconds
+
+    def add_quota(self, method, units):
+        with self._lock:
+            entry = self.quota.setdefault(method, {"calls": 0, "units": 0})
+            entry["calls"] += 1
+            entry["units"] += units
+
+    def quota_summary(self):
+        """{"units": 합계, "methods": {method: {"calls", "units"}}}"""
+        with self._lock:
+            return {
+                "units": sum(entry["units"] for entry in self.quota.values()),
+                "methods": {method: dict(entry) for method, entry in self.quota.items()}
+            }
+
+    def summary(self):
+        return dict(
+            {"event": "request", "action": self.action},
+            **self.fields,
+            total_ms=round((time.perf_counter() - self.started) * 1000, 1),
+            spans={
+                name: {"count": span["count"], "ms": round(span["seconds"] * 1000, 1)}
+                for name, span in self.spans.items()
+            },
+            quota=self.quota_summary()
+        )
+
+def current_trace():
+    """현재 스레드에서 진행 중인 요청 (없으면 None)"""
+    return getattr(_trace_local, 'trace', None)
+
+@contextmanager
+def request_trace(action, **fields):
+    """블록 동안 현재 스레드의 요청으로 등록하고, 끝나면 JSON 요약 한 줄을 INFO로 출력
+
+    블록 안에서 trace.fields["status"] 등을 채우면 요약에 함께 기록됩니다.
+    """
+    trace = RequestTrace(action, **fields)
+    previous = current_trace()
+    _trace_local.trace = trace
+    try:
+        yield trace
+    except Exception:
+        trace.fields.setdefault("status", "error")
+        raise
+    finally:
+        _trace_local.trace = previous
+        trace.fields.setdefault("status", "ok")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(trace.summary(), ensure_ascii=False))
+
+def bind_trace(func):
+    """다른 스레드에서 실행해도 지금 요청에 구간/할당량이 기록되도록 func를 감쌈"""
+    trace = current_trace()
+
+    def wrapper(*args, **kwargs):
+        previous = current_trace()
+        _trace_local.trace = trace
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _trace_local.trace = previous
+    return wrapper
+
+def record_span(name, seconds, count=1):
+    """이미 잰 시간을 현재 요청의 구간에 더함 (진행 중인 요청이 없으면 무시)"""
+    trace = current_trace()
+    if trace is not None:
+        trace.add(name, seconds, count)
+
+def record_quota(method, units):
+    """Data API 호출 한 번의 할당량 사용을 현재 요청에 기록 (진행 중인 요청이 없으면 무시)"""
+    trace = current_trace()
+    if trace is not None:
+        trace.add_quota(method, units)
+
+@contextmanager
+def span(name):
+    """블록 실행 시간을 현재 요청의 구간에 더함"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - started)
@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+채널 스냅샷 열(column) 저장과 필터/정렬 표현식
+채널 영상 목록을 필드별 배열(재생 시간, 조회수, 게시 시각, 여행 점수, 자막 언어)로 바꿔
+채널 스냅샷 저장소(youtube_channel_store)에 함께 보관하고, 필터 표현식을 열 전체에 한 번에
+적용하는 조건 함수로 컴파일합니다. (새 프로세스도 여행 점수를 다시 계산하지 않고 열을 바로 읽음)
+
+표현식 예:
+  duration>=600 and views>10k order by views desc limit 50
+  (travel or title ~ '제주') and not has_subtitles order by published desc
+  subtitles = ko and published >= 2024-01-01
+
+- 필드: duration(초, 10m/1h 단위 가능), views(10k/1.5m 단위 가능), published(YYYY-MM-DD),
+        travel_score, title(~는 포함 검색), subtitles(자막 언어 코드)
+- 참/거짓 필드: travel(여행 영상), has_subtitles(자막 있음)
+- and/or/not, 괄호, order by 필드 [asc|desc][, ...], limit N
+- 자막 조건은 네트워크 확인이 필요하므로 and에서는 항상 마지막에, 남은 영상에만 실행
+"""
+
+import re
+import json
+import operator
+import threading
+from array import array
+from itertools import compress, filterfalse, repeat
+from datetime import datetime, timezone
+
+from youtube_travel import travel_score, TRAVEL_SCORE_THRESHOLD
+
+class QueryError(ValueError):
+    """표현식 문법 오류"""
+
+def _parse_published(value):
+    """ISO 8601 게시 시각을 epoch 초로 변환 (없으면 0)"""
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return 0.0
+
+# 저장소에 바이트 그대로 보관하는 숫자 열 (열 이름, array 형식 - 플랫폼마다 크기가 같은 형식만 사용)
+_ARRAY_COLUMNS = (('duration', 'q'), ('views', 'q'), ('published', 'd'), ('travel_score', 'i'))
+
+class ChannelColumns:
+    """채널 영상 목록의 열 저장 형식 (행 순서는 스냅샷 순서 = 최신순)
+
+    subtitles는 아직 확인하지 않은 영상이 None이며, 조건에 필요할 때 채워집니다.
+    created_at은 열을 만든 스냅샷의 created_at이고(스냅샷을 새로 만들면 열도 새로 만듦),
+    dirty는 저장한 뒤 자막 확인 결과가 채워졌는지 여부입니다.
+    """
+
+    def __init__(self):
+        self.video_ids = []
+        self.titles = []
+        for name, typecode in _ARRAY_COLUMNS:
+            setattr(self, name, array(typecode))
+        self.subtitles = []
+        self.created_at = None
+        self.dirty = False
+        self._lowered_titles = None
+
+    def __len__(self):
+        return len(self.video_ids)
+
+    def lowered_titles(self):
+        """소문자로 바꾼 제목 목록 (title 조건/정렬용, 한 번만 만듦)"""
+        if self._lowered_titles is None:
+            self._lowered_titles = list(map(str.lower, self.titles))
+        return self._lowered_titles
+
+    def to_row(self):
+        """저장소에 넣을 값 {열 이름: JSON 문자열 또는 array 바이트}
+
+        자막이 없다는 결과는 일시적인 확인 실패(시간 초과 등)와 구분되지 않으므로 저장하지 않고,
+        다음 프로세스가 다시 확인합니다 (진짜 없음은 자막 목록 캐시에서 바로 나옴).
+        """
+        row = {
+            "video_ids": json.dumps(self.video_ids),
+            "titles": json.dumps(self.titles, ensure_ascii=False),
+            "subtitles": json.dumps([languages or None for languages in self.subtitles]),
+        }
+        for name, _ in _ARRAY_COLUMNS:
+            row[name] = getattr(self, name).tobytes()
+        return row
+
+    @classmethod
+    def from_row(cls, row, created_at):
+        """to_row()로 저장한 값으로 생성"""
+        columns = cls()
+        columns.video_ids = json.loads(row["video_ids"])
+        columns.titles = json.loads(row["titles"])
+        columns.subtitles = json.loads(row["subtitles"])
+        for name, _ in _ARRAY_COLUMNS:
+            getattr(columns, name).frombytes(row[name])
+        columns.created_at = created_at
+        return columns
+
+    @classmethod
+    def from_videos(cls, videos):
+        """YouTubeCollector 형식의 영상 dict 목록으로 생성"""
+        columns = cls()
+        for video in videos:
+            title = video.get("title", "")
+            columns.video_ids.append(video["video_id"])
+            columns.titles.append(title)
+            columns.duration.append(video.get("duration", 0))
+            columns.views.append(video.get("view_count", 0))
+            columns.published.append(_parse_published(video.get("published_at")))
+            columns.travel_score.append(travel_score(title, video.get("description", "")))
+            columns.subtitles.append(None)
+        return columns
+
+    @classmethod
+    def concat(cls, parts):
+        """여러 열 묶음을 순서대로 이어 붙임"""
+        columns = cls()
+        for part in parts:
+            columns.video_ids += part.video_ids
+            columns.titles += part.titles
+            columns.duration += part.duration
+            columns.views += part.views
+            columns.published += part.published
+            columns.travel_score += part.travel_score
+            columns.subtitles += part.subtitles
+        return columns
+
+    def ensure_subtitles(self, indices, probe):
+        """indices 중 자막 언어를 아직 모르는 영상만 probe(video_ids)로 확인해서 채움"""
+        subtitles = self.subtitles
+        unknown = [i for i in indices if subtitles[i] is None]
+        if not unknown:
+            return
+        for i, languages in zip(unknown, probe([self.video_ids[i] for i in unknown])):
+            subtitles[i] = languages
+            if languages:
+                self.dirty = True
+
+_columns_cache = {}
+_columns_lock = threading.Lock()
+
+def get_columns(snapshot, store=None):
+    """스냅샷의 열 저장 형식 (새로 붙은 영상만 변환)
+
+    프로세스 안에서 채널별로 유지하고, store(ChannelSnapshotStore)가 있으면 저장된 열을 읽어
+    시작합니다. 스냅샷은 앞(새 영상)과 뒤(오래된 페이지)로만 늘어나므로, 이전에 변환한 구간을
+    찾아 그대로 재사용하고 나머지만 변환해서 저장합니다. 찾지 못하거나 스냅샷을 새로 만들었으면
+    전체를 다시 변환합니다.
+    """
+    channel_id = snapshot["channel_id"]
+    created_at = snapshot.get("created_at")
+    videos = snapshot["videos"]
+    with _columns_lock:
+        previous = _columns_cache.get(channel_id)
+    if (previous is None or previous.created_at != created_at) and store is not None:
+        stored = store.load_columns(channel_id)
+        previous = ChannelColumns.from_row(stored[1], stored[0]) if stored else None
+    if previous is not None and previous.created_at != created_at:
+        previous = None
+
+    columns = None
+    if previous is not None and len(previous):
+        ids = [video["video_id"] for video in videos]
+        try:
+            start = ids.index(previous.video_ids[0])
+        except ValueError:
+            start = -1
+        end = start + len(previous)
+        if start >= 0 and end <= len(ids) and ids[end - 1] == previous.video_ids[-1]:
+            if start == 0 and end == len(ids):
+                columns = previous
+            else:
+                columns = ChannelColumns.concat([
+                    ChannelColumns.from_videos(videos[:start]),
+                    previous,
+                    ChannelColumns.from_videos(videos[end:]),
+                ])
+                columns.dirty = True
+
+    if columns is None:
+        columns = ChannelColumns.from_videos(videos)
+        columns.dirty = True
+    columns.created_at = created_at
+    with _columns_lock:
+        _columns_cache[channel_id] = columns
+    save_columns(channel_id, columns, store)
+    return columns
+
+def save_columns(channel_id, columns, store):
+    """바뀐 열(새 영상, 자막 확인 결과)을 저장소에 기록 (store가 없거나 바뀐 것이 없으면 생략)"""
+    if store is None or not columns.dirty:
+        return
+    store.save_columns(channel_id, columns.created_at, columns.to_row())
+    columns.dirty = False
+
+# ---------------------------------------------------------------------------
+# 표현식 파싱
+
+_TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<date>\d{4}-\d{2}-\d{2})
+      | (?P<number>\d+(?:\.\d+)?[a-zA-Z]*)
+      | (?P<string>'[^']*'|"[^"]*")
+      | (?P<op>>=|<=|!=|==|=|>|<|~|\(|\)|,)
+      | (?P<word>[A-Za-z_][A-Za-z0-9_\-]*)
+    )""", re.VERBOSE)
+
+_KEYWORDS = ('and', 'or', 'not', 'order', 'by', 'asc', 'desc', 'limit')
+
+_DURATION_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600}
+_COUNT_UNITS = {'': 1, 'k': 1000, 'm': 1000000}
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            raise QueryError(f"Unexpected character at {position}: {text[position:position + 10]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'word' and value.lower() in _KEYWORDS:
+            kind, value = 'keyword', value.lower()
+        elif kind == 'string':
+            value = value[1:-1]
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+def _number_with_unit(value, units, field):
+    match = re.match(r'(\d+(?:\.\d+)?)([a-zA-Z]*)$', value)
+    unit = match.group(2).lower() if match else None
+    if unit not in units:
+        raise QueryError(f"Invalid value for {field}: {value}")
+    return float(match.group(1)) * units[unit]
+
+def _date_value(value, field):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        raise QueryError(f"Invalid date for {field}: {value}")
+
+# 필드: (열 이름, 값 변환, 허용 연산자)
+_NUMERIC_OPERATORS = ('>=', '<=', '!=', '==', '=', '>', '<')
+FIELDS = {
+    'duration': ('duration', lambda v, f: _number_with_unit(v, _DURATION_UNITS, f), _NUMERIC_OPERATORS),
+    'views': ('views', lambda v, f: _number_with_unit(v, _COUNT_UNITS, f), _NUMERIC_OPERATORS),
+    'published': ('published', _date_value, _NUMERIC_OPERATORS),
+    'travel_score': ('travel_score', lambda v, f: _number_with_unit(v, {'': 1}, f), _NUMERIC_OPERATORS),
+    'title': ('titles', lambda v, f: v.lower(), ('~', '=', '==', '!=')),
+    'subtitles': ('subtitles', lambda v, f: v.lower(), ('=', '==', '!=')),
+}
+BOOLEAN_FIELDS = ('travel', 'has_subtitles')
+SORT_FIELDS = ('duration', 'views', 'published', 'travel_score', 'title')
+
+class _Parser:
+    """재귀 하강 파서: 표현식 → 구문 트리 (튜플)"""
+
+    def __init__(self, text):
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self, kind=None, value=None):
+        token = self.peek()
+        if token[0] is None or (kind and token[0] != kind) or (value and token[1] != value):
+            expected = value or kind or 'more input'
+            found = token[1] if token[0] else 'end of query'
+            raise QueryError(f"Expected {expected}, found {found}")
+        self.position += 1
+        return token
+
+    def parse(self):
+        where = None
+        if self.peek() not in (('keyword', 'order'), ('keyword', 'limit'), (None, None)):
+            where = self.parse_or()
+
+        order = []
+        if self.peek() == ('keyword', 'order'):
+            self.take('keyword', 'order')
+            self.take('keyword', 'by')
+            while True:
+                field = self.take('word')[1].lower()
+                if field not in SORT_FIELDS:
+                    raise QueryError(f"Cannot order by {field}")
+                descending = False
+                if self.peek()[0] == 'keyword' and self.peek()[1] in ('asc', 'desc'):
+                    descending = self.take()[1] == 'desc'
+                order.append((field, descending))
+                if self.peek() != ('op', ','):
+                    break
+                self.take('op', ',')
+
+        limit = None
+        if self.peek() == ('keyword', 'limit'):
+            self.take('keyword', 'limit')
+            value = self.take('number')[1]
+            if not value.isdigit():
+                raise QueryError(f"Invalid limit: {value}")
+            limit = int(value)
+
+        if self.peek()[0] is not None:
+            raise QueryError(f"Unexpected {self.peek()[1]}")
+        return where, order, limit
+
+    def parse_or(self):
+        terms = [self.parse_and()]
+        while self.peek() == ('keyword', 'or'):
+            self.take()
+            terms.append(self.parse_and())
+        return terms[0] if len(terms) == 1 else ('or', terms)
+
+    def parse_and(self):
+        terms = [self.parse_not()]
+        while self.peek() == ('keyword', 'and'):
+            self.take()
+            terms.append(self.parse_not())
+        return terms[0] if len(terms) == 1 else ('and', terms)
+
+    def parse_not(self):
+        if self.peek() == ('keyword', 'not'):
+            self.take()
+            return ('not', self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self):
+        if self.peek() == ('op', '('):
+            self.take()
+            node = self.parse_or()
+            self.take('op', ')')
+            return node
+
+        field = self.take('word')[1].lower()
+        if field in BOOLEAN_FIELDS:
+            return ('bool', field)
+        if field not in FIELDS:
+            raise QueryError(f"Unknown field: {field}")
+
+        _, convert, operators = FIELDS[field]
+        comparison = self.take('op')[1]
+        if comparison not in operators:
+            raise QueryError(f"Operator {comparison} is not supported for {field}")
+        kind, raw = self.take()
+        if kind not in ('number', 'date', 'string', 'word'):
+            raise QueryError(f"Expected a value for {field}, found {raw}")
+        return ('cmp', field, comparison, convert(raw, field))
+
+# ---------------------------------------------------------------------------
+# 컴파일: 구문 트리 → (columns, indices, probe) -> 통과한 indices 함수
+#
+# 열 값만 보는 싼 조건은 행마다 Python 코드를 돌리지 않고 열 전체를 map 한 번으로 비교해서
+# 행마다 1바이트(0/1)인 마스크(정수)를 만들고, and/or/not은 정수 비트 연산으로 합칩니다.
+# 자막 조건(네트워크)은 마스크 없이 앞 조건을 통과한 행에만 실행합니다.
+
+# 자막 조건(네트워크)은 다른 조건보다 훨씬 비쌈
+_CHEAP, _EXPENSIVE = 1, 1000
+
+_COMPARE = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+    '=': operator.eq,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+def _column_mask(values, compare, value):
+    """열 전체에서 compare(값, value)를 만족하는 행의 마스크"""
+    return int.from_bytes(bytes(map(compare, values, repeat(value))), 'little')
+
+def _all_rows(count):
+    """모든 행이 통과한 마스크"""
+    return int.from_bytes(b'\x01' * count, 'little')
+
+def _masked(mask, count, indices):
+    """indices 중 마스크를 통과한 행 번호 (indices는 오름차순이라 길이가 count면 모든 행)"""
+    flags = mask.to_bytes(count, 'little')
+    if len(indices) == count:
+        return list(compress(indices, flags))
+    return [i for i in indices if flags[i]]
+
+class Predicate:
+    """컴파일된 조건
+
+    evaluate(columns, indices, probe)는 통과한 행 번호를 원래 순서대로 반환하고,
+    mask(columns)는 열 값만으로 정해지는 조건에서 모든 행의 마스크를 반환합니다 (자막 조건은 None).
+    """
+
+    def __init__(self, evaluate, cost, mask=None):
+        self.evaluate = evaluate
+        self.cost = cost
+        self.mask = mask
+
+def _mask_predicate(mask):
+    """마스크로 정해지는 싼 조건"""
+    def evaluate(columns, indices, probe):
+        return _masked(mask(columns), len(columns), indices)
+    return Predicate(evaluate, _CHEAP, mask)
+
+def _has_language(languages, code):
+    return any(
+        language["language_code"].lower() == code or language["language_code"].lower().split('-')[0] == code
+        for language in languages
+    )
+
+def _combined_mask(terms, combine):
+    """terms(모두 마스크가 있는 조건)의 마스크를 combine(정수 비트 연산)으로 합치는 함수"""
+    def mask(columns):
+        result = terms[0].mask(columns)
+        for term in terms[1:]:
+            result = combine(result, term.mask(columns))
+        return result
+    return mask
+
+def _compile(node):
+    kind = node[0]
+
+    if kind == 'bool':
+        if node[1] == 'travel':
+            return _mask_predicate(
+                lambda columns: _column_mask(columns.travel_score, operator.ge, TRAVEL_SCORE_THRESHOLD)
+            )
+
+        def evaluate(columns, indices, probe):
+            columns.ensure_subtitles(indices, probe)
+            subtitles = columns.subtitles
+            return [i for i in indices if subtitles[i]]
+        return Predicate(evaluate, _EXPENSIVE)
+
+    if kind == 'cmp':
+        _, field, comparison, value = node
+        column_name = FIELDS[field][0]
+
+        if field == 'subtitles':
+            negate = comparison == '!='
+
+            def evaluate(columns, indices, probe):
+                columns.ensure_subtitles(indices, probe)
+                subtitles = columns.subtitles
+                return [i for i in indices if _has_language(subtitles[i], value) != negate]
+            return Predicate(evaluate, _EXPENSIVE)
+
+        if field == 'title':
+            compare = operator.contains if comparison == '~' else _COMPARE[comparison]
+            return _mask_predicate(lambda columns: _column_mask(columns.lowered_titles(), compare, value))
+
+        compare = _COMPARE[comparison]
+        return _mask_predicate(lambda columns: _column_mask(getattr(columns, column_name), compare, value))
+
+    if kind == 'not':
+        inner = _compile(node[1])
+        if inner.mask is not None:
+            return _mask_predicate(lambda columns: _all_rows(len(columns)) ^ inner.mask(columns))
+
+        def evaluate(columns, indices, probe):
+            excluded = set(inner.evaluate(columns, indices, probe))
+            return list(filterfalse(excluded.__contains__, indices))
+        return Predicate(evaluate, inner.cost)
+
+    terms = [_compile(term) for term in node[1]]
+    cost = sum(term.cost for term in terms)
+    # 마스크가 있는 조건은 하나로 합치고, 비싼 조건은 그 결과에만 비용 순으로 실행
+    masked = [term for term in terms if term.mask is not None]
+    expensive = sorted((term for term in terms if term.mask is None), key=lambda term: term.cost)
+    combine = operator.and_ if kind == 'and' else operator.or_
+    cheap = _mask_predicate(_combined_mask(masked, combine)) if masked else None
+    if not expensive:
+        return cheap
+
+    if kind == 'and':
+        terms = ([cheap] if cheap else []) + expensive
+
+        def evaluate(columns, indices, probe):
+            for term in terms:
+                if not indices:
+                    break
+                indices = term.evaluate(columns, indices, probe)
+            return indices
+        return Predicate(evaluate, cost)
+
+    # or: 앞 조건을 통과하지 못한 행만 다음 조건으로 확인
+    terms = ([cheap] if cheap else []) + expensive
+
+    def evaluate(columns, indices, probe):
+        matched = set()
+        remaining = indices
+        for term in terms:
+            if not remaining:
+                break
+            matched.update(term.evaluate(columns, remaining, probe))
+            remaining = list(filterfalse(matched.__contains__, remaining))
+        return list(filter(matched.__contains__, indices))
+    return Predicate(evaluate, cost)
+
+class CompiledQuery:
+    """컴파일된 필터/정렬 표현식"""
+
+    def __init__(self, text, where, order, limit):
+        self.text = text
+        self.where = where
+        self.order = order
+        self.limit = limit
+
+    def execute(self, columns, probe=None):
+        """조건을 통과한 행 번호를 정렬/limit 적용해서 반환
+
+        Args:
+            columns (ChannelColumns): 채널 열 저장 형식
+            probe: 자막 조건이 있을 때 video_id 목록의 자막 언어 목록을 순서대로 돌려주는 함수
+        """
+        indices = list(range(len(columns)))
+        if self.where is not None:
+            indices = self.where.evaluate(columns, indices, probe)
+
+        # 뒤쪽 정렬 키부터 안정 정렬을 반복해서 여러 키 정렬
+        for field, descending in reversed(self.order):
+            values = columns.lowered_titles() if field == 'title' else getattr(columns, FIELDS[field][0])
+            indices.sort(key=values.__getitem__, reverse=descending)
+
+        if self.limit is not None:
+            indices = indices[:self.limit]
+        return indices
+
+def compile_query(text, conditions=()):
+    """필터/정렬 표현식 컴파일
+
+    Args:
+        text (str): 표현식 (빈 문자열이면 조건 없이 스냅샷 순서)
+        conditions (tuple): 표현식 조건과 and로 묶을 추가 조건 표현식들
+
+    Raises:
+        QueryError: 문법 오류
+    """
+    where, order, limit = _Parser(text).parse()
+    terms = [_Parser(condition).parse_or() for condition in conditions]
+    if where is not None:
+        terms.append(where)
+    if not terms:
+        where = None
+    else:
+        where = terms[0] if len(terms) == 1 else ('and', terms)
+    return CompiledQuery(text, _compile(where) if where is not None else None, order, limit)
+
+def compile_filters(filters):
+    """기존 필터 설정(travelOnly 등)과 query 표현식을 하나의 조회로 컴파일"""
+    conditions = []
+    if filters.get('longVideoOnly'):
+        conditions.append('duration >= 120')
+    if filters.get('travelOnly'):
+        conditions.append('travel')
+    if filters.get('subtitleOnly'):
+        conditions.append('has_subtitles')
+    return compile_query(filters.get('query') or '', conditions)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+YouTube Data API 키 풀
+키마다 오늘 사용한 할당량(quota unit)을 SQLite 파일에 기록해 여러 프로세스가 공유하고,
+키가 바닥나기 전에 남은 할당량이 가장 많은 키로 넘어갑니다.
+- 할당량은 태평양 시간 자정에 초기화되므로 날짜도 태평양 시간 기준
+- 키 원문은 저장하지 않고 해시 앞부분만 기록
+- 날짜/키/메서드별 호출 수와 사용량을 장부(quota_ledger)에 남기고 QUOTA_LEDGER_DAYS일 동안 보관
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+
+from youtube_log import record_quota
+
+DEFAULT_QUOTA_PATH = os.getenv(
+    'YOUTUBE_QUOTA_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'youtube_quota.sqlite3')
+)
+
+# 프로젝트 기본 일일 할당량
+DEFAULT_DAILY_QUOTA = int(os.getenv('YOUTUBE_DAILY_QUOTA', '10000'))
+
+# 메서드별 사용 장부 보관 일수
+QUOTA_LEDGER_DAYS = int(os.getenv('QUOTA_LEDGER_DAYS', '30'))
+
+# Data API 메서드별 할당량 비용
+QUOTA_COSTS = {
+    'search.list': 100,
+    'videos.list': 1,
+    'channels.list': 1,
+    'playlistItems.list': 1,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_usage (
+    day TEXT NOT NULL,
+    key_id TEXT NOT NULL,
+    units INTEGER NOT NULL DEFAULT 0,
+    exhausted INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (day, key_id)
+);
+CREATE TABLE IF NOT EXISTS quota_ledger (
+    day TEXT NOT NULL,
+    key_id TEXT NOT NULL,
+    method TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    units INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, key_id, method)
+);
+"""
+
+try:
+    from zoneinfo import ZoneInfo
+    _PACIFIC = ZoneInfo('America/Los_Angeles')
+except Exception:
+    # tzdata가 없는 환경(Windows 등)에서는 PST 고정 오프셋 사용
+    _PACIFIC = timezone(timedelta(hours=-8))
+
+class QuotaExhaustedError(Exception):
+    """모든 키의 오늘 할당량이 소진됨"""
+
+def quota_day(days_ago=0):
+    """할당량 기준 날짜 (태평양 시간)"""
+    return (datetime.now(_PACIFIC) - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+
+def key_id(api_key):
+    """기록용 키 식별자 (키 원문 대신 해시 앞 12자리)"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+
+class ApiKeyPool:
+    """할당량을 고려해 키를 골라 주는 키 풀 (스레드/프로세스 안전)"""
+
+    def __init__(self, keys, daily_quota=DEFAULT_DAILY_QUOTA, path=None):
+        """
+        Args:
+            keys (list): API 키 목록
+            daily_quota (int): 키 하나의 일일 할당량
+            path (str): 사용량 기록 SQLite 파일 경로
+        """
+        self.keys = list(keys)
+        self.daily_quota = daily_quota
+        self.path = path or DEFAULT_QUOTA_PATH
+        self._ids = {key: key_id(key) for key in self.keys}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        # 보관 기간이 지난 장부 정리
+        self._conn.execute("DELETE FROM quota_ledger WHERE day < ?", (quota_day(QUOTA_LEDGER_DAYS),))
+
+    def _usage(self, day):
+        rows = self._conn.execute(
+            "SELECT key_id, units, exhausted FROM quota_usage WHERE day = ?", (day,)
+        ).fetchall()
+        return {row[0]: (row[1], bool(row[2])) for row in rows}
+
+    def acquire(self, cost=1, method='unknown'):
+        """cost만큼 할당량이 남은 키 중 가장 여유 있는 키를 골라 사용량을 미리 기록하고 반환
+
+        동시에 들어온 요청은 사용량이 바로 반영되므로 자연스럽게 여러 키로 분산됩니다.
+        method(예: 'search.list')별 사용량은 장부와 현재 요청의 할당량 집계에도 기록됩니다.
+
+        Raises:
+            QuotaExhaustedError: cost를 감당할 수 있는 키가 없을 때
+        """
+        day = quota_day()
+        with self._lock:
+            # 다른 프로세스와 동시에 고르지 않도록 쓰기 잠금을 잡고 선택 + 기록
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                usage = self._usage(day)
+                best_key, best_remaining = None, None
+                for key in self.keys:
+                    units, exhausted = usage.get(self._ids[key], (0, False))
+                    remaining = self.daily_quota - units
+                    if exhausted or remaining < cost:
+                        continue
+                    if best_remaining is None or remaining > best_remaining:
+                        best_key, best_remaining = key, remaining
+
+                if best_key is None:
+                    self._conn.execute("ROLLBACK")
+                    raise QuotaExhaustedError("모든 API 키의 할당량(quota)이 소진되었습니다.")
+
+                self._conn.execute(
+                    "INSERT INTO quota_usage (day, key_id, units, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(day, key_id) DO UPDATE SET units = units + excluded.units, "
+                    "updated_at = excluded.updated_at",
+                    (day, self._ids[best_key], cost, time.time())
+                )
+                self._conn.execute(
+                    "INSERT INTO quota_ledger (day, key_id, method, calls, units) VALUES (?, ?, ?, 1, ?) "
+                    "ON CONFLICT(day, key_id, method) DO UPDATE SET calls = calls + 1, "
+                    "units = units + excluded.units",
+                    (day, self._ids[best_key], method, cost)
+                )
+                self._conn.execute("COMMIT")
+            except QuotaExhaustedError:
+                raise
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        record_quota(method, cost)
+        return best_key
+
+    def mark_exhausted(self, api_key):
+        """API가 할당량 초과를 응답한 키를 오늘 하루 제외"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO quota_usage (day, key_id, units, exhausted, updated_at) VALUES (?, ?, 0, 1, ?) "
+                "ON CONFLICT(day, key_id) DO UPDATE SET exhausted = 1, updated_at = excluded.updated_at",
+                (quota_day(), self._ids[api_key], time.time())
+            )
+
+    def usage(self):
+        """키별 오늘 사용량 [{key_id, units, remaining, exhausted}]"""
+        day = quota_day()
+        with self._lock:
+            usage = self._usage(day)
+        result = []
+        for key in self.keys:
+            units, exhausted = usage.get(self._ids[key], (0, False))
+            result.append({
+                "key_id": self._ids[key],
+                "units": units,
+                "remaining": 0 if exhausted else max(0, self.daily_quota - units),
+                "exhausted": exhausted
+            })
+        return {"day": day, "daily_quota": self.daily_quota, "keys": result}
+
+    def ledger(self, days=7):
+        """최근 days일의 날짜/키/메서드별 호출 수와 사용량 (최근 날짜부터)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, key_id, method, calls, units FROM quota_ledger WHERE day >= ? "
+                "ORDER BY day DESC, units DESC",
+                (quota_day(days - 1),)
+            ).fetchall()
+        return [
+            {"day": day, "key_id": key, "method": method, "calls": calls, "units": units}
+            for day, key, method, calls, units in rows
+        ]
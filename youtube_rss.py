@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+채널 RSS(Atom) 피드로 새 업로드 감지
+채널의 공개 피드(feeds/videos.xml?channel_id=...)를 읽어 채널마다 저장해 둔 워터마크와 비교하고,
+새로 올라온 영상 ID만 돌려주고 new_uploads 큐에 쌓습니다. Data API 할당량을 쓰지 않습니다.
+- 피드에는 최신 영상 15개 정도만 들어 있으므로 워터마크는 마지막으로 본 피드의 영상 ID 목록과
+  가장 최근 게시 시각으로 유지
+- ETag/Last-Modified로 조건부 요청을 보내 바뀌지 않은 피드는 본문을 받지 않음
+- 처음 확인하는 채널은 기준점만 저장하고 새 영상으로 보고하지 않음
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+from youtube_log import logger
+
+# 피드 주소 (테스트용 로컬 서버 등으로 바꿀 수 있음)
+RSS_FEED_BASE_URL = os.getenv('YOUTUBE_RSS_FEED_URL', 'https://www.youtube.com/feeds/videos.xml')
+
+DEFAULT_RSS_STATE_PATH = os.getenv(
+    'YOUTUBE_RSS_STATE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'youtube_rss.sqlite3')
+)
+
+# 여러 채널을 동시에 확인할 때의 동시 요청 수
+RSS_POLL_WORKERS = int(os.getenv('YOUTUBE_RSS_POLL_WORKERS', '8'))
+
+_NAMESPACES = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'yt': 'http://www.youtube.com/xml/schemas/2015',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed_watermarks (
+    channel_id TEXT PRIMARY KEY,
+    seen_ids TEXT NOT NULL,
+    last_published TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS new_uploads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel_id TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    published TEXT NOT NULL,
+    detected_at REAL NOT NULL,
+    UNIQUE (channel_id, video_id)
+);
+"""
+
+def feed_url(channel_id, base_url=None):
+    """채널 피드 주소"""
+    return f"{base_url or RSS_FEED_BASE_URL}?{urllib.parse.urlencode({'channel_id': channel_id})}"
+
+def parse_feed(content):
+    """Atom 피드에서 영상 목록 추출 (피드 순서 = 최신순)
+
+    Returns:
+        list: [{"video_id", "title", "published"}, ...]
+    """
+    root = ET.fromstring(content)
+    entries = []
+    for entry in root.findall('atom:entry', _NAMESPACES):
+        video_id = entry.findtext('yt:videoId', default='', namespaces=_NAMESPACES)
+        if not video_id:
+            continue
+        entries.append({
+            "video_id": video_id,
+            "title": entry.findtext('atom:title', default='', namespaces=_NAMESPACES),
+            "published": entry.findtext('atom:published', default='', namespaces=_NAMESPACES),
+        })
+    return entries
+
+def fetch_feed(channel_id, etag=None, last_modified=None, base_url=None, timeout=10):
+    """피드 조회 (조건부 요청)
+
+    Returns:
+        tuple: (본문 bytes 또는 바뀌지 않았으면(304) None, etag, last_modified)
+    """
+    request = urllib.request.Request(feed_url(channel_id, base_url))
+    if etag:
+        request.add_header('If-None-Match', etag)
+    if last_modified:
+        request.add_header('If-Modified-Since', last_modified)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read(), response.headers.get('ETag'), response.headers.get('Last-Modified')
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, etag, last_modified
+        raise
+
+class UploadWatcher:
+    """채널별 워터마크를 SQLite에 저장하며 새 업로드를 감지 (스레드 안전)"""
+
+    def __init__(self, path=None, base_url=None):
+        self.path = path or DEFAULT_RSS_STATE_PATH
+        self.base_url = base_url
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _load(self, channel_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT seen_ids, last_published, etag, last_modified FROM feed_watermarks WHERE channel_id = ?",
+                (channel_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"seen_ids": json.loads(row[0]), "last_published": row[1], "etag": row[2], "last_modified": row[3]}
+
+    def check(self, channel_id):
+        """채널 피드를 확인해서 워터마크 이후 새 영상을 반환하고 큐에 추가
+
+        Returns:
+            dict: {"channel_id", "new_videos": [{"video_id", "title", "published"}], "baseline", "not_modified"}
+        """
+        state = self._load(channel_id)
+        content, etag, last_modified = fetch_feed(
+            channel_id,
+            etag=state and state["etag"],
+            last_modified=state and state["last_modified"],
+            base_url=self.base_url
+        )
+
+        result = {"channel_id": channel_id, "new_videos": [], "baseline": state is None, "not_modified": False}
+        if content is None:
+            result["not_modified"] = True
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE feed_watermarks SET checked_at = ? WHERE channel_id = ?", (time.time(), channel_id)
+                )
+            return result
+
+        entries = parse_feed(content)
+        if state is not None:
+            seen = set(state["seen_ids"])
+            # 피드에서 밀려났다가 다시 보이는 오래된 영상은 제외 (워터마크보다 늦게 게시된 것만)
+            result["new_videos"] = [
+                entry for entry in entries
+                if entry["video_id"] not in seen and entry["published"] >= state["last_published"]
+            ]
+
+        last_published = max(
+            [entry["published"] for entry in entries] + ([state["last_published"]] if state else [''])
+        )
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO feed_watermarks "
+                    "(channel_id, seen_ids, last_published, etag, last_modified, checked_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (channel_id, json.dumps([entry["video_id"] for entry in entries]),
+                     last_published, etag, last_modified, now)
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO new_uploads (channel_id, video_id, title, published, detected_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(channel_id, entry["video_id"], entry["title"], entry["published"], now)
+                     for entry in result["new_videos"]]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if result["new_videos"]:
+            logger.info(f"{len(result['new_videos'])} new uploads on {channel_id}")
+        return result
+
+    def check_many(self, channel_ids, max_workers=None):
+        """여러 채널을 동시에 확인 (입력 순서대로 결과, 채널별 오류는 {"channel_id", "error"})"""
+        def check_one(channel_id):
+            try:
+                return self.check(channel_id)
+            except Exception as e:
+                logger.warning(f"Feed check failed for {channel_id}: {e}")
+                return {"channel_id": channel_id, "error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=max_workers or RSS_POLL_WORKERS) as executor:
+            return list(executor.map(check_one, channel_ids))
+
+    def pop_new_uploads(self, limit=100):
+        """큐에 쌓인 새 업로드를 감지 순서대로 꺼냄 (꺼낸 항목은 큐에서 삭제)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, channel_id, video_id, title, published, detected_at FROM new_uploads "
+                    "ORDER BY id LIMIT ?", (limit,)
+                ).fetchall()
+                self._conn.executemany("DELETE FROM new_uploads WHERE id = ?", [(row[0],) for row in rows])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [
+            {"channel_id": row[1], "video_id": row[2], "title": row[3], "published": row[4], "detected_at": row[5]}
+            for row in rows
+        ]
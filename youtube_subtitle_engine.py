@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+통합 자막 추출 엔진
+자막 추출 스크립트들(youtube-transcript-api, pytube, yt-dlp)을 한 프로세스 안의 백엔드(plugin)로 묶고,
+우선 백엔드가 SUBTITLE_HEDGE_DELAY(초) 안에 답하지 않으면 다음 백엔드를 함께(hedge) 시작해서
+가장 먼저 돌아온 유효한 자막을 하나의 결과 형식으로 돌려줍니다.
+- 백엔드가 실패하면 기다리지 않고 바로 다음 백엔드 시작
+- 전체 대기 시간은 SUBTITLE_ENGINE_TIMEOUT(초)로 제한 (최악의 경우 = 백엔드 시간의 합이 아님)
+- 백엔드 순서는 SUBTITLE_BACKENDS 환경변수 또는 --backends 옵션 (쉼표로 구분)
+- 같은 곳에서 자막 목록을 받아 트랙을 고르는 백엔드(transcript_api, real)는 요청마다 앞의 하나만 실행
+  (뒤의 백엔드는 같은 list()/fetch를 되풀이할 뿐이므로 "skipped"로 남김)
+- real은 transcript_api와 같은 youtube-transcript-api 경로의 별칭이라 기본 순서에는 넣지 않음
+  (--backends=real로 youtube_subtitle_real.py 경로만 골라 쓸 때 사용)
+- subtitle 형식은 --format 옵션 (text_with_timestamps 기본, srt, vtt, json - youtube_subtitle_transcript 참고)
+
+Usage: python youtube_subtitle_engine.py <YouTube_URL_또는_Video_ID> [--backends=a,b] [--hedge-delay=초] [--format=srt]
+
+결과 형식:
+  {"success": true, "video_id", "subtitle", "format", "language", "language_code", "is_generated",
+   "segments_count", "method", "backend", "elapsed_ms", "attempts": [...]}
+  {"success": false, "error", "message", "video_id", "attempts": [...]}
+attempts에는 시작한 백엔드마다 {"backend", "status": ok|failed|pending, "error", "elapsed_ms"}가,
+건너뛴 백엔드마다 {"backend", "status": "skipped", "shared_with"}가 들어갑니다.
+"""
+
+import os
+import re
+import sys
+import io
+import json
+import time
+import queue
+import threading
+
+from youtube_log import logger, configure_logging
+from youtube_subtitle_transcript import TRANSCRIPT_FORMATS, DEFAULT_TRANSCRIPT_FORMAT
+
+DEFAULT_SUBTITLE_BACKENDS = os.getenv('SUBTITLE_BACKENDS', 'transcript_api,ytdlp,pytube')
+SUBTITLE_HEDGE_DELAY = float(os.getenv('SUBTITLE_HEDGE_DELAY', '3'))
+SUBTITLE_ENGINE_TIMEOUT = float(os.getenv('SUBTITLE_ENGINE_TIMEOUT', '60'))
+
+# 이름 -> 백엔드 함수 (video_id와 subtitle 형식을 받아 자막 dict를 반환하고, 자막이 없으면 SubtitleBackendError)
+SUBTITLE_BACKENDS = {}
+
+# 이름 -> 트랙 출처 (출처가 같은 백엔드는 같은 자막 목록/본문을 받으므로 요청마다 하나만 실행)
+SUBTITLE_BACKEND_SOURCES = {}
+
+class SubtitleBackendError(Exception):
+    """백엔드가 자막을 가져오지 못함 (code는 결과의 "error" 값)"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+def register_backend(name, source=None):
+    """백엔드 등록 데코레이터 (source: 트랙 출처, 기본은 백엔드 이름)"""
+    def decorator(func):
+        SUBTITLE_BACKENDS[name] = func
+        SUBTITLE_BACKEND_SOURCES[name] = source or name
+        return func
+    return decorator
+
+def extract_video_id(url):
+    """YouTube URL에서 video ID 추출"""
+    if re.match(r'^[a-zA-Z0-9_-]{11}$', url):
+        return url
+
+    patterns = [
+        r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/|youtube\.com/v/|youtube\.com/shorts/)([a-zA-Z0-9_-]{11})',
+        r'youtube\.com/.*[?&]v=([a-zA-Z0-9_-]{11})',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    return None
+
+def _script_result(result, method, subtitle_format):
+    """기존 스크립트 결과({"success", "subtitle", ...})를 엔진 결과 형식으로 변환"""
+    if not result.get('success') or not (result.get('subtitle') or '').strip():
+        raise SubtitleBackendError(
+            result.get('error') or 'NO_SUBTITLES_FOUND',
+            result.get('message') or '자막을 찾을 수 없습니다.'
+        )
+    return {
+        "subtitle": result['subtitle'],
+        "format": result.get('format') or subtitle_format,
+        "language": result.get('language'),
+        "language_code": result.get('language_code'),
+        "is_generated": result.get('is_generated'),
+        "segments_count": result.get('segments_count'),
+        "method": result.get('method') or method,
+    }
+
+@register_backend('transcript_api', source='youtube-transcript-api')
+def transcript_api_backend(video_id, subtitle_format):
+    from youtube_subtitle_transcript_api import extract_subtitle
+    return _script_result(
+        extract_subtitle(video_id, subtitle_format=subtitle_format), 'youtube-transcript-api', subtitle_format
+    )
+
+@register_backend('real', source='youtube-transcript-api')
+def real_backend(video_id, subtitle_format):
+    from youtube_subtitle_real import get_real_subtitle
+    result = get_real_subtitle(video_id, subtitle_format=subtitle_format)
+    if 'error' in result:
+        raise SubtitleBackendError('NO_SUBTITLES_FOUND', result['error'])
+    result = dict(result, success=True, method='youtube-transcript-api-list')
+    return _script_result(result, 'youtube-transcript-api-list', subtitle_format)
+
+@register_backend('ytdlp')
+def ytdlp_backend(video_id, subtitle_format):
+    from youtube_subtitle_ytdlp import extract_subtitle_with_ytdlp
+    return _script_result(extract_subtitle_with_ytdlp(video_id, subtitle_format=subtitle_format), 'yt-dlp', subtitle_format)
+
+@register_backend('pytube')
+def pytube_backend(video_id, subtitle_format):
+    from youtube_subtitle_pytube import extract_subtitle_with_pytube
+    return _script_result(extract_subtitle_with_pytube(video_id, subtitle_format=subtitle_format), 'pytube', subtitle_format)
+
+def _run_backend(name, video_id, subtitle_format, results):
+    """백엔드 하나를 실행하고 (name, 결과 또는 예외, 걸린 시간)을 results 큐에 넣음"""
+    started = time.perf_counter()
+    try:
+        outcome = SUBTITLE_BACKENDS[name](video_id, subtitle_format)
+    except ImportError as e:
+        outcome = SubtitleBackendError('BACKEND_UNAVAILABLE', f'{name} 백엔드를 쓸 수 없습니다: {e}')
+    except Exception as e:
+        outcome = e
+    results.put((name, outcome, time.perf_counter() - started))
+
+def extract_subtitle(video_id_or_url, backends=None, hedge_delay=None, timeout=None,
+                     subtitle_format=DEFAULT_TRANSCRIPT_FORMAT):
+    """백엔드를 hedge 방식으로 실행해서 가장 먼저 성공한 자막을 반환
+
+    Args:
+        video_id_or_url: 영상 ID 또는 URL
+        backends: 시도할 백엔드 이름 목록 (우선순위 순, 기본 SUBTITLE_BACKENDS 환경변수)
+        hedge_delay: 앞 백엔드가 답하지 않을 때 다음 백엔드를 시작하기까지 기다리는 시간(초)
+        timeout: 전체 대기 시간(초)
+        subtitle_format: 결과 subtitle 형식 (TRANSCRIPT_FORMATS의 키)
+
+    Returns:
+        dict: 모듈 docstring의 결과 형식
+    """
+    video_id = extract_video_id(video_id_or_url)
+    if not video_id:
+        return {
+            "success": False,
+            "error": "INVALID_VIDEO_ID",
+            "message": "YouTube URL 또는 Video ID가 올바르지 않습니다.",
+            "video_id": video_id_or_url,
+            "attempts": []
+        }
+
+    if backends is None:
+        backends = [name.strip() for name in DEFAULT_SUBTITLE_BACKENDS.split(',') if name.strip()]
+    unknown = [name for name in backends if name not in SUBTITLE_BACKENDS]
+    if unknown or not backends:
+        return {
+            "success": False,
+            "error": "INVALID_BACKEND",
+            "message": f"알 수 없는 백엔드: {', '.join(unknown) or '(없음)'} (사용 가능: {', '.join(SUBTITLE_BACKENDS)})",
+            "video_id": video_id,
+            "attempts": []
+        }
+    if subtitle_format not in TRANSCRIPT_FORMATS:
+        return {
+            "success": False,
+            "error": "INVALID_FORMAT",
+            "message": f"알 수 없는 자막 형식: {subtitle_format} (사용 가능: {', '.join(TRANSCRIPT_FORMATS)})",
+            "video_id": video_id,
+            "attempts": []
+        }
+    hedge_delay = SUBTITLE_HEDGE_DELAY if hedge_delay is None else hedge_delay
+    timeout = SUBTITLE_ENGINE_TIMEOUT if timeout is None else timeout
+
+    started = time.perf_counter()
+    deadline = started + timeout
+    results = queue.Queue()
+    attempts = {}
+    waiting = []
+    running = set()
+
+    # 출처마다 앞의 백엔드 하나만 실행 (나머지는 같은 트랙을 다시 고르고 받게 됨)
+    source_backends = {}
+    for name in backends:
+        source = SUBTITLE_BACKEND_SOURCES.get(name, name)
+        if source in source_backends:
+            if name not in attempts and name != source_backends[source]:
+                attempts[name] = {"backend": name, "status": "skipped", "shared_with": source_backends[source]}
+            continue
+        source_backends[source] = name
+        waiting.append(name)
+
+    def launch():
+        name = waiting.pop(0)
+        logger.info(f"Subtitle backend {name} started for {video_id}")
+        attempts[name] = {"backend": name, "status": "pending"}
+        running.add(name)
+        # 느린 백엔드가 끝날 때까지 프로세스 종료를 막지 않도록 daemon 스레드
+        threading.Thread(target=_run_backend, args=(name, video_id, subtitle_format, results), daemon=True).start()
+
+    def attempt_list():
+        return [attempts[name] for name in backends if name in attempts]
+
+    launch()
+    while running:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        wait = deadline - now
+        if waiting:
+            wait = min(wait, hedge_delay)
+        try:
+            name, outcome, seconds = results.get(timeout=wait)
+        except queue.Empty:
+            # 답이 늦으면 다음 백엔드를 함께 시작
+            if waiting:
+                logger.info(f"No answer within {hedge_delay}s, hedging with {waiting[0]}")
+                launch()
+            continue
+
+        running.discard(name)
+        attempts[name]["elapsed_ms"] = round(seconds * 1000, 1)
+        if isinstance(outcome, dict):
+            attempts[name]["status"] = "ok"
+            logger.info(f"Subtitle backend {name} succeeded in {seconds:.2f}s")
+            return dict(
+                {"success": True, "video_id": video_id},
+                **outcome,
+                backend=name,
+                elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+                attempts=attempt_list()
+            )
+
+        attempts[name]["status"] = "failed"
+        attempts[name]["error"] = getattr(outcome, 'code', 'BACKEND_ERROR')
+        attempts[name]["message"] = str(outcome)
+        logger.warning(f"Subtitle backend {name} failed: {outcome}")
+        if waiting and not running:
+            launch()
+
+    timed_out = bool(running)
+    return {
+        "success": False,
+        "error": "TIMEOUT" if timed_out else "ALL_BACKENDS_FAILED",
+        "message": (
+            f"{timeout}초 안에 자막을 가져오지 못했습니다." if timed_out
+            else "모든 자막 추출 백엔드가 실패했습니다."
+        ),
+        "video_id": video_id,
+        "attempts": attempt_list()
+    }
+
+def main():
+    """CLI 실행 함수 (stdout에는 결과 JSON만 출력)"""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(
+        arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg
+    )
+    if len(args) != 1:
+        print("사용법: python youtube_subtitle_engine.py <YouTube_URL_또는_Video_ID> [--backends=a,b] [--hedge-delay=초] [--format=srt]",
+              file=sys.stderr)
+        sys.exit(1)
+
+    # 백엔드 스크립트들의 진행 메시지(print)가 결과 JSON과 섞이지 않도록 stdout은 stderr로 돌리고
+    # 결과만 원래 stdout에 씀
+    output = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    sys.stdout = sys.stderr
+    configure_logging(options.get('log-level'))
+
+    backends = options.get('backends')
+    result = extract_subtitle(
+        args[0],
+        backends=[name.strip() for name in backends.split(',') if name.strip()] if backends else None,
+        hedge_delay=float(options['hedge-delay']) if 'hedge-delay' in options else None,
+        subtitle_format=options.get('format', DEFAULT_TRANSCRIPT_FORMAT)
+    )
+
+    output.write(json.dumps(result, ensure_ascii=False, indent=2) + '\n')
+    output.flush()
+
+if __name__ == "__main__":
+    main()
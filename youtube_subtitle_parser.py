@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebVTT/SRT 자막 파서 (스트리밍)
+파일 객체(텍스트/바이너리), 문자열, 또는 바이트 조각 iterator를 받아 큐(cue)를 하나씩 생성합니다.
+파일 전체를 줄 목록으로 만들지 않고 조각 단위로 읽으며, 패턴은 모듈 로드 시 한 번만 컴파일합니다.
+- VTT 헤더(WEBVTT, Kind:, Language:)와 NOTE/STYLE/REGION 블록은 건너뜀
+- 타이밍 줄 뒤의 큐 설정(align:start position:0% 등)은 settings로 보관
+- SRT 번호와 VTT 큐 ID는 identifier로, SRT의 쉼표 소수점(00:00:01,000)도 처리
+- 큐 본문은 태그(<00:00:08.000><c> 등)를 그대로 둔 원문 - 글자만 필요하면 cue_text()
+- dedupe_rolling_cues()는 자동 자막의 반복 큐를 합쳐 세그먼트로 만들고 단어 시각을 보관
+  (수동 자막은 합치지 않음 - iter_segments(source, is_generated))
+세그먼트는 youtube_subtitle_transcript.Transcript.from_segments()로 저장/출력합니다.
+youtube_subtitle_ytdlp.py, youtube_subtitle_pytube.py, aws-lambda/lambda_function.py가 함께 씁니다.
+"""
+
+import re
+import codecs
+from html import unescape
+from functools import partial
+from collections import namedtuple, deque
+
+# 파일 객체에서 한 번에 읽는 크기
+READ_CHUNK_SIZE = 64 * 1024
+
+# start/end는 밀리초 정수
+Cue = namedtuple('Cue', ['identifier', 'start', 'end', 'settings', 'text'])
+
+# 반복을 없앤 자막 한 줄 (text는 태그/엔티티를 없앤 글자, words는 단어 시각)
+Segment = namedtuple('Segment', ['start', 'end', 'text', 'words'])
+
+# 최근 몇 개의 세그먼트와 비교해서 반복을 찾을지 (자동 자막은 한 줄이 최대 두 큐 더 남음)
+ROLLING_WINDOW = 2
+# 반복으로 보는 최대 간격 (앞 세그먼트 끝에서 이 시간(ms) 안에 시작해야 함 - 자동 자막은 0~10ms)
+ROLLING_MAX_GAP_MS = 10
+
+# 타이밍 줄은 두 시각 문자열과 큐 설정으로만 나누고, 시각은 _timestamp_ms에서 검사/변환
+_TIMING_PATTERN = re.compile(r'\s*(\S+)\s+-->\s+(\S+)(?:[ \t]+(.*))?')
+_TIMESTAMP_PATTERN = re.compile(r'(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{1,3})$')
+_TAG_PATTERN = re.compile(r'<[^>]*>')
+# 자동 자막의 단어 시각 태그 <00:00:08.000>
+_WORD_TIMING_PATTERN = re.compile(r'<((?:\d+:)?\d{2}:\d{2}[.,]\d{3})>')
+
+# 밀리초 세 자리 문자열 -> 정수 ('000' ~ '999'), 두 자리 시/분/초 -> 정수 ('00' ~ '99')
+_MILLIS = {f'{i:03d}': i for i in range(1000)}
+_TWO_DIGITS = {f'{i:02d}': i for i in range(100)}
+
+# 자막에 흔한 엔티티는 str.replace로 바꾸고 나머지가 있을 때만 html.unescape (&amp;는 마지막)
+_COMMON_ENTITIES = (
+    ('&gt;', '>'), ('&lt;', '<'), ('&nbsp;', '\xa0'), ('&quot;', '"'), ('&#39;', "'"),
+    ('&lrm;', '\u200e'), ('&rlm;', '\u200f'),
+)
+
+# 큐가 아닌 블록 (빈 줄이 나올 때까지 건너뜀)
+_SKIP_BLOCK_PREFIXES = ('WEBVTT', 'NOTE', 'STYLE', 'REGION')
+
+def _timestamp_ms(timestamp):
+    """시각 문자열(HH:MM:SS.mmm, MM:SS.mmm, SRT의 HH:MM:SS,mmm)을 밀리초로 변환 (형식이 틀리면 None)"""
+    # 대부분의 자막은 HH:MM:SS.mmm 고정 폭이므로 int() 없이 표에서 바로 찾음
+    if len(timestamp) == 12 and timestamp[2] == ':' and timestamp[5] == ':' and timestamp[8] in '.,':
+        hours = _TWO_DIGITS.get(timestamp[0:2])
+        minutes = _TWO_DIGITS.get(timestamp[3:5])
+        seconds = _TWO_DIGITS.get(timestamp[6:8])
+        millis = _MILLIS.get(timestamp[9:12])
+        if hours is not None and minutes is not None and seconds is not None and millis is not None:
+            return (hours * 3600 + minutes * 60 + seconds) * 1000 + millis
+
+    match = _TIMESTAMP_PATTERN.match(timestamp)
+    if match is None:
+        return None
+    hours, minutes, seconds, fraction = match.groups()
+    return (
+        (int(hours) * 3600 if hours else 0) + int(minutes) * 60 + int(seconds)
+    ) * 1000 + int(fraction.ljust(3, '0'))
+
+def _iter_chunks(source):
+    """source를 문자열/바이트 조각 iterator로 변환"""
+    if isinstance(source, (str, bytes)):
+        yield source
+        return
+    read = getattr(source, 'read', None)
+    if read is None:
+        yield from source
+        return
+    while True:
+        chunk = read(READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+def iter_blocks(source):
+    """빈 줄로 구분된 블록을 순서대로 생성 (줄 끝 \r\n은 \n으로, UTF-8 BOM 제거)
+
+    큐 하나가 블록 하나이므로 줄마다 상태를 확인하지 않고 조각을 블록 단위로 나눕니다.
+    조각 경계에 걸친 블록은 다음 조각과 이어 붙입니다.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+    pending = ''
+    first = True
+    for chunk in _iter_chunks(source):
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        elif first and chunk.startswith('\ufeff'):
+            chunk = chunk[1:]
+        if not chunk:
+            continue
+        first = False
+        if pending:
+            chunk = pending + chunk
+        if '\r' in chunk:
+            # 조각 끝에서 \r과 \n이 나뉘면 \r은 pending에 남아 다음 조각의 \n과 합쳐짐
+            chunk = chunk.replace('\r\n', '\n')
+        blocks = chunk.split('\n\n')
+        pending = blocks.pop()
+        yield from blocks
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending.replace('\r\n', '\n').rstrip('\r\n')
+
+def iter_cues(source):
+    """WebVTT/SRT 자막에서 큐를 순서대로 생성
+
+    Args:
+        source: 파일 객체(텍스트/바이너리), str/bytes, 또는 str/bytes 조각 iterator
+
+    Yields:
+        Cue: (identifier, start(ms), end(ms), settings, text)
+    """
+    timing_match = _TIMING_PATTERN.match
+    # Cue(...)는 파이썬 함수를 한 번 더 거치므로 tuple.__new__로 바로 생성
+    new_cue = partial(tuple.__new__, Cue)
+    previous_end_text = previous_end = None
+
+    for block in iter_blocks(source):
+        # 빈 줄이 여러 개이거나 공백만 있는 줄로 시작하는 블록
+        if not block or block[0] in ' \t\n':
+            block = block.lstrip()
+            if not block:
+                continue
+        if block.startswith(_SKIP_BLOCK_PREFIXES):
+            continue
+
+        # 첫 줄이 타이밍이 아니면 SRT 번호 또는 VTT 큐 ID
+        timing, _, text = block.partition('\n')
+        identifier = None
+        if '-->' not in timing:
+            identifier = timing.strip()
+            timing, _, text = text.partition('\n')
+        if timing[12:17] == ' --> ' and timing[29:30] in ('', ' '):
+            # HH:MM:SS.mmm --> HH:MM:SS.mmm 고정 폭이면 정규식 없이 자름
+            start_text, end_text, settings = timing[:12], timing[17:29], timing[30:]
+        else:
+            match = timing_match(timing)
+            if match is None:
+                continue
+            start_text, end_text, settings = match.groups()
+
+        # 자막은 앞 큐의 끝 시각이 다음 큐의 시작 시각인 경우가 많아 변환 결과를 재사용
+        start = previous_end if start_text == previous_end_text else _timestamp_ms(start_text)
+        end = _timestamp_ms(end_text)
+        if start is None or end is None:
+            continue
+        previous_end_text, previous_end = end_text, end
+
+        # 공백만 있는 줄도 본문 (YouTube 자동 자막은 ' ' 줄을 넣음) - 완전히 빈 줄에서 큐가 끝남
+        yield new_cue((identifier, start, end, settings or '', text))
+
+def _unescape(text):
+    """HTML 엔티티를 글자로 변환"""
+    for entity, char in _COMMON_ENTITIES:
+        if entity in text:
+            text = text.replace(entity, char)
+    if '&' in text:
+        if text.count('&') == text.count('&amp;'):
+            return text.replace('&amp;', '&')
+        return unescape(text)
+    return text
+
+def cue_text(text):
+    """큐 본문에서 태그와 HTML 엔티티를 없애고 줄바꿈/연속 공백을 한 칸으로 합친 글자"""
+    if '<' in text:
+        text = _TAG_PATTERN.sub('', text)
+    if '&' in text:
+        text = _unescape(text)
+    return ' '.join(text.split())
+
+def _line_words(line, start):
+    """인라인 시각 태그가 있는 줄을 (글자, 단어 시각) 으로 변환
+
+    "새로운<00:00:08.000><c> 나와</c>" -> ("새로운 나와", ((0, 0), (4, 8000 - start)))
+    단어 시각은 (글자 위치, start부터의 ms) 쌍이고 첫 단어는 항상 (0, 0)입니다.
+    """
+    parts = _WORD_TIMING_PATTERN.split(line)
+    text = ''
+    words = []
+    offset = 0
+    # parts = [첫 단어, 시각, 단어, 시각, 단어, ...]
+    for index in range(0, len(parts), 2):
+        if index:
+            word_start = _timestamp_ms(parts[index - 1])
+            offset = word_start - start if word_start is not None else offset
+        chunk = parts[index]
+        if '<' in chunk:
+            chunk = _TAG_PATTERN.sub('', chunk)
+        if '&' in chunk:
+            chunk = _unescape(chunk)
+        chunk = ' '.join(chunk.split())
+        if not chunk:
+            continue
+        if text:
+            text += ' '
+        words.append((len(text), max(offset, 0)))
+        text += chunk
+    return text, tuple(words)
+
+def _find_repeat(recent, line, start):
+    """line이 최근 세그먼트의 반복이면 그 항목 ([글자, 끝 ms]), 아니면 None
+
+    같은 글자라도 앞 세그먼트와 시간이 겹치거나 바로 이어질 때만 반복으로 봅니다.
+    """
+    for entry in recent:
+        if entry[0] == line and start <= entry[1] + ROLLING_MAX_GAP_MS:
+            return entry
+    return None
+
+def dedupe_rolling_cues(cues, window=ROLLING_WINDOW):
+    """자동 자막의 반복(rolling) 큐를 겹치지 않는 세그먼트로 합침
+
+    YouTube 자동 자막은 한 문장이 아래 줄(단어 시각 태그 포함)로 처음 나오고, 10ms짜리 유지 큐와
+    다음 큐의 위 줄로 두세 번 더 나옵니다. 큐의 줄마다 글자를 비교해서 최근에 내보낸 window개
+    세그먼트와 같고 시간이 이어지는 줄은 건너뛰고 새 줄만 세그먼트로 만듭니다. 반복이 없는
+    여러 줄 큐는 줄을 합친 그대로 세그먼트 하나가 됩니다.
+    수동 자막은 같은 말이 실제로 반복될 수 있으므로 자동 생성 자막에만 씁니다 (iter_segments).
+
+    Yields:
+        Segment: (start(ms), end(ms), text, words) - words는 (글자 위치, start부터의 ms) 쌍의 튜플
+                 (단어 시각 태그가 없던 줄은 빈 튜플)
+    """
+    recent = deque(maxlen=window)
+    for cue in cues:
+        start, end, text = cue[1], cue[2], cue[4]
+        if '<' not in text and '\n' not in text:
+            # 태그 없는 한 줄 큐 (유지 큐 등)
+            lines = ((cue_text(text), ()),)
+        elif _WORD_TIMING_PATTERN.search(text) is None:
+            cleaned = [line for line in map(cue_text, text.split('\n')) if line]
+            if not any(_find_repeat(recent, line, start) for line in cleaned):
+                # 반복이 아닌 여러 줄 큐는 한 세그먼트로 합침
+                cleaned = [' '.join(cleaned)]
+            lines = [(line, ()) for line in cleaned]
+        else:
+            lines = [
+                _line_words(raw, start) if '<' in raw and _WORD_TIMING_PATTERN.search(raw) else (cue_text(raw), ())
+                for raw in text.split('\n')
+            ]
+
+        for line, words in lines:
+            if not line:
+                continue
+            repeat = _find_repeat(recent, line, start)
+            if repeat is not None:
+                # 다음 큐의 반복도 이어진 것으로 보도록 끝 시각만 늘림
+                repeat[1] = max(repeat[1], end)
+                continue
+            recent.append([line, end])
+            yield Segment(start, end, line, words)
+
+def cue_segments(cues):
+    """큐마다 세그먼트 하나 (수동 자막용 - 반복을 합치지 않음, 글자가 없는 큐는 건너뜀)"""
+    for cue in cues:
+        line = cue_text(cue[4])
+        if line:
+            yield Segment(cue[1], cue[2], line, ())
+
+def iter_segments(source, is_generated=False):
+    """자막 원문(iter_cues의 source)을 세그먼트로 변환 (자동 생성 자막만 반복 큐를 합침)"""
+    cues = iter_cues(source)
+    return dedupe_rolling_cues(cues) if is_generated else cue_segments(cues)
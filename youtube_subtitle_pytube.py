@@ -3,6 +3,7 @@
 """
 YouTube 자막 추출 스크립트 - pytube 사용
 YouTube Data API v3의 captions.download 권한 제한을 우회하여 자막을 추출합니다.
+pytube가 만든 SRT는 Transcript(youtube_subtitle_transcript)로 바꿔 다른 추출기와 같은 형식으로 반환합니다.
 """
 
 import sys
@@ -10,13 +11,17 @@ import json
 import traceback
 from pytube import YouTube
 
-def extract_subtitle_with_pytube(video_id, language_codes=['ko', 'en', 'auto']):
+from youtube_subtitle_parser import iter_segments
+from youtube_subtitle_transcript import Transcript, DEFAULT_TRANSCRIPT_FORMAT
+
+def extract_subtitle_with_pytube(video_id, language_codes=['ko', 'en', 'auto'], subtitle_format=DEFAULT_TRANSCRIPT_FORMAT):
     """
     pytube를 사용하여 YouTube 자막을 추출합니다.
 
     Args:
         video_id (str): YouTube 영상 ID
         language_codes (list): 시도할 언어 코드 목록
+        subtitle_format (str): 결과 subtitle 형식 (youtube_subtitle_transcript.TRANSCRIPT_FORMATS)
 
     Returns:
         dict: 자막 추출 결과
@@ -60,18 +65,22 @@ def extract_subtitle_with_pytube(video_id, language_codes=['ko', 'en', 'auto']):
                 caption = yt.captions[target_lang]
                 print(f"[SUCCESS] {target_lang} 자막 추출 시도...")
 
-                # SRT 형식으로 자막 생성
+                # SRT 형식으로 자막 생성 후 Transcript로 변환 (자동 생성 자막만 반복 큐를 합침)
+                is_generated = target_lang.startswith('a.')
                 srt_content = caption.generate_srt_captions()
+                transcript = Transcript.from_segments(iter_segments(srt_content or '', is_generated))
 
-                if srt_content and len(srt_content.strip()) > 0:
+                if len(transcript) > 0:
                     print(f"[SUCCESS] pytube로 자막 추출 성공: {target_lang}")
 
                     return {
                         'success': True,
-                        'subtitle': srt_content,
+                        'subtitle': transcript.render(subtitle_format),
+                        'segments_count': len(transcript),
+                        'format': subtitle_format,
                         'language': caption.name or target_lang,
                         'language_code': target_lang,
-                        'is_generated': 'a.' in target_lang,  # 자동 생성 자막 여부
+                        'is_generated': is_generated,  # 자동 생성 자막 여부 ("a." 트랙)
                         'video_id': video_id,
                         'method': 'pytube',
                         'note': f'pytube 라이브러리로 자막 추출 성공 ({target_lang})'
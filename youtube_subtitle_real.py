@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 """
 Real YouTube subtitle extractor
+단독 실행(src/server.js, api/youtube/subtitle.js가 호출) 결과의 subtitle은 예전과 같은
+"[MM:SS] 텍스트" 형식이고, 자막 엔진의 real 백엔드는 요청한 형식(기본 "[M:SS] 텍스트")을 넘겨 씁니다.
 """
 
 import sys
@@ -10,9 +12,11 @@ import io
 import re
 from youtube_transcript_api import YouTubeTranscriptApi
 
-# UTF-8 인코딩 설정
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+from youtube_subtitle_tracks import select_track
+from youtube_subtitle_transcript import Transcript
+
+# 이 스크립트의 기본 subtitle 형식 (분을 두 자리로 채움 - 서버 fallback 출력과 같음)
+REAL_SUBTITLE_FORMAT = 'text_with_padded_timestamps'
 
 def extract_video_id(url):
     """YouTube URL에서 video ID 추출"""
@@ -30,8 +34,12 @@ def extract_video_id(url):
             return match.group(1)
     return None
 
-def get_real_subtitle(video_id_or_url):
-    """실제 YouTube 자막 추출"""
+def get_real_subtitle(video_id_or_url, languages=None, subtitle_format=REAL_SUBTITLE_FORMAT):
+    """실제 YouTube 자막 추출
+
+    languages: 선호 언어 목록 (youtube_subtitle_tracks 참고)
+    subtitle_format: subtitle 형식 (youtube_subtitle_transcript.TRANSCRIPT_FORMATS)
+    """
     try:
         # URL인 경우 video ID 추출
         if '/' in video_id_or_url or '?' in video_id_or_url:
@@ -48,47 +56,17 @@ def get_real_subtitle(video_id_or_url):
         # 자막 리스트 가져오기
         transcript_list = ytt_api.list(video_id)
 
-        # 한국어 우선, 없으면 영어, 마지막으로 자동 생성 자막
-        transcript = None
-
-        # 1순위: 한국어 자막
-        for t in transcript_list:
-            if t.language_code == 'ko':
-                transcript = t
-                break
-
-        # 2순위: 영어 자막
-        if not transcript:
-            for t in transcript_list:
-                if t.language_code in ['en', 'en-US', 'en-GB']:
-                    transcript = t
-                    break
-
-        # 3순위: 첫 번째로 찾은 자막
-        if not transcript:
-            for t in transcript_list:
-                transcript = t
-                break
+        # 선호 언어 순서(기본 한국어 > 영어 > 첫 번째 자막)로 트랙 선택
+        transcript = select_track(transcript_list, languages)
 
         if transcript:
-            # 자막 데이터 가져오기
-            transcript_data = transcript.fetch()
-
-            # 자막 텍스트 결합
-            subtitle_text = ""
-            for entry in transcript_data:
-                # 시간 정보와 함께 자막 추가
-                start_time = int(entry.start)
-                minutes = start_time // 60
-                seconds = start_time % 60
-                timestamp = f"[{minutes:02d}:{seconds:02d}]"
-
-                text = entry.text.strip()
-                if text:
-                    subtitle_text += f"{timestamp} {text}\n"
+            # 자막 데이터를 가져와서 Transcript로 변환 (빈 줄은 건너뜀)
+            transcript_data = Transcript.from_entries(transcript.fetch())
 
             return {
-                "subtitle": subtitle_text.strip(),
+                "subtitle": transcript_data.render(subtitle_format),
+                "segments_count": len(transcript_data),
+                "format": subtitle_format,
                 "language": transcript.language,
                 "language_code": transcript.language_code,
                 "is_generated": transcript.is_generated,
@@ -107,6 +85,10 @@ def get_real_subtitle(video_id_or_url):
             return {"error": f"자막 추출 중 오류: {error_msg}"}
 
 def main():
+    # UTF-8 인코딩 설정 (CLI로 실행할 때만 - 자막 엔진이 import해서 쓸 때는 건드리지 않음)
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
     if len(sys.argv) < 3:
         print(json.dumps({"error": "Usage: python youtube_subtitle_real.py subtitle <video_id_or_url>"}, ensure_ascii=False))
         return
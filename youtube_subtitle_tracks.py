@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+자막 트랙 선택
+자막 목록(list() 한 번으로 받은 트랙들)에서 선호 언어 순서대로 가장 알맞은 트랙 하나를 고릅니다.
+youtube_subtitle_transcript_api.py, youtube_subtitle_real.py, aws-lambda/lambda_function.py가 함께 씁니다.
+(Lambda 빌드에는 aws-lambda/deploy.sh가 이 파일을 복사해 넣음)
+
+선택 순서:
+1. 선호 언어 목록 순서 (SUBTITLE_LANGUAGES 환경변수, 기본 "ko,en")
+2. 같은 언어 안에서는 수동 자막이 자동 생성 자막보다 먼저
+3. 언어 코드가 정확히 같은 트랙(en)이 같은 계열 트랙(en-US, en-GB)보다 먼저
+4. 선호 언어가 하나도 없으면 수동 자막 > 자동 생성 자막 순으로 목록의 첫 트랙
+"""
+
+import os
+
+DEFAULT_SUBTITLE_LANGUAGES = os.getenv('SUBTITLE_LANGUAGES', 'ko,en')
+
+def preferred_languages(languages=None):
+    """선호 언어 목록 정규화 (쉼표로 구분한 문자열 또는 리스트, 없으면 기본값)"""
+    if languages is None:
+        languages = DEFAULT_SUBTITLE_LANGUAGES
+    if isinstance(languages, str):
+        languages = languages.split(',')
+    return [code.strip().lower() for code in languages if code and code.strip()]
+
+def language_family(code):
+    """언어 계열 (en-US -> en)"""
+    return code.lower().split('-')[0]
+
+def track_rank(language_code, is_generated, languages):
+    """트랙 우선순위 (작을수록 먼저)
+
+    Args:
+        language_code: 트랙 언어 코드
+        is_generated: 자동 생성 자막 여부
+        languages: preferred_languages()로 정규화한 선호 언어 목록
+    """
+    code = language_code.lower()
+    family = language_family(code)
+    for index, preferred in enumerate(languages):
+        if code == preferred:
+            return (index, bool(is_generated), 0)
+        if family == language_family(preferred):
+            return (index, bool(is_generated), 1)
+    return (len(languages), bool(is_generated), 0)
+
+def select_track(tracks, languages=None):
+    """트랙 목록에서 가장 알맞은 트랙 반환 (없으면 None)
+
+    tracks의 항목은 language_code/is_generated 속성이 있는 객체
+    (youtube_transcript_api의 Transcript 등) 또는 같은 키를 가진 dict입니다.
+    같은 순위면 목록에서 먼저 나온 트랙을 고릅니다.
+    """
+    languages = preferred_languages(languages)
+    best = None
+    best_rank = None
+    for track in tracks:
+        if isinstance(track, dict):
+            language_code, is_generated = track.get('language_code') or '', track.get('is_generated')
+        else:
+            language_code, is_generated = track.language_code or '', getattr(track, 'is_generated', False)
+        rank = track_rank(language_code, is_generated, languages)
+        if best_rank is None or rank < best_rank:
+            best, best_rank = track, rank
+    return best
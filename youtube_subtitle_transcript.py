@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+자막 본문 저장 형식 (Transcript)
+추출기마다 따로 만들던 dict/entry 목록 대신, 시작 시각과 길이는 밀리초 정수 배열에,
+글자는 줄바꿈으로 이은 문자열 하나와 줄 시작 위치 배열에 보관합니다.
+자동 자막의 단어 시각도 줄마다 튜플을 두지 않고 평평한 배열 두 개와 줄별 위치 배열에 둡니다.
+"[M:SS] 텍스트", "[MM:SS] 텍스트", SRT, VTT, JSON 문자열은 render()를 부를 때만 만듭니다.
+youtube_subtitle_transcript_api.py, youtube_subtitle_real.py, youtube_subtitle_ytdlp.py,
+youtube_subtitle_pytube.py, aws-lambda/lambda_function.py가 함께 씁니다.
+(Lambda 빌드에는 aws-lambda/deploy.sh가 이 파일을 복사해 넣음)
+"""
+
+import json
+from array import array
+from itertools import accumulate, chain
+from operator import attrgetter
+
+# 기본 출력 형식 (추출 결과의 "format" 값)
+DEFAULT_TRANSCRIPT_FORMAT = 'text_with_timestamps'
+
+# 출력 형식 -> Transcript 메서드 이름
+TRANSCRIPT_FORMATS = {
+    'text_with_timestamps': 'to_text',
+    'text_with_padded_timestamps': 'to_padded_text',
+    'srt': 'to_srt',
+    'vtt': 'to_vtt',
+    'json': 'to_json',
+}
+
+_entry_values = attrgetter('start', 'duration', 'text')
+
+def _dict_entry_values(entry):
+    return entry['start'], entry.get('duration', 0), entry['text']
+
+def _clock(ms, separator):
+    """밀리초를 HH:MM:SS.mmm (SRT는 separator=',')로 변환"""
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{ms:03d}"
+
+class Transcript:
+    """자막 한 편 (줄 순서 = 시각 순서)
+
+    starts/durations: 줄마다 시작 시각과 길이 (ms, array('i') - 약 24일까지)
+    text: 모든 줄을 '\\n'으로 이은 문자열 (줄 안의 줄바꿈/연속 공백은 한 칸으로 합쳐 둠)
+    offsets: 줄 i는 text[offsets[i]:offsets[i + 1] - 1] (array('I'), 줄 수 + 1개)
+    word_chars/word_starts: 단어마다 줄 안의 글자 위치 (array('I'))와 줄 시작부터의 ms (array('i'))
+    word_offsets: 줄 i의 단어는 word_*[word_offsets[i]:word_offsets[i + 1]] (array('I'), 줄 수 + 1개)
+    """
+
+    __slots__ = ('starts', 'durations', 'offsets', 'text', 'word_offsets', 'word_chars', 'word_starts')
+
+    def __init__(self, starts, durations, lines, word_offsets=None, word_chars=None, word_starts=None):
+        """
+        Args:
+            starts (array): 시작 시각 (ms)
+            durations (array): 길이 (ms)
+            lines (list): 정리된 줄 목록 (줄바꿈 없음)
+            word_offsets, word_chars, word_starts (array): 단어 시각 (없으면 모든 줄이 단어 시각 없음)
+        """
+        self.starts = starts
+        self.durations = durations
+        self.text = '\n'.join(lines)
+        self.offsets = array('I', chain((0,), accumulate(len(line) + 1 for line in lines)))
+        if word_offsets is None:
+            word_offsets = array('I', bytes(array('I').itemsize * (len(lines) + 1)))
+            word_chars = array('I')
+            word_starts = array('i')
+        self.word_offsets = word_offsets
+        self.word_chars = word_chars
+        self.word_starts = word_starts
+
+    @classmethod
+    def from_rows(cls, rows):
+        """(시작 ms, 길이 ms, 글자) 행으로 생성 (글자가 없는 행은 건너뜀)"""
+        starts = array('i')
+        durations = array('i')
+        lines = []
+        for start, duration, text in rows:
+            text = ' '.join(text.split())
+            if text:
+                starts.append(start)
+                durations.append(max(duration, 0))
+                lines.append(text)
+        return cls(starts, durations, lines)
+
+    @classmethod
+    def from_entries(cls, entries):
+        """youtube-transcript-api의 fetch() 결과로 생성
+
+        항목은 start/duration/text 속성이 있는 객체(FetchedTranscriptSnippet) 또는 같은 키의 dict
+        (시각은 초 단위 실수)이며, 어느 쪽인지는 첫 항목으로 한 번만 판단합니다.
+        """
+        entries = iter(entries)
+        first = next(entries, None)
+        if first is None:
+            return cls.from_rows(())
+        values = _dict_entry_values if isinstance(first, dict) else _entry_values
+        return cls.from_rows(
+            (round(start * 1000), round(duration * 1000), text)
+            for start, duration, text in map(values, chain((first,), entries))
+        )
+
+    @classmethod
+    def from_segments(cls, segments):
+        """youtube_subtitle_parser.iter_segments()의 세그먼트 (start, end, text, words)로 생성
+
+        세그먼트 글자는 이미 정리되어 있으므로 words의 글자 위치를 그대로 씁니다.
+        """
+        starts = array('i')
+        durations = array('i')
+        lines = []
+        word_offsets = array('I', (0,))
+        word_chars = array('I')
+        word_starts = array('i')
+        for start, end, text, words in segments:
+            if text:
+                starts.append(start)
+                durations.append(max(end - start, 0))
+                lines.append(text)
+                for char, offset in words:
+                    word_chars.append(char)
+                    word_starts.append(offset)
+                word_offsets.append(len(word_chars))
+        return cls(starts, durations, lines, word_offsets, word_chars, word_starts)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        """줄 하나 (시작 ms, 길이 ms, 글자)"""
+        index = range(len(self.starts))[index]
+        return (
+            self.starts[index],
+            self.durations[index],
+            self.text[self.offsets[index]:self.offsets[index + 1] - 1],
+        )
+
+    def __iter__(self):
+        return zip(self.starts, self.durations, self.lines())
+
+    def lines(self):
+        """줄 글자 목록"""
+        return self.text.split('\n') if self.starts else []
+
+    def words(self, index):
+        """줄 하나의 단어 시각 ((글자 위치, 줄 시작부터의 ms), ...) - 없으면 빈 튜플"""
+        index = range(len(self.starts))[index]
+        first, last = self.word_offsets[index], self.word_offsets[index + 1]
+        return tuple(zip(self.word_chars[first:last], self.word_starts[first:last]))
+
+    def _json_words(self, index, start, line):
+        """to_json의 줄 하나에 붙일 [{"text", "start"}, ...] (초 단위, 단어 시각이 없으면 None)"""
+        first, last = self.word_offsets[index], self.word_offsets[index + 1]
+        if first == last:
+            return None
+        chars = self.word_chars[first:last]
+        return [
+            {"text": line[char:end].strip(), "start": (start + offset) / 1000}
+            for char, end, offset in zip(chars, chain(chars[1:], (len(line),)), self.word_starts[first:last])
+        ]
+
+    def render(self, transcript_format=DEFAULT_TRANSCRIPT_FORMAT):
+        """transcript_format(TRANSCRIPT_FORMATS의 키) 형식의 문자열 (알 수 없는 형식이면 ValueError)"""
+        method = TRANSCRIPT_FORMATS.get(transcript_format)
+        if method is None:
+            raise ValueError(
+                f"알 수 없는 자막 형식: {transcript_format} (사용 가능: {', '.join(TRANSCRIPT_FORMATS)})"
+            )
+        return getattr(self, method)()
+
+    def to_text(self):
+        """[M:SS] 텍스트 줄 (한 시간이 넘으면 [75:03]처럼 분이 계속 늘어남)"""
+        return '\n'.join([
+            f"[{start // 60000}:{start // 1000 % 60:02d}] {line}"
+            for start, line in zip(self.starts, self.lines())
+        ])
+
+    def to_padded_text(self):
+        """[MM:SS] 텍스트 줄 (youtube_subtitle_real.py와 서버 fallback이 예전부터 쓰던 형식)"""
+        return '\n'.join([
+            f"[{start // 60000:02d}:{start // 1000 % 60:02d}] {line}"
+            for start, line in zip(self.starts, self.lines())
+        ])
+
+    def _cue_blocks(self, separator):
+        return [
+            f"{_clock(start, separator)} --> {_clock(start + duration, separator)}\n{line}\n"
+            for start, duration, line in zip(self.starts, self.durations, self.lines())
+        ]
+
+    def to_srt(self):
+        """SRT (번호, HH:MM:SS,mmm --> HH:MM:SS,mmm, 글자)"""
+        return '\n'.join([
+            f"{number}\n{block}" for number, block in enumerate(self._cue_blocks(','), 1)
+        ])
+
+    def to_vtt(self):
+        """WebVTT"""
+        return '\n'.join(['WEBVTT\n'] + self._cue_blocks('.'))
+
+    def to_json(self):
+        """youtube-transcript-api의 raw data와 같은 [{"text", "start", "duration"}, ...] (초 단위)
+
+        단어 시각이 있는 줄에는 "words": [{"text", "start"}, ...]가 더 붙습니다.
+        """
+        entries = []
+        for index, (start, duration, line) in enumerate(zip(self.starts, self.durations, self.lines())):
+            entry = {"text": line, "start": start / 1000, "duration": duration / 1000}
+            words = self._json_words(index, start, line)
+            if words is not None:
+                entry["words"] = words
+            entries.append(entry)
+        return json.dumps(entries, ensure_ascii=False)
@@ -11,6 +11,9 @@ import re
 from datetime import datetime
 from youtube_transcript_api import YouTubeTranscriptApi
 
+from youtube_subtitle_tracks import select_track
+from youtube_subtitle_transcript import Transcript, DEFAULT_TRANSCRIPT_FORMAT
+
 def extract_video_id(url):
     """YouTube URL에서 video ID 추출"""
     patterns = [
@@ -26,46 +29,14 @@ def extract_video_id(url):
 
     return None
 
-def format_transcript_with_timestamps(transcript):
-    """자막을 타임스탬프와 함께 포맷팅"""
-    formatted_lines = []
-
-    # transcript가 리스트인지 확인
-    if hasattr(transcript, '__iter__') and not isinstance(transcript, str):
-        for entry in transcript:
-            try:
-                # entry의 속성을 확인
-                if hasattr(entry, 'start'):
-                    start_time = entry.start
-                    text = entry.text
-                elif hasattr(entry, '__getitem__'):
-                    start_time = entry['start']
-                    text = entry['text']
-                else:
-                    # 속성 이름으로 접근 시도
-                    start_time = getattr(entry, 'start', 0)
-                    text = getattr(entry, 'text', str(entry))
-
-                # 시간을 MM:SS 형식으로 변환
-                minutes = int(start_time // 60)
-                seconds = int(start_time % 60)
-                timestamp = f"{minutes}:{seconds:02d}"
-
-                # 텍스트 정리 (줄바꿈 제거, 공백 정리)
-                clean_text = text.strip().replace('\n', ' ')
-
-                formatted_lines.append(f"[{timestamp}] {clean_text}")
-            except Exception as e:
-                # 오류 발생시 그냥 텍스트만 추가
-                formatted_lines.append(f"[ERROR] {str(entry)}")
-    else:
-        # transcript가 단일 객체인 경우
-        formatted_lines.append(str(transcript))
-
-    return '\n'.join(formatted_lines)
-
-def extract_subtitle(video_id_or_url):
-    """YouTube 자막 추출 메인 함수"""
+def extract_subtitle(video_id_or_url, languages=None, subtitle_format=DEFAULT_TRANSCRIPT_FORMAT):
+    """YouTube 자막 추출 메인 함수
+
+    Args:
+        video_id_or_url: 영상 ID 또는 URL
+        languages: 선호 언어 목록 (기본 SUBTITLE_LANGUAGES 환경변수, youtube_subtitle_tracks 참고)
+        subtitle_format: 결과 subtitle 형식 (youtube_subtitle_transcript.TRANSCRIPT_FORMATS)
+    """
     try:
         # Video ID 추출
         video_id = extract_video_id(video_id_or_url)
@@ -82,48 +53,12 @@ def extract_subtitle(video_id_or_url):
         # 1. API 인스턴스 생성
         api = YouTubeTranscriptApi()
 
-        # 2. 직접 자막 가져오기 시도 (한국어 우선)
-        transcript = None
-        language_used = None
-        language_name = None
-
-        # 한국어 자막 우선순위 ('ko'만 사용 - auto-generated 포함)
-        korean_codes = ['ko']
-
-        for lang_code in korean_codes:
-            try:
-                transcript = api.fetch(video_id, languages=[lang_code])
-                language_used = lang_code
-                language_name = '한국어'
-                print(f"[SUCCESS] 한국어 자막 발견: {lang_code}")
-                break
-            except:
-                continue
-
-        # 3. 한국어가 없으면 영어 시도
-        if not transcript:
-            english_codes = ['en']
-            for lang_code in english_codes:
-                try:
-                    transcript = api.fetch(video_id, languages=[lang_code])
-                    language_used = lang_code
-                    language_name = '영어'
-                    print(f"[SUCCESS] 영어 자막 발견: {lang_code}")
-                    break
-                except:
-                    continue
-
-        # 4. 기본 자막 시도 (언어 지정 없음)
-        if not transcript:
-            try:
-                transcript = api.fetch(video_id)
-                language_used = 'auto'
-                language_name = '자동감지'
-                print(f"[SUCCESS] 자동감지 자막 발견")
-            except Exception as e:
-                print(f"[ERROR] 자막 추출 실패: {str(e)}")
-
-        if not transcript:
+        # 2. 자막 목록을 한 번만 받아서 선호 언어 순서로 트랙 선택
+        #    (언어마다 fetch를 시도하지 않으므로 자막이 일본어뿐인 영상도 왕복 한 번으로 찾음)
+        transcript_list = api.list(video_id)
+        track = select_track(transcript_list, languages)
+
+        if track is None:
             return {
                 'success': False,
                 'error': 'NO_SUPPORTED_LANGUAGE',
@@ -131,21 +66,28 @@ def extract_subtitle(video_id_or_url):
                 'video_id': video_id
             }
 
-        # 5. 자막 포맷팅
-        formatted_subtitle = format_transcript_with_timestamps(transcript)
+        # 3. 고른 트랙만 가져와서 Transcript로 변환
+        transcript = Transcript.from_entries(track.fetch())
+        language_used = track.language_code
+        language_name = track.language
+        print(f"[SUCCESS] 자막 발견: {language_used} ({'자동 생성' if track.is_generated else '수동'})")
+
+        # 4. 자막 포맷팅
+        formatted_subtitle = transcript.render(subtitle_format)
 
         print(f"[SUCCESS] 자막 추출 성공! {len(transcript)}개 세그먼트")
 
-        # 6. 결과 반환
+        # 5. 결과 반환
         result = {
             'success': True,
             'video_id': video_id,
             'subtitle': formatted_subtitle,
             'language': language_name,
             'language_code': language_used,
+            'is_generated': track.is_generated,
             'segments_count': len(transcript),
             'method': 'youtube-transcript-api',
-            'format': 'text_with_timestamps',
+            'format': subtitle_format,
             'extracted_at': datetime.utcnow().isoformat() + 'Z'
         }
 
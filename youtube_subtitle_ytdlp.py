@@ -3,198 +3,159 @@
 """
 YouTube 자막 추출 스크립트 - yt-dlp 사용
 YouTube Data API v3의 captions.download 권한 제한을 우회하여 자막을 추출합니다.
+yt-dlp를 별도 프로세스로 띄우지 않고 Python API로 현재 인터프리터 안에서 실행합니다.
+- 영상 정보(extract_info)는 한 번만 받고, 돌려받은 자막 목록에서 트랙을 골라(youtube_subtitle_tracks)
+  그 트랙 본문만 메모리로 받음 (임시 디렉토리, 언어별 재시도 없음)
+- 받은 VTT/SRT는 youtube_subtitle_parser로 파싱하고 자동 생성 자막이면 반복 큐를 합쳐
+  Transcript(youtube_subtitle_transcript)로 만든 뒤 다른 추출기와 같은 "[M:SS] 텍스트" 형식으로 반환
+- aws-lambda/lambda_function.py도 같은 함수를 씀 (Lambda 빌드에는 deploy.sh가 복사해 넣음)
 """
 
+import os
 import sys
 import json
-import subprocess
-import tempfile
-import os
-from pathlib import Path
+import threading
+
+from youtube_subtitle_tracks import select_track
+from youtube_subtitle_parser import iter_segments
+from youtube_subtitle_transcript import Transcript, DEFAULT_TRANSCRIPT_FORMAT
+
+# 받을 자막 형식 우선순위
+SUBTITLE_FORMATS = tuple(os.getenv('YTDLP_SUBTITLE_FORMATS', 'vtt,srt').split(','))
+
+_thread_local = threading.local()
+
+def get_ytdl():
+    """스레드별 YoutubeDL 재사용 (HTTP 세션/쿠키 유지)"""
+    ydl = getattr(_thread_local, 'ydl', None)
+    if ydl is None:
+        from yt_dlp import YoutubeDL
+        ydl = _thread_local.ydl = YoutubeDL({
+            'skip_download': True,
+            'quiet': True,
+            'no_warnings': True,
+            'noprogress': True,
+        })
+    return ydl
+
+def _pick_format(formats, preferred_formats):
+    """자막 형식 목록에서 preferred_formats 순서로 하나 선택"""
+    by_ext = {fmt.get('ext'): fmt for fmt in formats if fmt.get('url')}
+    for ext in preferred_formats:
+        if ext in by_ext:
+            return by_ext[ext]
+    return None
+
+def subtitle_tracks(info, preferred_formats=SUBTITLE_FORMATS):
+    """extract_info 결과에서 받을 수 있는 자막 트랙 목록
+
+    자동 생성 자막 목록에는 모든 언어로의 기계 번역(tlang=)이 섞여 있으므로
+    원본 언어 트랙만 남기고, 'ko-orig' 같은 원본 표시는 언어 코드에서 뗍니다.
 
-def extract_subtitle_with_ytdlp(video_id, language_codes=['ko', 'en', 'en-orig']):
+    Returns:
+        list: [{"language_code", "language", "is_generated", "ext", "url"}, ...] (수동 자막 먼저)
     """
-    yt-dlp를 사용하여 YouTube 자막을 추출합니다.
+    tracks = []
+    for is_generated, key in ((False, 'subtitles'), (True, 'automatic_captions')):
+        for code, formats in (info.get(key) or {}).items():
+            fmt = _pick_format(formats, preferred_formats)
+            if fmt is None or code == 'live_chat':
+                continue
+            if is_generated and 'tlang=' in fmt['url']:
+                continue
+            if code.endswith('-orig'):
+                code = code[:-len('-orig')]
+            tracks.append({
+                "language_code": code,
+                "language": fmt.get('name') or code,
+                "is_generated": is_generated,
+                "ext": fmt['ext'],
+                "url": fmt['url'],
+            })
+    return tracks
+
+def download_subtitle_track(video_id, languages=None, preferred_formats=SUBTITLE_FORMATS):
+    """영상 정보를 한 번 받아 가장 알맞은 자막 트랙 본문을 메모리로 받음
 
     Args:
-        video_id (str): YouTube 영상 ID
-        language_codes (list): 시도할 언어 코드 목록
+        video_id: YouTube 영상 ID
+        languages: 선호 언어 목록 (youtube_subtitle_tracks 참고)
+        preferred_formats: 자막 형식 우선순위
 
     Returns:
-        dict: 자막 추출 결과
+        dict: {"language_code", "language", "is_generated", "ext", "content"} (자막이 없으면 None)
     """
-    try:
-        url = f'https://www.youtube.com/watch?v={video_id}'
-        print(f"[INFO] yt-dlp로 영상 분석 중: {video_id}")
+    ydl = get_ytdl()
+    info = ydl.extract_info(f'https://www.youtube.com/watch?v={video_id}', download=False, process=False)
 
-        # 임시 디렉토리 생성
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # 각 언어에 대해 시도
-            for lang_code in language_codes:
-                try:
-                    print(f"[INFO] {lang_code} 언어로 자막 추출 시도...")
-
-                    # yt-dlp 명령어 구성
-                    cmd = [
-                        'yt-dlp',
-                        '--write-auto-subs',
-                        '--sub-langs', lang_code,
-                        '--sub-format', 'srt',
-                        '--skip-download',
-                        '--output', str(temp_path / f'%(title)s.%(ext)s'),
-                        url
-                    ]
-
-                    # yt-dlp 실행
-                    result = subprocess.run(
-                        cmd,
-                        capture_output=True,
-                        text=True,
-                        encoding='utf-8',
-                        timeout=30
-                    )
-
-                    if result.returncode == 0:
-                        # 생성된 자막 파일 찾기
-                        srt_files = list(temp_path.glob(f'*.{lang_code}.srt'))
-
-                        if srt_files:
-                            srt_file = srt_files[0]
-                            print(f"[SUCCESS] {lang_code} 자막 파일 생성됨: {srt_file.name}")
-
-                            # 자막 내용 읽기
-                            with open(srt_file, 'r', encoding='utf-8') as f:
-                                subtitle_content = f.read()
-
-                            if subtitle_content.strip():
-                                print(f"[SUCCESS] yt-dlp로 자막 추출 성공: {lang_code}")
-
-                                return {
-                                    'success': True,
-                                    'subtitle': subtitle_content,
-                                    'language': lang_code,
-                                    'language_code': lang_code,
-                                    'is_generated': 'auto' in lang_code or lang_code in ['ko', 'en'],
-                                    'video_id': video_id,
-                                    'method': 'yt-dlp',
-                                    'note': f'yt-dlp로 자막 추출 성공 ({lang_code})'
-                                }
-
-                        else:
-                            print(f"[WARN] {lang_code} 자막 파일이 생성되지 않음")
-
-                    else:
-                        print(f"[WARN] {lang_code} yt-dlp 실행 실패: {result.stderr}")
-
-                except subprocess.TimeoutExpired:
-                    print(f"[ERROR] {lang_code} yt-dlp 실행 시간 초과")
-                    continue
-                except Exception as e:
-                    print(f"[ERROR] {lang_code} 처리 중 오류: {str(e)}")
-                    continue
-
-        # 모든 언어 시도 실패
-        return {
-            'success': False,
-            'error': 'EXTRACTION_FAILED',
-            'message': f'모든 언어에서 자막 추출에 실패했습니다. 시도한 언어: {language_codes}',
-            'attempted_languages': language_codes,
-            'video_id': video_id
-        }
+    track = select_track(subtitle_tracks(info, preferred_formats), languages)
+    if track is None:
+        return None
 
-    except Exception as e:
-        error_msg = str(e)
-        print(f"[ERROR] yt-dlp 처리 중 오류: {error_msg}")
+    with ydl.urlopen(track["url"]) as response:
+        content = response.read().decode('utf-8', errors='replace')
 
-        return {
-            'success': False,
-            'error': 'YTDLP_ERROR',
-            'message': f'yt-dlp 처리 중 오류가 발생했습니다: {error_msg}',
-            'video_id': video_id,
-            'detailed_error': error_msg
-        }
+    return {
+        "language_code": track["language_code"],
+        "language": track["language"],
+        "is_generated": track["is_generated"],
+        "ext": track["ext"],
+        "content": content,
+    }
 
-def extract_subtitle_simple_ytdlp(video_id):
+def extract_subtitle_with_ytdlp(video_id, languages=None, subtitle_format=DEFAULT_TRANSCRIPT_FORMAT):
     """
-    yt-dlp를 사용한 간단한 자막 추출 (stdout 방식)
+    yt-dlp를 사용하여 YouTube 자막을 추출합니다.
 
     Args:
         video_id (str): YouTube 영상 ID
+        languages (list): 선호 언어 목록 (기본 SUBTITLE_LANGUAGES 환경변수)
+        subtitle_format (str): 결과 subtitle 형식 (youtube_subtitle_transcript.TRANSCRIPT_FORMATS)
 
     Returns:
         dict: 자막 추출 결과
     """
     try:
-        url = f'https://www.youtube.com/watch?v={video_id}'
-        print(f"[INFO] yt-dlp 간단 방식으로 자막 추출: {video_id}")
-
-        # 언어 우선순위
-        languages = ['ko', 'en', 'en-orig']
-
-        for lang in languages:
-            try:
-                print(f"[INFO] {lang} 언어 시도 중...")
-
-                # yt-dlp로 자막을 stdout으로 출력
-                cmd = [
-                    'yt-dlp',
-                    '--write-auto-subs',
-                    '--sub-langs', lang,
-                    '--sub-format', 'srt',
-                    '--skip-download',
-                    '--print-to-file', 'subtitle:%(filepath)s',
-                    '--output', '-',
-                    url
-                ]
-
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    encoding='utf-8',
-                    timeout=20
-                )
-
-                if result.returncode == 0 and result.stdout:
-                    subtitle_content = result.stdout.strip()
-                    if subtitle_content and len(subtitle_content) > 50:  # 최소 길이 확인
-                        print(f"[SUCCESS] {lang} 자막 추출 성공!")
-
-                        return {
-                            'success': True,
-                            'subtitle': subtitle_content,
-                            'language': lang,
-                            'language_code': lang,
-                            'is_generated': True,
-                            'video_id': video_id,
-                            'method': 'yt-dlp-simple',
-                            'note': f'yt-dlp 간단 방식으로 자막 추출 성공 ({lang})'
-                        }
-
-                print(f"[WARN] {lang} 언어 자막 추출 실패")
-
-            except subprocess.TimeoutExpired:
-                print(f"[ERROR] {lang} 처리 시간 초과")
-                continue
-            except Exception as e:
-                print(f"[ERROR] {lang} 처리 중 오류: {str(e)}")
-                continue
+        print(f"[INFO] yt-dlp로 영상 분석 중: {video_id}")
+        track = download_subtitle_track(video_id, languages)
 
+        if track is None or not track["content"].strip():
+            return {
+                'success': False,
+                'error': 'NO_SUBTITLES_FOUND',
+                'message': '지원되는 언어의 자막을 찾을 수 없습니다.',
+                'video_id': video_id
+            }
+
+        # VTT/SRT 원문을 Transcript로 변환 (자동 생성 자막의 반복 큐만 한 줄로)
+        transcript = Transcript.from_segments(iter_segments(track["content"], track["is_generated"]))
+        segments_count = len(transcript)
+
+        print(f"[SUCCESS] yt-dlp로 자막 추출 성공: {track['language_code']} ({track['ext']}, {segments_count}개 세그먼트)")
         return {
-            'success': False,
-            'error': 'NO_SUBTITLES_FOUND',
-            'message': '지원되는 언어의 자막을 찾을 수 없습니다.',
-            'video_id': video_id
+            'success': True,
+            'subtitle': transcript.render(subtitle_format),
+            'language': track["language"],
+            'language_code': track["language_code"],
+            'is_generated': track["is_generated"],
+            'segments_count': segments_count,
+            'format': subtitle_format,
+            'source_format': track["ext"],
+            'video_id': video_id,
+            'method': 'yt-dlp',
+            'note': f"yt-dlp로 자막 추출 성공 ({track['language_code']})"
         }
 
     except Exception as e:
+        error_msg = str(e)
+        print(f"[ERROR] yt-dlp 처리 중 오류: {error_msg}")
+
         return {
             'success': False,
-            'error': 'SIMPLE_YTDLP_ERROR',
-            'message': f'간단 yt-dlp 처리 중 오류: {str(e)}',
-            'video_id': video_id
+            'error': 'YTDLP_ERROR',
+            'message': f'yt-dlp 처리 중 오류가 발생했습니다: {error_msg}',
+            'video_id': video_id,
+            'detailed_error': error_msg
         }
 
 def main():
@@ -206,20 +167,8 @@ def main():
     video_id = sys.argv[1]
 
     try:
-        # 1차 시도: 파일 기반 추출
-        print("[INFO] === 1차 시도: 파일 기반 yt-dlp ===")
         result = extract_subtitle_with_ytdlp(video_id)
 
-        if result['success']:
-            print("=== RESULT_START ===")
-            print(json.dumps(result, ensure_ascii=False, indent=2))
-            print("=== RESULT_END ===")
-            sys.exit(0)
-
-        # 2차 시도: 간단한 stdout 방식
-        print("[INFO] === 2차 시도: 간단한 stdout 방식 ===")
-        result = extract_subtitle_simple_ytdlp(video_id)
-
         # 결과를 JSON으로 출력
         print("=== RESULT_START ===")
         print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -243,4 +192,4 @@ def main():
         sys.exit(1)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
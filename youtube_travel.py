@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+해외 여행 영상 판별용 키워드 매처
+키워드 목록으로 Aho-Corasick 오토마톤을 import 시점에 한 번만 만들고,
+제목+설명 텍스트를 한 번만 훑어서 일치한 키워드 수(점수)를 계산합니다.
+"""
+
+from collections import deque
+
+# 해외 여행 판별 키워드
+TRAVEL_KEYWORDS = (
+    # 여행 관련 한국어 키워드
+    '여행', '해외여행', '여행기', '여행브이로그', '여행 vlog', '여행일기',
+    '패키지여행', '자유여행', '배낭여행', '신혼여행', '가족여행',
+
+    # 국가/도시 관련 키워드 (주요 여행지)
+    '일본', '도쿄', '오사카', '교토', '후쿠오카', '삿포로', '오키나와',
+    '태국', '방콕', '치안마이', '푸켓', '파타야',
+    '베트남', '호치민', '하노이', '다낭', '나트랑',
+    '필리핀', '세부', '보라카이', '마닐라',
+    '중국', '베이징', '상하이', '홍콩', '마카오', '대만', '타이베이',
+    '미국', '뉴욕', '라스베이거스', '로스앤젤레스', '샌프란시스코', '하와이',
+    '유럽', '이탈리아', '로마', '밀라노', '베네치아', '피렌체',
+    '프랑스', '파리', '니스', '칸', '리옹',
+    '스페인', '바르셀로나', '마드리드', '세비야',
+    '영국', '런던', '에딘버러',
+    '독일', '베를린', '뮌헨', '프랑크푸르트',
+    '스위스', '취리히', '인터라켄', '제네바',
+    '터키', '이스탄불', '카파도키아',
+    '인도네시아', '발리', '자카르타',
+    '싱가포르', '말레이시아', '쿠알라룸푸르',
+    '호주', '시드니', '멜버른', '골드코스트', '케언즈',
+    '뉴질랜드', '오클랜드', '퀸스타운',
+    '캐나다', '벤쿠버', '토론토', '몬트리올',
+    '러시아', '모스크바', '상트페테르부르크',
+    '이집트', '카이로', '룩소르',
+    '두바이', 'UAE', '아랍에미리트',
+
+    # 여행 활동 관련
+    '맛집', '맛집투어', '현지음식', '로컬푸드',
+    '관광', '관광지', '명소', '랜드마크', '박물관', '미술관',
+    '호텔', '숙소', '리조트', '펜션',
+    '쇼핑', '면세점', '시장', '벼룩시장',
+    '액티비티', '투어', '가이드',
+
+    # 영어 키워드
+    'travel', 'trip', 'vacation', 'holiday', 'tour', 'vlog',
+    'japan', 'tokyo', 'osaka', 'kyoto', 'thailand', 'bangkok',
+    'vietnam', 'philippines', 'singapore', 'malaysia', 'indonesia',
+    'europe', 'italy', 'france', 'spain', 'germany', 'swiss',
+    'usa', 'america', 'newyork', 'losangeles', 'hawaii',
+    'australia', 'newzealand', 'canada', 'dubai'
+)
+
+# 2개 이상의 키워드가 매칭되면 여행 영상으로 판단
+TRAVEL_SCORE_THRESHOLD = 2
+
+class KeywordMatcher:
+    """여러 키워드를 한 번의 순회로 찾는 Aho-Corasick 매처 (대소문자 무시)
+
+    기존 `keyword in text` 방식과 같은 의미로, 텍스트에 부분 문자열로 포함된
+    서로 다른 키워드의 개수를 점수로 계산합니다.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(keyword.lower() for keyword in keywords))
+
+        # 1. 키워드 트라이 구성
+        goto = [{}]
+        outputs = [set()]
+        for keyword in self.keywords:
+            state = 0
+            for ch in keyword:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    goto.append({})
+                    outputs.append(set())
+                    next_state = goto[state][ch] = len(goto) - 1
+                state = next_state
+            outputs[state].add(keyword)
+
+        # 2. 실패 링크를 따라가 모든 상태의 전이를 미리 계산 (DFA)
+        #    검색 시에는 문자당 딕셔너리 조회 한 번으로 다음 상태가 결정됨
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            for ch, next_state in goto[state].items():
+                delta[state][ch] = next_state
+                fail[next_state] = delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(next_state)
+
+        self._delta = delta
+        self._outputs = [frozenset(found) for found in outputs]
+
+    def matches(self, text, limit=None):
+        """텍스트에 포함된 키워드 집합 (limit개를 찾으면 바로 중단)"""
+        delta = self._delta
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for ch in text.lower():
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found |= outputs[state]
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def score(self, text, limit=None):
+        """텍스트에 포함된 서로 다른 키워드 수"""
+        return len(self.matches(text, limit))
+
+_travel_matcher = KeywordMatcher(TRAVEL_KEYWORDS)
+
+def travel_score(title, description=""):
+    """제목과 설명에서 일치한 여행 키워드 수"""
+    return _travel_matcher.score(title + " " + description)
+
+def is_travel_video(title, description=""):
+    """영상이 해외 여행 관련인지 판단"""
+    return _travel_matcher.score(title + " " + description, TRAVEL_SCORE_THRESHOLD) >= TRAVEL_SCORE_THRESHOLD
+
+def classify_travel_videos(videos):
+    """채널 영상 목록 전체를 한 번에 판별 (영상 순서대로 True/False 리스트)
+
+    Args:
+        videos (list): YouTubeCollector 형식의 영상 dict 목록 (title, description)
+    """
+    score = _travel_matcher.score
+    threshold = TRAVEL_SCORE_THRESHOLD
+    return [
+        score(video.get("title", "") + " " + video.get("description", ""), threshold) >= threshold
+        for video in videos
+    ]